@@ -3,6 +3,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import os
+from dataset_particionado import converter_csv
 
 # Obter o diretório onde o script está localizado
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -46,6 +47,9 @@ vendas_df = pd.DataFrame(registros, columns=['Data', 'Regiao', 'Produto', 'Vende
 vendas_df['Lucro'] = vendas_df['Receita'] - vendas_df['Custo']
 vendas_df.to_csv(os.path.join(datasets_dir, "vendas.csv"), index=False)
 
+# Mesmas vendas em ano=/mes=/regiao= (leitura só das partições filtradas)
+converter_csv(os.path.join(datasets_dir, "vendas.csv"), os.path.join(datasets_dir, "vendas"))
+
 # ----------------------------
 # 3. IBGE População (simulado)
 # ----------------------------
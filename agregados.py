@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+🧮 AGREGADOS COMPARTILHADOS DAS VISUALIZAÇÕES
+=============================================
+
+Provedor único dos totais usados pelos gráficos (VisualizacaoVendas,
+VisualizacaoInterativa e DashboardCompleto). As linhas são percorridas uma
+única vez, num agrupamento Ano_Mes × Regiao × Produto × Vendedor; todo recorte
+pedido pelos gráficos (por produto, vendedor, mês, ano, trimestre, sazonalidade,
+vendedor × produto...) sai dessa tabela base, que é ordens de grandeza menor.
+
+O provedor é reaproveitado entre as classes enquanto os dados forem os mesmos
+(impressão digital do conteúdo), e cada recorte é calculado uma única vez.
+
+Exemplo:
+    agregados = obter_agregados(df)
+    agregados.por('Produto')              # Qtd_Vendida, Receita, Lucro, Custo
+    agregados.por('Vendedor', 'Produto')  # base do heatmap
+    agregados.financeiro('Produto', metricas=['Margem_%', 'ROI_%'])
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import pandas as pd
+
+DIMENSOES_BASE = ['Ano_Mes', 'Regiao', 'Produto', 'Vendedor']
+METRICAS_BASE = ['Qtd_Vendida', 'Receita', 'Lucro']
+METRICAS_AGREGADAS = METRICAS_BASE + ['Custo']
+COLUNAS_DADOS = ['Data', 'Regiao', 'Produto', 'Vendedor'] + METRICAS_BASE
+MESES_PT = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+            'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+
+def _razao(numerador, denominador):
+    """Razão de somas; grupos com denominador zero ficam NaN (nunca inf)"""
+    return numerador / denominador.where(denominador != 0)
+
+
+# Métricas derivadas como expressões sobre as somas do grupo (razão das somas,
+# nunca soma/média de razões por linha); avaliadas só quando pedidas
+METRICAS_DERIVADAS = {
+    'Margem_%': lambda t: _razao(t['Lucro'], t['Receita']) * 100,
+    'ROI_%': lambda t: _razao(t['Lucro'], t['Custo']) * 100,
+    'Receita_Unitaria': lambda t: _razao(t['Receita'], t['Qtd_Vendida']),
+    'Lucro_Unitario': lambda t: _razao(t['Lucro'], t['Qtd_Vendida']),
+    'Custo_Unitario': lambda t: _razao(t['Custo'], t['Qtd_Vendida']),
+}
+
+# Provedores recentes por impressão digital dos dados
+_PROVEDORES = OrderedDict()
+MAX_PROVEDORES = 4
+
+
+def impressao_digital(df):
+    """Hash do conteúdo das colunas usadas pelos agregados"""
+    dados = df[COLUNAS_DADOS].assign(Data=pd.to_datetime(df['Data']))
+    hashes = pd.util.hash_pandas_object(dados, index=False).values
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+def obter_agregados(df):
+    """Provedor de agregados dos dados, reaproveitado enquanto o conteúdo for o mesmo"""
+    chave = impressao_digital(df)
+    if chave in _PROVEDORES:
+        _PROVEDORES.move_to_end(chave)
+        return _PROVEDORES[chave]
+
+    agregados = AgregadosVendas(df, chave)
+    _PROVEDORES[chave] = agregados
+    while len(_PROVEDORES) > MAX_PROVEDORES:
+        _PROVEDORES.popitem(last=False)
+    return agregados
+
+
+class AgregadosVendas:
+    """Totais de vendas por qualquer combinação de dimensões, calculados sob demanda"""
+
+    def __init__(self, df, impressao=None):
+        datas = pd.to_datetime(df['Data'])
+
+        # Única passada sobre as linhas
+        base = df[METRICAS_BASE].groupby(
+            [datas.dt.to_period('M').rename('Ano_Mes')] + [df[d] for d in DIMENSOES_BASE[1:]],
+            observed=True
+        ).sum().reset_index()
+        self._definir_base(base, len(df), datas.min(), datas.max(), impressao)
+
+    @classmethod
+    def de_base(cls, mensal, n_registros, data_inicial, data_final):
+        """Provedor a partir de totais mensais já agregados (ex.: os persistidos por base_incremental)"""
+        agregados = cls.__new__(cls)
+        base = mensal[DIMENSOES_BASE + METRICAS_BASE].sort_values(DIMENSOES_BASE, kind='stable')
+        agregados._definir_base(base.reset_index(drop=True), n_registros, data_inicial, data_final)
+        return agregados
+
+    def _definir_base(self, base, n_registros, data_inicial, data_final, impressao=None):
+        self.impressao = impressao
+        self.n_registros = n_registros
+        self.data_inicial = data_inicial
+        self.data_final = data_final
+
+        # Colunas derivadas calculadas na tabela base (não nas linhas)
+        base['Custo'] = base['Receita'] - base['Lucro']
+        base['Ano'] = base['Ano_Mes'].dt.year
+        base['Mes'] = base['Ano_Mes'].dt.month
+        base['Trimestre'] = base['Ano_Mes'].dt.quarter
+        base['Mes_Nome'] = base['Mes'].map(dict(enumerate(MESES_PT, start=1)))
+        base['Data_Str'] = base['Ano_Mes'].astype(str)
+        self.base = base
+        self._recortes = {}
+
+    def por(self, *dimensoes):
+        """Totais (Qtd_Vendida, Receita, Lucro, Custo) agrupados pelas dimensões pedidas"""
+        if not dimensoes:
+            raise ValueError("Informe ao menos uma dimensão (ex.: 'Produto')")
+        if dimensoes not in self._recortes:
+            self._recortes[dimensoes] = self.base.groupby(list(dimensoes))[METRICAS_AGREGADAS].sum()
+        return self._recortes[dimensoes]
+
+    def financeiro(self, *dimensoes, metricas=tuple(METRICAS_DERIVADAS)):
+        """Totais por dimensão acrescidos das métricas derivadas pedidas (cópia; o cache não é alterado)"""
+        desconhecidas = set(metricas) - set(METRICAS_DERIVADAS)
+        if desconhecidas:
+            raise ValueError(f"Métricas derivadas desconhecidas: {', '.join(sorted(desconhecidas))}. "
+                             f"Use {list(METRICAS_DERIVADAS)}")
+        return self.por(*dimensoes).assign(**{nome: METRICAS_DERIVADAS[nome] for nome in metricas})
+
+    def totais(self):
+        """Totais gerais do conjunto de dados (mantém o tipo inteiro de Qtd_Vendida)"""
+        return pd.Series({metrica: self.base[metrica].sum() for metrica in METRICAS_AGREGADAS}, dtype=object)
+
+    def sazonalidade(self, metrica='Qtd_Vendida'):
+        """Soma por mês do ano, indexada por Jan..Dez"""
+        return self.por('Mes_Nome')[metrica].reindex(MESES_PT)
+
+    def valores(self, dimensao):
+        """Valores distintos de uma dimensão (ordenados)"""
+        return self.por(dimensao).index
+
+    @property
+    def n_anos(self):
+        return self.base['Ano'].nunique()
@@ -8,6 +8,10 @@ import warnings
 import sys
 import os
 import io
+from cenarios_financeiros import TENDENCIAS_PRODUTO, fatores_por_produto
+from base_incremental import METRICAS_NORMALIZACAO, TendenciasVendas
+from estatisticas_online import MomentosOnline
+from indice_vendas import IndiceVendas
 
 # Configurar encoding UTF-8 para saída no Windows
 if sys.platform == "win32":
@@ -35,9 +39,38 @@ def safe_print(*args, **kwargs):
         print(*safe_args, **kwargs)
 
 class AnalisePredicaoVendas:
-    def __init__(self, df):
-        self.df = df.copy()
-        self.preparar_dados()
+    def __init__(self, df, tendencias=None, normalizacao=None):
+        # Com df=None e `tendencias` (ex.: de base_incremental), só as previsões
+        # de produtos e vendedores ficam disponíveis. `normalizacao` são os
+        # momentos (MomentosOnline) de Qtd_Vendida e Receita, se já calculados
+        self.df = df.copy() if df is not None else None
+        self._tendencias = tendencias
+        self._normalizacao = normalizacao
+        self._indice = None
+        self._hierarquia = None
+        if self.df is not None:
+            self.preparar_dados()
+    
+    @property
+    def indice(self):
+        """Bitmaps por região/produto/vendedor e zone maps de data (recortes sem varrer o quadro)"""
+        if self._indice is None:
+            self._indice = IndiceVendas.de_dataframe(self.df)
+        return self._indice
+    
+    @property
+    def hierarquia(self):
+        """Previsão hierárquica Produto × Região × Vendedor (reconciliações guardadas por método)"""
+        if self._hierarquia is None:
+            from previsao_hierarquica import PrevisaoHierarquica
+            self._hierarquia = PrevisaoHierarquica(self.df)
+        return self._hierarquia
+    
+    def obter_tendencias(self):
+        """Séries mensais (produtos) e trimestrais (vendedores) com as somas acumuladas"""
+        if self._tendencias is None:
+            self._tendencias = TendenciasVendas.de_dataframe(self.df)
+        return self._tendencias
     
     def preparar_dados(self):
         """Prepara os dados para análise preditiva inteligente"""
@@ -51,9 +84,12 @@ class AnalisePredicaoVendas:
         self.df['Ano_Mes'] = self.df['Data'].dt.to_period('M')
         self.df['Data_Ordinal'] = self.df['Data'].map(lambda x: x.toordinal())
         
-        # Normalizar valores para melhor análise
-        self.df['Qtd_Norm'] = (self.df['Qtd_Vendida'] - self.df['Qtd_Vendida'].mean()) / self.df['Qtd_Vendida'].std()
-        self.df['Receita_Norm'] = (self.df['Receita'] - self.df['Receita'].mean()) / self.df['Receita'].std()
+        # Normalizar valores para melhor análise (média e desvio dos momentos
+        # do quadro, ou recebidos já combinados de lotes/processos anteriores)
+        if self._normalizacao is None:
+            self._normalizacao = MomentosOnline.de_valores(self.df[METRICAS_NORMALIZACAO])
+        self.df['Qtd_Norm'] = self._normalizacao.zscore(self.df['Qtd_Vendida'], 'Qtd_Vendida')
+        self.df['Receita_Norm'] = self._normalizacao.zscore(self.df['Receita'], 'Receita')
     
     def calcular_conhecimento_historico(self, grupo, metrica='Qtd_Vendida'):
         """Calcula a distribuição histórica para um grupo"""
@@ -74,28 +110,22 @@ class AnalisePredicaoVendas:
         # Calcular tendências por produto ao longo do tempo
         produtos_tendencia = {}
         
-        for produto in self.df['Produto'].unique():
-            df_produto = self.df[self.df['Produto'] == produto]
-            
-            # Agrupar por ano-mês para ver tendência
-            vendas_mensais = df_produto.groupby('Ano_Mes')['Qtd_Vendida'].sum().reset_index()
-            vendas_mensais['Periodo_Num'] = range(len(vendas_mensais))
-            
+        # Série mensal de cada produto resumida em n, médias e co-momentos (x = mês, y = quantidade)
+        vendas_mensais = self.obter_tendencias().produto_mensal
+        estatisticas = vendas_mensais.estatisticas()
+        # Atualizando conhecimento com evidência (últimos meses têm mais peso)
+        medias_ponderadas = vendas_mensais.media_ponderada_recente()
+        
+        for produto, dados_serie in estatisticas.iterrows():
             # Calcular correlação com tempo (tendência)
-            if len(vendas_mensais) > 1:
-                correlacao = np.corrcoef(vendas_mensais['Periodo_Num'], vendas_mensais['Qtd_Vendida'])[0,1]
+            if dados_serie['n'] > 1:
+                correlacao = dados_serie['correlacao']
                 
                 # Análise inteligente para média futura
-                media_historica = vendas_mensais['Qtd_Vendida'].mean()
-                desvio_historico = vendas_mensais['Qtd_Vendida'].std()
-                
                 # Usando distribuição normal como conhecimento base
                 # Resultado final = evidência atual * conhecimento histórico
-                n_observacoes = len(vendas_mensais)
-                
-                # Atualizando conhecimento com evidência (últimos meses têm mais peso)
-                pesos_recentes = np.exp(np.linspace(-1, 0, len(vendas_mensais)))
-                media_ponderada = np.average(vendas_mensais['Qtd_Vendida'], weights=pesos_recentes)
+                media_historica = dados_serie['media']
+                media_ponderada = medias_ponderadas[produto]
                 
                 # Previsão inteligente
                 peso_historico = 0.3  # Peso do conhecimento histórico
@@ -146,40 +176,37 @@ class AnalisePredicaoVendas:
         
         vendedores_analise = {}
         
-        for vendedor in self.df['Vendedor'].unique():
-            df_vendedor = self.df[self.df['Vendedor'] == vendedor]
-            
-            # Agrupar por trimestre para análise de tendência
-            vendas_trimestrais = df_vendedor.groupby(['Ano', 'Trimestre']).agg({
-                'Qtd_Vendida': 'sum',
-                'Receita': 'sum'
-            }).reset_index()
-            
-            vendas_trimestrais['Periodo'] = range(len(vendas_trimestrais))
-            
+        # Séries trimestrais de cada vendedor resumidas em n, médias e co-momentos
+        tendencias = self.obter_tendencias()
+        trimestral_qtd = tendencias.vendedor_trimestral_qtd
+        estatisticas_qtd = trimestral_qtd.estatisticas()
+        estatisticas_receita = tendencias.vendedor_trimestral_receita.estatisticas()
+        
+        for vendedor, dados_serie in estatisticas_qtd.iterrows():
             # Análise inteligente de tendência
-            if len(vendas_trimestrais) > 2:
+            if dados_serie['n'] > 2:
                 # Correlação temporal
-                corr_qtd = np.corrcoef(vendas_trimestrais['Periodo'], vendas_trimestrais['Qtd_Vendida'])[0,1]
-                corr_receita = np.corrcoef(vendas_trimestrais['Periodo'], vendas_trimestrais['Receita'])[0,1]
+                corr_qtd = dados_serie['correlacao']
+                corr_receita = estatisticas_receita.at[vendedor, 'correlacao']
                 
-                # Análise de aceleração (segunda derivada)
+                # Análise de aceleração (segunda derivada): média das segundas
+                # diferenças = (último - penúltimo - segundo + primeiro) / (n - 2)
+                vendas_trimestrais = trimestral_qtd.serie(vendedor)
                 if len(vendas_trimestrais) > 3:
-                    vendas_diff = np.diff(vendas_trimestrais['Qtd_Vendida'])
-                    aceleracao = np.mean(np.diff(vendas_diff))
+                    aceleracao = ((vendas_trimestrais[-1] - vendas_trimestrais[-2]
+                                   - vendas_trimestrais[1] + vendas_trimestrais[0])
+                                  / (len(vendas_trimestrais) - 2))
                 else:
                     aceleracao = 0
                 
                 # Análise inteligente para performance futura
                 # Conhecimento base: performance histórica média
-                media_qtd = vendas_trimestrais['Qtd_Vendida'].mean()
-                desvio_qtd = vendas_trimestrais['Qtd_Vendida'].std()
+                media_qtd = dados_serie['media']
                 
                 # Evidência atual: tendência recente (últimos 4 trimestres)
-                ultimos_periodos = vendas_trimestrais.tail(4)
+                ultimos_periodos = vendas_trimestrais[-4:]
                 if len(ultimos_periodos) > 1:
-                    tendencia_recente = np.polyfit(range(len(ultimos_periodos)), 
-                                                 ultimos_periodos['Qtd_Vendida'], 1)[0]
+                    tendencia_recente = np.polyfit(range(len(ultimos_periodos)), ultimos_periodos, 1)[0]
                 else:
                     tendencia_recente = 0
                 
@@ -236,8 +263,13 @@ class AnalisePredicaoVendas:
         
         return vendedores_analise
     
-    def media_vendas_2025_inteligente(self):
-        """Calcula a média de vendas por vendedor para 2025 usando análise preditiva inteligente"""
+    def media_vendas_2025_inteligente(self, metodo_reconciliacao=None):
+        """Calcula a média de vendas por vendedor para 2025 usando análise preditiva inteligente
+
+        Com `metodo_reconciliacao` (ex.: 'mint'), o total do mercado e a previsão
+        de cada vendedor vêm da hierarquia reconciliada (previsao_hierarquica_reconciliada),
+        e os vendedores somam exatamente o total.
+        """
         safe_print("\n" + "=" * 70)
         safe_print("📊 PREVISÃO DE MÉDIA DE VENDAS POR VENDEDOR - 2025")
         safe_print("=" * 70)
@@ -249,7 +281,13 @@ class AnalisePredicaoVendas:
         anos = vendas_anuais.index.values
         vendas = vendas_anuais.values
         
-        if len(anos) > 1:
+        previsao_reconciliada = None
+        if metodo_reconciliacao is not None:
+            # Total e vendedores da hierarquia; a tendência é a que leva do último ano ao total reconciliado
+            vendas_total_2025 = self.hierarquia.previsao_por_nivel('Total', metodo_reconciliacao)['Previsao_Anual'].iloc[0]
+            previsao_reconciliada = self.hierarquia.previsao_por_nivel('Vendedor', metodo_reconciliacao)['Previsao_Anual']
+            tendencia_mercado = (vendas_total_2025 - vendas_anuais.iloc[-1]) / max(2025 - anos[-1], 1)
+        elif len(anos) > 1:
             # Regressão linear para tendência geral
             tendencia_mercado = np.polyfit(anos, vendas, 1)[0]
             
@@ -260,7 +298,8 @@ class AnalisePredicaoVendas:
             tendencia_mercado = 0
         
         safe_print(f"📈 Tendência do mercado: {tendencia_mercado:+.0f} unidades/ano")
-        safe_print(f"🎯 Previsão total mercado 2025: {vendas_total_2025:,.0f} unidades")
+        safe_print(f"🎯 Previsão total mercado 2025: {vendas_total_2025:,.0f} unidades"
+                   + (" (reconciliada: Produto × Região × Vendedor)" if previsao_reconciliada is not None else ""))
         
         # Análise inteligente por vendedor
         num_vendedores = self.df['Vendedor'].nunique()
@@ -274,7 +313,7 @@ class AnalisePredicaoVendas:
         previsoes_vendedores = {}
         
         for vendedor in self.df['Vendedor'].unique():
-            df_vendedor = self.df[self.df['Vendedor'] == vendedor]
+            df_vendedor = self.indice.fatiar(self.df, vendedor=vendedor)
             
             # Performance histórica do vendedor
             vendas_vendedor_anual = df_vendedor.groupby('Ano')['Qtd_Vendida'].sum()
@@ -290,24 +329,27 @@ class AnalisePredicaoVendas:
             else:
                 tendencia_vendedor = 0
             
-            # Combinação inteligente de informações
-            # Conhecimento histórico: share histórico * previsão total
-            conhecimento_historico = share_historico * vendas_total_2025
-            
-            # Evidência atual: tendência específica do vendedor
-            ultimo_ano_vendedor = vendas_vendedor_anual.iloc[-1]
-            ajuste_tendencia = tendencia_vendedor * (2025 - anos_vendedor[-1])
-            evidencia_atual = ultimo_ano_vendedor + ajuste_tendencia
-            
-            # Previsão final (combinação do conhecimento histórico e evidência atual)
-            peso_historico = 0.6  # Peso da performance histórica
-            peso_tendencia = 0.4  # Peso da tendência recente
-            
-            previsao_vendedor = (peso_historico * conhecimento_historico + 
-                               peso_tendencia * evidencia_atual)
-            
-            # Garantir que seja positivo
-            previsao_vendedor = max(0, previsao_vendedor)
+            if previsao_reconciliada is not None:
+                previsao_vendedor = previsao_reconciliada[vendedor]
+            else:
+                # Combinação inteligente de informações
+                # Conhecimento histórico: share histórico * previsão total
+                conhecimento_historico = share_historico * vendas_total_2025
+                
+                # Evidência atual: tendência específica do vendedor
+                ultimo_ano_vendedor = vendas_vendedor_anual.iloc[-1]
+                ajuste_tendencia = tendencia_vendedor * (2025 - vendas_vendedor_anual.index[-1])
+                evidencia_atual = ultimo_ano_vendedor + ajuste_tendencia
+                
+                # Previsão final (combinação do conhecimento histórico e evidência atual)
+                peso_historico = 0.6  # Peso da performance histórica
+                peso_tendencia = 0.4  # Peso da tendência recente
+                
+                previsao_vendedor = (peso_historico * conhecimento_historico + 
+                                   peso_tendencia * evidencia_atual)
+                
+                # Garantir que seja positivo
+                previsao_vendedor = max(0, previsao_vendedor)
             
             # Calcular intervalos de confiança estatísticos
             desvio_historico = vendas_vendedor_anual.std() if len(vendas_vendedor_anual) > 1 else vendas_vendedor_anual.iloc[0] * 0.2
@@ -336,7 +378,34 @@ class AnalisePredicaoVendas:
             safe_print()
         
         return previsoes_vendedores
-    
+
+    def previsao_hierarquica_reconciliada(self, metodo='mint', exibir=True):
+        """Previsão base Produto × Região × Vendedor reconciliada com os níveis agregados"""
+        hierarquia = self.hierarquia
+        reconciliadas = hierarquia.reconciliar(metodo)
+        if not exibir:
+            return reconciliadas
+
+        safe_print("\n" + "=" * 70)
+        safe_print("🧮 PREVISÃO HIERÁRQUICA RECONCILIADA - 2025")
+        safe_print("=" * 70)
+
+        total = reconciliadas[reconciliadas['Nivel'] == 'Total'].iloc[0]
+        safe_print(f"📐 Método de reconciliação: {metodo}")
+        safe_print(f"🔢 Séries base (Produto × Região × Vendedor): {hierarquia.matriz_soma.shape[1]}")
+        safe_print(f"🎯 Previsão total mercado 2025: {total['Previsao_Anual']:,.0f} unidades "
+                   f"({total['Previsao_Reconciliada']:,.0f}/mês)")
+
+        for nivel in ['Produto', 'Regiao', 'Vendedor']:
+            dados_nivel = reconciliadas[reconciliadas['Nivel'] == nivel]
+            safe_print(f"\n📊 Por {nivel} (unidades/mês, base → reconciliada):")
+            safe_print("-" * 70)
+            for _, linha in dados_nivel.iterrows():
+                safe_print(f"   {linha['Chave']}: {linha['Previsao_Base']:,.0f} → "
+                           f"{linha['Previsao_Reconciliada']:,.0f}")
+
+        return reconciliadas
+
     def analise_probabilidades_produtos(self):
         """Análise de probabilidades condicionais para produtos"""
         safe_print("\n" + "=" * 70)
@@ -348,7 +417,7 @@ class AnalisePredicaoVendas:
         safe_print("-" * 40)
         
         for regiao in self.df['Regiao'].unique():
-            df_regiao = self.df[self.df['Regiao'] == regiao]
+            df_regiao = self.indice.fatiar(self.df, regiao=regiao)
             vendas_por_produto = df_regiao.groupby('Produto')['Qtd_Vendida'].sum()
             total_regiao = vendas_por_produto.sum()
             
@@ -362,7 +431,7 @@ class AnalisePredicaoVendas:
         safe_print("-" * 40)
         
         for vendedor in self.df['Vendedor'].unique():
-            df_vendedor = self.df[self.df['Vendedor'] == vendedor]
+            df_vendedor = self.indice.fatiar(self.df, vendedor=vendedor)
             vendas_por_produto = df_vendedor.groupby('Produto')['Qtd_Vendida'].sum()
             total_vendedor = vendas_por_produto.sum()
             
@@ -382,7 +451,9 @@ class AnalisePredicaoVendas:
         # Executar todas as análises
         produtos_tendencia = self.previsao_inteligente_produto()
         vendedores_analise = self.previsao_inteligente_vendedores()
-        previsoes_2025 = self.media_vendas_2025_inteligente()
+        # Total, vendedores e produtos 2025 saem da mesma hierarquia reconciliada
+        previsoes_hierarquicas = self.previsao_hierarquica_reconciliada(exibir=False)
+        previsoes_2025 = self.media_vendas_2025_inteligente(metodo_reconciliacao='mint')
         previsoes_financeiras = self.previsoes_financeiras_produtos()
         self.analise_probabilidades_produtos()
         
@@ -391,18 +462,20 @@ class AnalisePredicaoVendas:
         safe_print("📋 RESUMO EXECUTIVO - INSIGHTS PREDITIVOS")
         safe_print("=" * 70)
         
-        # Produto com maior probabilidade de crescimento
-        melhor_produto = max(produtos_tendencia.items(), key=lambda x: x[1]['previsao_2025'])
-        safe_print(f"🏆 Produto mais promissor 2025: {melhor_produto[0]}")
-        safe_print(f"   Previsão: {melhor_produto[1]['previsao_2025']:.0f} unidades/mês")
+        # Produto com maior previsão reconciliada
+        previsao_produtos = self.hierarquia.previsao_por_nivel('Produto')['Previsao_Reconciliada']
+        melhor_produto = previsao_produtos.idxmax()
+        safe_print(f"🏆 Produto mais promissor 2025: {melhor_produto}")
+        safe_print(f"   Previsão: {previsao_produtos[melhor_produto]:.0f} unidades/mês")
         
         # Vendedor com melhor tendência
         melhor_vendedor = max(vendedores_analise.items(), key=lambda x: x[1]['score_tendencia'])
         safe_print(f"🚀 Vendedor em maior crescimento: {melhor_vendedor[0]}")
         safe_print(f"   Tendência: {melhor_vendedor[1]['tendencia']}")
+        safe_print(f"   Previsão 2025: {previsoes_2025[melhor_vendedor[0]]['previsao']:,.0f} unidades")
         
-        # Total previsto para 2025
-        total_previsto = sum([dados['previsao'] for dados in previsoes_2025.values()])
+        # Total previsto para 2025 (soma dos vendedores = total reconciliado)
+        total_previsto = self.hierarquia.previsao_por_nivel('Total')['Previsao_Anual'].iloc[0]
         safe_print(f"🎯 Previsão total 2025: {total_previsto:,.0f} unidades")
         
         safe_print("\n✅ Análise preditiva concluída!")
@@ -411,121 +484,121 @@ class AnalisePredicaoVendas:
             'produtos': produtos_tendencia,
             'vendedores': vendedores_analise,
             'previsoes_2025': previsoes_2025,
+            'previsoes_hierarquicas': previsoes_hierarquicas,
             'previsoes_financeiras': previsoes_financeiras
         }
     
-    def previsoes_financeiras_produtos(self):
-        """Prevê custos e lucros baseados nas previsões de vendas por produto"""
-        safe_print("=" * 70)
-        safe_print("💰 PREVISÕES FINANCEIRAS POR PRODUTO 2025")
-        safe_print("=" * 70)
+    def economia_unitaria_produtos(self):
+        """Economia unitária por produto (previsão de quantidade, valores unitários e histórico)"""
+        if getattr(self, '_economia_unitaria', None) is not None:
+            return self._economia_unitaria
         
-        # Primeiro, obter previsões de vendas por produto
+        # Obter previsões de vendas por produto
         produtos_tendencia = self.previsao_inteligente_produto()
         
         # Calcular médias históricas financeiras por produto
-        financeiro_historico = self.df.groupby('Produto').agg({
+        financeiro = self.df.groupby('Produto').agg({
             'Qtd_Vendida': 'sum',
             'Receita': 'sum',
             'Lucro': 'sum'
-        }).reset_index()
+        })
+        
+        # Previsão de vendas e tendência como colunas (crescimento padrão de 10% sem previsão)
+        tendencias_previstas = pd.DataFrame.from_dict(produtos_tendencia, orient='index')
+        tendencias_previstas = tendencias_previstas.reindex(financeiro.index)
+        
+        economia = pd.DataFrame(index=financeiro.index)
+        economia['qtd_prevista'] = tendencias_previstas['previsao_2025'].fillna(financeiro['Qtd_Vendida'] * 1.1)
+        economia['tendencia'] = pd.Categorical(tendencias_previstas['tendencia'].fillna('ESTÁVEL'),
+                                               categories=TENDENCIAS_PRODUTO)
         
         # Calcular valores unitários médios históricos
-        financeiro_historico['Receita_Unitaria'] = financeiro_historico['Receita'] / financeiro_historico['Qtd_Vendida']
-        financeiro_historico['Lucro_Unitario'] = financeiro_historico['Lucro'] / financeiro_historico['Qtd_Vendida']
-        financeiro_historico['Custo_Unitario'] = financeiro_historico['Receita_Unitaria'] - financeiro_historico['Lucro_Unitario']
-        financeiro_historico['Margem_%'] = (financeiro_historico['Lucro'] / financeiro_historico['Receita']) * 100
+        economia['receita_unitaria'] = financeiro['Receita'] / financeiro['Qtd_Vendida']
+        economia['custo_unitario'] = economia['receita_unitaria'] - financeiro['Lucro'] / financeiro['Qtd_Vendida']
+        economia['receita_atual'] = financeiro['Receita']
+        economia['lucro_atual'] = financeiro['Lucro']
+        economia['custo_atual'] = financeiro['Receita'] - financeiro['Lucro']
+        economia['margem_atual_%'] = (financeiro['Lucro'] / financeiro['Receita']) * 100
+        
+        self._economia_unitaria = economia
+        return economia
+    
+    def participacao_regional_produtos(self):
+        """Participação de cada região na receita de cada produto (Produto × Regiao)"""
+        receita = self.df.groupby(['Produto', 'Regiao'])['Receita'].sum().unstack(fill_value=0)
+        return receita.div(receita.sum(axis=1), axis=0)
+    
+    def previsoes_financeiras_produtos(self, cenarios=None, categorias=None):
+        """Prevê custos e lucros baseados nas previsões de vendas por produto
         
-        previsoes_financeiras = {}
+        `cenarios` é uma tabela de fatores (ver cenarios_financeiros); sem ela,
+        usa os fatores padrão por tendência.
+        """
+        safe_print("=" * 70)
+        safe_print("💰 PREVISÕES FINANCEIRAS POR PRODUTO 2025")
+        safe_print("=" * 70)
+        
+        economia = self.economia_unitaria_produtos()
+        qtd_prevista_2025 = economia['qtd_prevista'].values
+        receita_atual = economia['receita_atual'].values
+        lucro_atual = economia['lucro_atual'].values
+        custo_atual = economia['custo_atual'].values
+        
+        # Ajustar valores unitários pela tabela de cenários (tendência, região, categoria, produto)
+        participacao_regional = None
+        if cenarios is not None and (cenarios['Nivel'] == 'Regiao').any():
+            participacao_regional = self.participacao_regional_produtos()
+        fator_receita, fator_custo = fatores_por_produto(economia, cenarios,
+                                                         participacao_regional, categorias)
+        receita_unit_2025 = economia['receita_unitaria'].values * fator_receita
+        custo_unit_2025 = economia['custo_unitario'].values * fator_custo
+        lucro_unit_2025 = receita_unit_2025 - custo_unit_2025
+        
+        # Calcular totais previstos
+        receita_prevista = qtd_prevista_2025 * receita_unit_2025
+        custo_previsto = qtd_prevista_2025 * custo_unit_2025
+        lucro_previsto = qtd_prevista_2025 * lucro_unit_2025
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margem_prevista = np.where(receita_prevista > 0, (lucro_previsto / receita_prevista) * 100, 0)
+        
+        # Armazenar previsões (uma linha por produto)
+        previsoes_financeiras = pd.DataFrame({
+            'qtd_prevista': qtd_prevista_2025,
+            'receita_prevista': receita_prevista,
+            'custo_previsto': custo_previsto,
+            'lucro_previsto': lucro_previsto,
+            'margem_prevista_%': margem_prevista,
+            'receita_unitaria_2025': receita_unit_2025,
+            'custo_unitario_2025': custo_unit_2025,
+            'lucro_unitario_2025': lucro_unit_2025,
+            'variacao_receita_%': ((receita_prevista - receita_atual) / receita_atual) * 100,
+            'variacao_lucro_%': ((lucro_previsto - lucro_atual) / lucro_atual) * 100,
+            'variacao_custo_%': ((custo_previsto - custo_atual) / custo_atual) * 100,
+            'tendencia': economia['tendencia'],
+            'receita_atual': receita_atual,
+            'lucro_atual': lucro_atual,
+            'custo_atual': custo_atual,
+            'margem_atual_%': economia['margem_atual_%']
+        }, index=economia.index)
         
         safe_print("📊 ANÁLISE FINANCEIRA POR PRODUTO:")
         safe_print("=" * 50)
         
-        for produto in financeiro_historico['Produto']:
-            dados_produto = financeiro_historico[financeiro_historico['Produto'] == produto].iloc[0]
-            
-            # Obter previsão de vendas
-            if produto in produtos_tendencia:
-                qtd_prevista_2025 = produtos_tendencia[produto]['previsao_2025']
-                tendencia_vendas = produtos_tendencia[produto]['tendencia']
-            else:
-                qtd_prevista_2025 = dados_produto['Qtd_Vendida'] * 1.1  # Crescimento padrão de 10%
-                tendencia_vendas = 'ESTÁVEL'
-            
-            # Calcular valores unitários com ajustes baseados na tendência
-            receita_unit_base = dados_produto['Receita_Unitaria']
-            lucro_unit_base = dados_produto['Lucro_Unitario']
-            custo_unit_base = dados_produto['Custo_Unitario']
-            
-            # Ajustar valores unitários baseados na tendência e inflação
-            if tendencia_vendas == 'CRESCIMENTO':
-                # Produtos em crescimento podem ter melhor margem
-                fator_ajuste_receita = 1.08  # 8% aumento na receita unitária
-                fator_ajuste_custo = 1.05    # 5% aumento no custo (menor que receita)
-            elif tendencia_vendas == 'QUEDA':
-                # Produtos em queda podem precisar reduzir preços
-                fator_ajuste_receita = 0.95  # 5% redução na receita unitária
-                fator_ajuste_custo = 1.03    # 3% aumento no custo (inflação)
-            else:
-                # Produtos estáveis seguem inflação padrão
-                fator_ajuste_receita = 1.04  # 4% inflação
-                fator_ajuste_custo = 1.04    # 4% inflação
-            
-            receita_unit_2025 = receita_unit_base * fator_ajuste_receita
-            custo_unit_2025 = custo_unit_base * fator_ajuste_custo
-            lucro_unit_2025 = receita_unit_2025 - custo_unit_2025
-            
-            # Calcular totais previstos
-            receita_prevista = qtd_prevista_2025 * receita_unit_2025
-            custo_previsto = qtd_prevista_2025 * custo_unit_2025
-            lucro_previsto = qtd_prevista_2025 * lucro_unit_2025
-            margem_prevista = (lucro_previsto / receita_prevista) * 100 if receita_prevista > 0 else 0
-            
-            # Calcular variações em relação ao histórico
-            receita_atual = dados_produto['Receita']
-            lucro_atual = dados_produto['Lucro']
-            custo_atual = receita_atual - lucro_atual
-            
-            variacao_receita = ((receita_prevista - receita_atual) / receita_atual) * 100
-            variacao_lucro = ((lucro_previsto - lucro_atual) / lucro_atual) * 100
-            variacao_custo = ((custo_previsto - custo_atual) / custo_atual) * 100
-            
-            # Armazenar previsões
-            previsoes_financeiras[produto] = {
-                'qtd_prevista': qtd_prevista_2025,
-                'receita_prevista': receita_prevista,
-                'custo_previsto': custo_previsto,
-                'lucro_previsto': lucro_previsto,
-                'margem_prevista_%': margem_prevista,
-                'receita_unitaria_2025': receita_unit_2025,
-                'custo_unitario_2025': custo_unit_2025,
-                'lucro_unitario_2025': lucro_unit_2025,
-                'variacao_receita_%': variacao_receita,
-                'variacao_lucro_%': variacao_lucro,
-                'variacao_custo_%': variacao_custo,
-                'tendencia': tendencia_vendas,
-                'historico': {
-                    'receita_atual': receita_atual,
-                    'lucro_atual': lucro_atual,
-                    'custo_atual': custo_atual,
-                    'margem_atual_%': dados_produto['Margem_%']
-                }
-            }
-            
-            # Exibir análise
+        # Exibir análise
+        for produto, dados in previsoes_financeiras.iterrows():
             safe_print(f"🏷️  {produto.upper()}")
-            safe_print(f"   📈 Quantidade prevista: {qtd_prevista_2025:,.0f} unidades")
-            safe_print(f"   💰 Receita prevista: R$ {receita_prevista:,.2f} ({variacao_receita:+.1f}%)")
-            safe_print(f"   💸 Custo previsto: R$ {custo_previsto:,.2f} ({variacao_custo:+.1f}%)")
-            safe_print(f"   💚 Lucro previsto: R$ {lucro_previsto:,.2f} ({variacao_lucro:+.1f}%)")
-            safe_print(f"   📊 Margem prevista: {margem_prevista:.1f}% (atual: {dados_produto['Margem_%']:.1f}%)")
-            safe_print(f"   📋 Tendência: {tendencia_vendas}")
+            safe_print(f"   📈 Quantidade prevista: {dados['qtd_prevista']:,.0f} unidades")
+            safe_print(f"   💰 Receita prevista: R$ {dados['receita_prevista']:,.2f} ({dados['variacao_receita_%']:+.1f}%)")
+            safe_print(f"   💸 Custo previsto: R$ {dados['custo_previsto']:,.2f} ({dados['variacao_custo_%']:+.1f}%)")
+            safe_print(f"   💚 Lucro previsto: R$ {dados['lucro_previsto']:,.2f} ({dados['variacao_lucro_%']:+.1f}%)")
+            safe_print(f"   📊 Margem prevista: {dados['margem_prevista_%']:.1f}% (atual: {dados['margem_atual_%']:.1f}%)")
+            safe_print(f"   📋 Tendência: {dados['tendencia']}")
             safe_print()
         
         # Análise consolidada
-        total_receita_prevista = sum([p['receita_prevista'] for p in previsoes_financeiras.values()])
-        total_custo_previsto = sum([p['custo_previsto'] for p in previsoes_financeiras.values()])
-        total_lucro_previsto = sum([p['lucro_previsto'] for p in previsoes_financeiras.values()])
+        total_receita_prevista = previsoes_financeiras['receita_prevista'].sum()
+        total_custo_previsto = previsoes_financeiras['custo_previsto'].sum()
+        total_lucro_previsto = previsoes_financeiras['lucro_previsto'].sum()
         margem_total_prevista = (total_lucro_previsto / total_receita_prevista) * 100
         
         # Histórico total
@@ -550,16 +623,16 @@ class AnalisePredicaoVendas:
         safe_print(f"💚 Lucro: {variacao_lucro_total:+.1f}%")
         
         # Produto mais lucrativo previsto
-        produto_mais_lucrativo = max(previsoes_financeiras.items(), key=lambda x: x[1]['lucro_previsto'])
-        safe_print(f"\n🏆 Produto mais lucrativo previsto: {produto_mais_lucrativo[0]}")
-        safe_print(f"   💚 Lucro: R$ {produto_mais_lucrativo[1]['lucro_previsto']:,.2f}")
-        safe_print(f"   📊 Margem: {produto_mais_lucrativo[1]['margem_prevista_%']:.1f}%")
+        produto_mais_lucrativo = previsoes_financeiras['lucro_previsto'].idxmax()
+        safe_print(f"\n🏆 Produto mais lucrativo previsto: {produto_mais_lucrativo}")
+        safe_print(f"   💚 Lucro: R$ {previsoes_financeiras.at[produto_mais_lucrativo, 'lucro_previsto']:,.2f}")
+        safe_print(f"   📊 Margem: {previsoes_financeiras.at[produto_mais_lucrativo, 'margem_prevista_%']:.1f}%")
         
         # Produto com melhor margem prevista
-        produto_melhor_margem = max(previsoes_financeiras.items(), key=lambda x: x[1]['margem_prevista_%'])
-        safe_print(f"\n📊 Produto com melhor margem prevista: {produto_melhor_margem[0]}")
-        safe_print(f"   📊 Margem: {produto_melhor_margem[1]['margem_prevista_%']:.1f}%")
-        safe_print(f"   💚 Lucro: R$ {produto_melhor_margem[1]['lucro_previsto']:,.2f}")
+        produto_melhor_margem = previsoes_financeiras['margem_prevista_%'].idxmax()
+        safe_print(f"\n📊 Produto com melhor margem prevista: {produto_melhor_margem}")
+        safe_print(f"   📊 Margem: {previsoes_financeiras.at[produto_melhor_margem, 'margem_prevista_%']:.1f}%")
+        safe_print(f"   💚 Lucro: R$ {previsoes_financeiras.at[produto_melhor_margem, 'lucro_previsto']:,.2f}")
         
         safe_print("\n✅ Previsões financeiras concluídas!")
         
@@ -567,8 +640,15 @@ class AnalisePredicaoVendas:
 
 def main():
     """Função principal"""
-    # Carregar dados
-    df = pd.read_csv('datasets/vendas.csv')
+    import argparse
+    from dataset_particionado import adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    parser = argparse.ArgumentParser(description="Análise preditiva de vendas")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
+    # Carregar dados (só as partições que atendem aos filtros)
+    df = carregar_vendas_argumentos(args)
     
     # Criar instância da análise
     analise = AnalisePredicaoVendas(df)
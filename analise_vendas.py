@@ -3,6 +3,9 @@ import pandas as pd
 from datetime import datetime
 import sys
 import os
+from moeda import converter_centavos, esta_em_centavos, formatar_reais, total_centavos
+from ranking_vendas import campeoes_por_grupo, top_k
+from estatisticas_aproximadas import ResumoAproximado
 
 def safe_print(text):
     """Função para imprimir com fallback para encoding"""
@@ -18,10 +21,20 @@ def safe_print(text):
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', None)
 
-def carregar_dados():
-    """Carrega e prepara os dados de vendas"""
-    df = pd.read_csv('datasets/vendas.csv')
-    
+def carregar_dados(caminho_arquivo='datasets/vendas.csv', processos=1, centavos=False):
+    """Carrega e prepara os dados de vendas (processos > 1 ou None: leitura paralela do CSV)
+
+    centavos=True: Receita, Custo e Lucro em centavos int64 (somas exatas, ver moeda.py).
+    """
+    if processos != 1:
+        from leitura_paralela import carregar_paralelo
+        df = carregar_paralelo(caminho_arquivo, processos)
+    else:
+        df = preparar_dados(pd.read_csv(caminho_arquivo))
+    return converter_centavos(df) if centavos else df
+
+def preparar_dados(df):
+    """Converte a data e extrai ano, mês e ano-mês (só operações linha a linha)"""
     # Converter a coluna Data para datetime
     df['Data'] = pd.to_datetime(df['Data'])
     
@@ -32,15 +45,19 @@ def carregar_dados():
     
     return df
 
+def ranking_produtos(df, metrica='Qtd_Vendida'):
+    """Ranking completo dos produtos pela soma da métrica (sob demanda; os relatórios usam só o top 10)"""
+    return df.groupby('Produto')[metrica].sum().sort_values(ascending=False, kind='stable')
+
 def produto_mais_vendido_geral(df):
-    """Encontra o produto que mais vendeu no geral (por quantidade)"""
+    """Encontra o produto que mais vendeu no geral (por quantidade); retorna o top 10 (ver ranking_produtos)"""
     print("=" * 60)
     print("PRODUTO QUE MAIS VENDEU - GERAL (Por Quantidade)")
     print("=" * 60)
     
-    produto_qtd = df.groupby('Produto')['Qtd_Vendida'].sum().sort_values(ascending=False)
+    produto_qtd = top_k(df.groupby('Produto')['Qtd_Vendida'].sum(), 10)
     print("Ranking dos produtos por quantidade vendida:")
-    for i, (produto, qtd) in enumerate(produto_qtd.head(10).items(), 1):
+    for i, (produto, qtd) in enumerate(produto_qtd.items(), 1):
         print(f"{i}. {produto}: {qtd:,} unidades")
     
     print(f"\nCAMPEAO: {produto_qtd.index[0]} com {produto_qtd.iloc[0]:,} unidades vendidas")
@@ -48,17 +65,17 @@ def produto_mais_vendido_geral(df):
     return produto_qtd
 
 def produto_mais_vendido_por_receita(df):
-    """Encontra o produto que mais vendeu por receita"""
+    """Encontra o produto que mais vendeu por receita; retorna o top 10 (ver ranking_produtos)"""
     print("\n" + "=" * 60)
     print("PRODUTO QUE MAIS VENDEU - GERAL (Por Receita)")
     print("=" * 60)
     
-    produto_receita = df.groupby('Produto')['Receita'].sum().sort_values(ascending=False)
+    produto_receita = top_k(df.groupby('Produto')['Receita'].sum(), 10)
     print("Ranking dos produtos por receita:")
-    for i, (produto, receita) in enumerate(produto_receita.head(10).items(), 1):
-        print(f"{i}. {produto}: R$ {receita:,.2f}")
+    for i, (produto, receita) in enumerate(produto_receita.items(), 1):
+        print(f"{i}. {produto}: {formatar_reais(receita, esta_em_centavos(df))}")
     
-    print(f"\nCAMPEAO: {produto_receita.index[0]} com R$ {produto_receita.iloc[0]:,.2f}")
+    print(f"\nCAMPEAO: {produto_receita.index[0]} com {formatar_reais(produto_receita.iloc[0], esta_em_centavos(df))}")
     
     return produto_receita
 
@@ -69,19 +86,19 @@ def vendedor_mais_vendeu_geral(df):
     print("=" * 60)
     
     # Por quantidade
-    vendedor_qtd = df.groupby('Vendedor')['Qtd_Vendida'].sum().sort_values(ascending=False)
+    vendedor_qtd = top_k(df.groupby('Vendedor')['Qtd_Vendida'].sum())
     print("Ranking por quantidade vendida:")
     for i, (vendedor, qtd) in enumerate(vendedor_qtd.items(), 1):
         print(f"{i}. {vendedor}: {qtd:,} unidades")
     
     # Por receita
-    vendedor_receita = df.groupby('Vendedor')['Receita'].sum().sort_values(ascending=False)
+    vendedor_receita = top_k(df.groupby('Vendedor')['Receita'].sum())
     print("\nRanking por receita:")
     for i, (vendedor, receita) in enumerate(vendedor_receita.items(), 1):
-        print(f"{i}. {vendedor}: R$ {receita:,.2f}")
+        print(f"{i}. {vendedor}: {formatar_reais(receita, esta_em_centavos(df))}")
     
     print(f"\nCAMPEAO (Quantidade): {vendedor_qtd.index[0]} com {vendedor_qtd.iloc[0]:,} unidades")
-    print(f"CAMPEAO (Receita): {vendedor_receita.index[0]} com R$ {vendedor_receita.iloc[0]:,.2f}")
+    print(f"CAMPEAO (Receita): {vendedor_receita.index[0]} com {formatar_reais(vendedor_receita.iloc[0], esta_em_centavos(df))}")
     
     return vendedor_qtd, vendedor_receita
 
@@ -93,27 +110,29 @@ def analise_por_ano(df):
     
     anos = sorted(df['Ano'].unique())
     
+    # Campeões de todos os anos de uma vez (top 1 por grupo, sem ordenar cada ano)
+    campeoes = {(item, metrica): campeoes_por_grupo(df, 'Ano', item, metrica)
+                for item in ('Produto', 'Vendedor') for metrica in ('Qtd_Vendida', 'Receita')}
+    
     for ano in anos:
         print(f"\nANO {ano}")
         print("-" * 40)
         
-        df_ano = df[df['Ano'] == ano]
-        
         # Produto mais vendido do ano (quantidade)
-        produto_ano_qtd = df_ano.groupby('Produto')['Qtd_Vendida'].sum().sort_values(ascending=False)
-        print(f"Produto mais vendido (qtd): {produto_ano_qtd.index[0]} - {produto_ano_qtd.iloc[0]:,} unidades")
+        produto, qtd = campeoes[('Produto', 'Qtd_Vendida')].loc[ano]
+        print(f"Produto mais vendido (qtd): {produto} - {qtd:,} unidades")
         
         # Produto mais vendido do ano (receita)
-        produto_ano_receita = df_ano.groupby('Produto')['Receita'].sum().sort_values(ascending=False)
-        print(f"Produto maior receita: {produto_ano_receita.index[0]} - R$ {produto_ano_receita.iloc[0]:,.2f}")
+        produto, receita = campeoes[('Produto', 'Receita')].loc[ano]
+        print(f"Produto maior receita: {produto} - {formatar_reais(receita, esta_em_centavos(df))}")
         
         # Vendedor que mais vendeu no ano (quantidade)
-        vendedor_ano_qtd = df_ano.groupby('Vendedor')['Qtd_Vendida'].sum().sort_values(ascending=False)
-        print(f"Vendedor mais vendeu (qtd): {vendedor_ano_qtd.index[0]} - {vendedor_ano_qtd.iloc[0]:,} unidades")
+        vendedor, qtd = campeoes[('Vendedor', 'Qtd_Vendida')].loc[ano]
+        print(f"Vendedor mais vendeu (qtd): {vendedor} - {qtd:,} unidades")
         
         # Vendedor que mais vendeu no ano (receita)
-        vendedor_ano_receita = df_ano.groupby('Vendedor')['Receita'].sum().sort_values(ascending=False)
-        print(f"Vendedor maior receita: {vendedor_ano_receita.index[0]} - R$ {vendedor_ano_receita.iloc[0]:,.2f}")
+        vendedor, receita = campeoes[('Vendedor', 'Receita')].loc[ano]
+        print(f"Vendedor maior receita: {vendedor} - {formatar_reais(receita, esta_em_centavos(df))}")
 
 def analise_por_mes(df):
     """Análise de produtos e vendedores por mês"""
@@ -122,31 +141,39 @@ def analise_por_mes(df):
     print("=" * 60)
     
     # Encontrar os meses com maiores vendas
-    vendas_por_mes = df.groupby('Ano_Mes')['Receita'].sum().sort_values(ascending=False)
-    top_meses = vendas_por_mes.head(12)  # Top 12 meses
+    top_meses = top_k(df.groupby('Ano_Mes')['Receita'].sum(), 12)  # Top 12 meses
+    
+    # Campeões de todos os meses de uma vez (top 1 por grupo, sem filtrar cada mês)
+    campeoes = {(item, metrica): campeoes_por_grupo(df, 'Ano_Mes', item, metrica)
+                for item in ('Produto', 'Vendedor') for metrica in ('Qtd_Vendida', 'Receita')}
     
     for mes_periodo in top_meses.index:
-        print(f"\n{mes_periodo} - Receita Total: R$ {top_meses[mes_periodo]:,.2f}")
+        print(f"\n{mes_periodo} - Receita Total: {formatar_reais(top_meses[mes_periodo], esta_em_centavos(df))}")
         print("-" * 50)
         
-        df_mes = df[df['Ano_Mes'] == mes_periodo]
-        
         # Produto mais vendido do mês
-        produto_mes_qtd = df_mes.groupby('Produto')['Qtd_Vendida'].sum().sort_values(ascending=False)
-        produto_mes_receita = df_mes.groupby('Produto')['Receita'].sum().sort_values(ascending=False)
+        produto_qtd, qtd = campeoes[('Produto', 'Qtd_Vendida')].loc[mes_periodo]
+        produto_receita, receita = campeoes[('Produto', 'Receita')].loc[mes_periodo]
         
-        print(f"Produto mais vendido (qtd): {produto_mes_qtd.index[0]} - {produto_mes_qtd.iloc[0]:,} unidades")
-        print(f"Produto maior receita: {produto_mes_receita.index[0]} - R$ {produto_mes_receita.iloc[0]:,.2f}")
+        print(f"Produto mais vendido (qtd): {produto_qtd} - {qtd:,} unidades")
+        print(f"Produto maior receita: {produto_receita} - {formatar_reais(receita, esta_em_centavos(df))}")
         
         # Vendedor que mais vendeu no mês
-        vendedor_mes_qtd = df_mes.groupby('Vendedor')['Qtd_Vendida'].sum().sort_values(ascending=False)
-        vendedor_mes_receita = df_mes.groupby('Vendedor')['Receita'].sum().sort_values(ascending=False)
+        vendedor_qtd, qtd = campeoes[('Vendedor', 'Qtd_Vendida')].loc[mes_periodo]
+        vendedor_receita, receita = campeoes[('Vendedor', 'Receita')].loc[mes_periodo]
         
-        print(f"Vendedor mais vendeu (qtd): {vendedor_mes_qtd.index[0]} - {vendedor_mes_qtd.iloc[0]:,} unidades")
-        print(f"Vendedor maior receita: {vendedor_mes_receita.index[0]} - R$ {vendedor_mes_receita.iloc[0]:,.2f}")
+        print(f"Vendedor mais vendeu (qtd): {vendedor_qtd} - {qtd:,} unidades")
+        print(f"Vendedor maior receita: {vendedor_receita} - {formatar_reais(receita, esta_em_centavos(df))}")
+
+def gerar_resumo_estatisticas(df, aproximado=False):
+    """Gera um resumo geral das estatísticas dos dados
+
+    Com aproximado=True (ou recebendo um ResumoAproximado, ex.: da base incremental
+    ou de ResumoAproximado.de_csv) usa os esboços HyperLogLog/KLL em memória constante.
+    """
+    if aproximado or isinstance(df, ResumoAproximado):
+        return gerar_resumo_aproximado(df if isinstance(df, ResumoAproximado) else ResumoAproximado.de_dataframe(df))
 
-def gerar_resumo_estatisticas(df):
-    """Gera um resumo geral das estatísticas dos dados"""
     safe_print("\n" + "=" * 60)
     safe_print("RESUMO ESTATISTICAS GERAIS")
     safe_print("=" * 60)
@@ -154,8 +181,10 @@ def gerar_resumo_estatisticas(df):
     safe_print(f"Periodo analisado: {df['Data'].min().strftime('%d/%m/%Y')} a {df['Data'].max().strftime('%d/%m/%Y')}")
     safe_print(f"Total de registros: {len(df):,}")
     safe_print(f"Total de produtos vendidos: {df['Qtd_Vendida'].sum():,} unidades")
-    safe_print(f"Receita total: R$ {df['Receita'].sum():,.2f}")
-    safe_print(f"Lucro total: R$ {df['Lucro'].sum():,.2f}")
+    # Somas em centavos inteiros: fecham exatamente com o sistema de origem
+    centavos = esta_em_centavos(df)
+    safe_print(f"Receita total: {formatar_reais(total_centavos(df['Receita'], centavos), centavos=True)}")
+    safe_print(f"Lucro total: {formatar_reais(total_centavos(df['Lucro'], centavos), centavos=True)}")
     safe_print(f"Numero de produtos diferentes: {df['Produto'].nunique()}")
     safe_print(f"Numero de vendedores: {df['Vendedor'].nunique()}")
     safe_print(f"Numero de regioes: {df['Regiao'].nunique()}")
@@ -164,13 +193,65 @@ def gerar_resumo_estatisticas(df):
     safe_print(f"Vendedores: {', '.join(df['Vendedor'].unique())}")
     safe_print(f"Regioes: {', '.join(df['Regiao'].unique())}")
 
+def gerar_resumo_aproximado(resumo):
+    """Resumo geral a partir dos esboços (distintos por HyperLogLog, quantis por KLL)"""
+    safe_print("\n" + "=" * 60)
+    safe_print("RESUMO ESTATISTICAS GERAIS (APROXIMADO)")
+    safe_print("=" * 60)
+    
+    safe_print(f"Periodo analisado: {resumo.data_inicial.strftime('%d/%m/%Y')} a {resumo.data_final.strftime('%d/%m/%Y')}")
+    safe_print(f"Total de registros: {resumo.n_registros:,}")
+    safe_print(f"Total de produtos vendidos: {resumo.qtd_total:,} unidades")
+    safe_print(f"Receita total: {formatar_reais(resumo.receita_centavos, centavos=True)}")
+    safe_print(f"Lucro total: {formatar_reais(resumo.lucro_centavos, centavos=True)}")
+    
+    rotulos = {'Produto': ('Numero de produtos diferentes', 'Produtos disponiveis'),
+               'Vendedor': ('Numero de vendedores', 'Vendedores'),
+               'Regiao': ('Numero de regioes', 'Regioes')}
+    for dimensao, (rotulo_contagem, _) in rotulos.items():
+        n_distintos = resumo.n_distintos(dimensao)
+        exato = len(resumo.valores[dimensao]) == n_distintos
+        erro = '' if exato else f" (~, erro padrao {resumo.distintos[dimensao].erro_padrao:.1%})"
+        safe_print(f"{rotulo_contagem}: {n_distintos:,}{erro}")
+    
+    safe_print("")
+    for dimensao, (_, rotulo_lista) in rotulos.items():
+        valores = resumo.valores[dimensao]
+        restantes = resumo.n_distintos(dimensao) - len(valores)
+        safe_print(f"{rotulo_lista}: {', '.join(valores)}" + (f" ... (+~{restantes:,})" if restantes > 0 else ""))
+    
+    safe_print("\nQuantis (KLL):")
+    for metrica, kll in resumo.quantis.items():
+        p50, p90, p99 = kll.quantil([0.5, 0.9, 0.99])
+        safe_print(f"  {metrica}: min {kll.minimo:,.2f} | p50 {p50:,.2f} | p90 {p90:,.2f} | "
+                   f"p99 {p99:,.2f} | max {kll.maximo:,.2f}")
+
 def main():
     """Função principal"""
+    import argparse
+    from dataset_particionado import CSV_VENDAS, adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    parser = argparse.ArgumentParser(description="Análise de vendas - relatório completo")
+    parser.add_argument('--aproximado', action='store_true',
+                        help="Só o resumo geral, por esboços (HyperLogLog/KLL) com o CSV lido em lotes")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
     safe_print("ANALISE DE VENDAS - RELATORIO COMPLETO")
     safe_print("=" * 60)
     
-    # Carregar dados
-    df = carregar_dados()
+    if args.aproximado:
+        # Memória constante: o CSV passa em lotes pelos esboços, sem montar o quadro
+        if any([args.de, args.ate, args.regiao, args.produto, args.vendedor]):
+            parser.error("--aproximado lê o CSV inteiro e não aceita filtros")
+        try:
+            gerar_resumo_estatisticas(ResumoAproximado.de_csv(CSV_VENDAS))
+        except FileNotFoundError:
+            safe_print(f"Erro: Arquivo {CSV_VENDAS} nao encontrado!")
+        return
+    
+    # Carregar dados (só as partições que atendem aos filtros)
+    df = preparar_dados(carregar_vendas_argumentos(args))
     
     # Executar todas as análises
     gerar_resumo_estatisticas(df)
@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+"""
+📥 ATUALIZAÇÃO INCREMENTAL MENSAL
+=================================
+
+Mantém em disco os totais mensais (Ano_Mes × Regiao × Produto × Vendedor) e as
+estatísticas de tendência usadas por previsao_inteligente_produto e
+previsao_inteligente_vendedores, para que a carga de um novo mês processe só
+as linhas novas em vez de reagregar todo o histórico:
+
+- o vendas.csv é lido a partir do último byte já processado; as linhas novas
+  viram totais mensais que são somados aos persistidos (arquivo só de acréscimo)
+- a gravação termina trocando o controle.json (os.replace): tendências e
+  esboços vão para arquivos de uma nova geração, e o controle guarda a geração em uso e o
+  tamanho de mensal.csv; uma carga interrompida antes da troca deixa o estado
+  anterior valendo (o lote a mais no fim de mensal.csv é cortado na leitura)
+- cada série de tendência (produto × mês, vendedor × trimestre) guarda n,
+  médias e co-momentos de (x = posição do período na série, y = total), como
+  em estatisticas_online; correlação, inclinação de mínimos quadrados, média e
+  desvio saem deles
+- o total de um período já existente (linhas atrasadas) é trocado no lugar;
+  um período novo no meio da série refaz só os momentos daquele grupo
+- média e desvio de Qtd_Vendida e Receita (normalização da análise preditiva)
+  são atualizados a cada lote
+- os esboços do resumo geral aproximado (HyperLogLog e KLL, ver
+  estatisticas_aproximadas) também recebem cada lote
+- a média ponderada recente (pesos que dependem do tamanho da série) é
+  calculada sobre a série de totais do grupo, sem voltar às linhas
+
+Uso:
+    python base_incremental.py --construir            # primeira carga (todo o CSV)
+    python base_incremental.py --sincronizar          # linhas acrescentadas ao CSV desde a última carga
+    python base_incremental.py --acrescentar novos.csv   # grava o lote no CSV e o incorpora
+    python base_incremental.py --previsoes            # rankings de produtos e vendedores
+    python base_incremental.py --resumo               # resumo geral aproximado (esboços gravados)
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from agregados import DIMENSOES_BASE, METRICAS_BASE, AgregadosVendas
+from diretorios import garantir_diretorio
+from estatisticas_aproximadas import ResumoAproximado
+from estatisticas_online import MomentosOnline
+
+VARIAVEIS_TENDENCIA = ['x', 'y']
+METRICAS_NORMALIZACAO = ['Qtd_Vendida', 'Receita']
+
+# Séries de tendência mantidas: nome -> (dimensão, frequência, métrica)
+SERIES_TENDENCIA = {
+    'produto_mensal': ('Produto', 'M', 'Qtd_Vendida'),
+    'vendedor_trimestral_qtd': ('Vendedor', 'Q', 'Qtd_Vendida'),
+    'vendedor_trimestral_receita': ('Vendedor', 'Q', 'Receita'),
+}
+
+ARQUIVO_MENSAL = 'mensal.csv'
+ARQUIVO_CONTROLE = 'controle.json'
+ARQUIVO_RESUMO = 'resumo_aproximado.json'
+PREFIXOS_ESTADO = ('mensal', 'tendencia_', 'resumo_aproximado')
+
+
+def arquivo_geracao(nome, geracao):
+    """Nome do arquivo de estado de uma geração (bases sem geração usam o nome simples)"""
+    if geracao is None:
+        return nome
+    raiz, extensao = os.path.splitext(nome)
+    return f'{raiz}.{geracao}{extensao}'
+
+
+def agregar_mensal(df):
+    """Totais Ano_Mes × Regiao × Produto × Vendedor das linhas (grupos na ordem em que aparecem)"""
+    datas = pd.to_datetime(df['Data'])
+    return df[METRICAS_BASE].groupby(
+        [datas.dt.to_period('M').rename('Ano_Mes')] + [df[d] for d in DIMENSOES_BASE[1:]],
+        observed=True, sort=False
+    ).sum().reset_index()
+
+
+def totais_periodo(mensal, dimensao, frequencia, metrica):
+    """Totais de uma métrica por (grupo, período) a partir dos totais mensais"""
+    periodo = mensal['Ano_Mes'] if frequencia == 'M' else mensal['Ano_Mes'].dt.asfreq(frequencia)
+    return mensal.groupby([mensal[dimensao], periodo.astype(str).rename('Periodo')], sort=False)[metrica].sum()
+
+
+class SeriesTendencia:
+    """Séries de vários grupos (grupos × períodos) com os momentos de (x = posição, y = valor) de cada uma"""
+
+    def __init__(self, grupos, periodos, valores, momentos):
+        self.grupos = pd.Index(grupos)
+        self.periodos = pd.Index(periodos)
+        self.valores = valores  # NaN onde o grupo não tem registros no período
+        self.momentos = momentos
+
+    @staticmethod
+    def _momentos_series(grupos, valores):
+        """Momentos de (x, y) das séries, com x = posição do período observado na série do grupo"""
+        observados = ~np.isnan(valores)
+        linhas, colunas = np.nonzero(observados)
+        x = (np.cumsum(observados, axis=1) - 1)[linhas, colunas]
+        return MomentosOnline.de_valores(np.column_stack([x, valores[linhas, colunas]]),
+                                         grupos=grupos[linhas], variaveis=VARIAVEIS_TENDENCIA)
+
+    @classmethod
+    def de_totais(cls, totais):
+        """Séries e momentos a partir de totais indexados por (grupo, período)"""
+        tabela = totais.unstack()
+        tabela = tabela.reindex(index=pd.unique(totais.index.get_level_values(0)),
+                                columns=sorted(tabela.columns))
+        valores = tabela.to_numpy(dtype=float)
+        return cls(tabela.index, tabela.columns, valores, cls._momentos_series(tabela.index, valores))
+
+    def _expandir(self, grupos, periodos):
+        """Inclui grupos e períodos ainda não vistos (períodos mantidos em ordem)"""
+        novos_grupos = pd.Index(pd.unique(grupos)).difference(self.grupos, sort=False)
+        novos_periodos = pd.Index(pd.unique(periodos)).difference(self.periodos)
+        if not len(novos_grupos) and not len(novos_periodos):
+            return
+        todos_grupos = self.grupos.append(novos_grupos)
+        todos_periodos = self.periodos.union(novos_periodos)
+        valores = np.full((len(todos_grupos), len(todos_periodos)), np.nan)
+        valores[:len(self.grupos), todos_periodos.get_indexer(self.periodos)] = self.valores
+        self.grupos, self.periodos, self.valores = todos_grupos, todos_periodos, valores
+
+    def acrescentar(self, totais):
+        """Soma totais novos (grupo, período) às séries, atualizando só os momentos dos grupos afetados"""
+        grupos = totais.index.get_level_values(0)
+        periodos = totais.index.get_level_values(1).astype(str)
+        self._expandir(grupos, periodos)
+
+        linhas = self.grupos.get_indexer(grupos)
+        colunas = self.periodos.get_indexer(periodos)
+        deltas = totais.to_numpy(dtype=float)
+        refazer, novos_grupos, novos_pontos = [], [], []
+        for linha in np.unique(linhas):
+            selecao = linhas == linha
+            cols, delta = colunas[selecao], deltas[selecao]
+            grupo, serie = self.grupos[linha], self.valores[linha]
+            observados = ~np.isnan(serie)
+            existentes = observados[cols]
+            ultimo = np.flatnonzero(observados)[-1] if observados.any() else -1
+
+            if (cols[~existentes] < ultimo).any():
+                # Período novo antes do fim da série: as posições x mudam, refaz o grupo
+                refazer.append(linha)
+            else:
+                # Períodos já observados: y muda para y + Δ na mesma posição x
+                posicoes = (np.cumsum(observados) - 1)[cols[existentes]]
+                for x, y, d in zip(posicoes, serie[cols[existentes]], delta[existentes]):
+                    self.momentos.substituir(grupo, [x, y], [x, y + d])
+                # Períodos novos no fim: entram nas posições n, n + 1, ...
+                y = delta[~existentes][np.argsort(cols[~existentes])]
+                novos_pontos.append(np.column_stack([observados.sum() + np.arange(len(y)), y]))
+                novos_grupos.extend([grupo] * len(y))
+            serie[cols] = np.nan_to_num(serie[cols]) + delta
+
+        if novos_grupos:
+            self.momentos.atualizar(np.vstack(novos_pontos), grupos=novos_grupos)
+        if refazer:
+            self.momentos.redefinir(self._momentos_series(self.grupos[refazer], self.valores[refazer]))
+
+    def serie(self, grupo):
+        """Valores observados do grupo, em ordem de período"""
+        valores = self.valores[self.grupos.get_loc(grupo)]
+        return valores[~np.isnan(valores)]
+
+    def estatisticas(self):
+        """n, média, desvio, correlação com o tempo e inclinação (mínimos quadrados) de cada grupo"""
+        return pd.DataFrame({
+            'n': self.momentos.contagens().astype(int),
+            'media': self.momentos.medias()['y'],
+            'desvio': self.momentos.desvios()['y'],
+            'correlacao': self.momentos.correlacao('x', 'y'),
+            'inclinacao': self.momentos.inclinacao('x', 'y'),
+        }).reindex(self.grupos)
+
+    def media_ponderada_recente(self):
+        """Média com pesos exp(linspace(-1, 0, n)): os períodos mais recentes pesam mais"""
+        medias = {}
+        for grupo, valores in zip(self.grupos, self.valores):
+            y = valores[~np.isnan(valores)]
+            medias[grupo] = np.average(y, weights=np.exp(np.linspace(-1, 0, len(y)))) if len(y) else np.nan
+        return pd.Series(medias)
+
+    def salvar(self, caminho_arquivo):
+        tabela = self.momentos.para_dataframe().reindex(self.grupos).join(
+            pd.DataFrame(self.valores, index=self.grupos, columns=self.periodos))
+        tabela.index.name = 'Grupo'
+        garantir_diretorio(caminho_arquivo)
+        tabela.to_csv(caminho_arquivo)
+
+    @classmethod
+    def carregar(cls, caminho_arquivo):
+        tabela = pd.read_csv(caminho_arquivo, index_col=0)
+        n_colunas = len(MomentosOnline.colunas(VARIAVEIS_TENDENCIA))
+        return cls(tabela.index, tabela.columns[n_colunas:], tabela.iloc[:, n_colunas:].to_numpy(dtype=float),
+                   MomentosOnline.de_dataframe(tabela.iloc[:, :n_colunas], VARIAVEIS_TENDENCIA))
+
+
+class TendenciasVendas:
+    """Séries de tendência de produtos (mensal) e vendedores (trimestral) com momentos online"""
+
+    def __init__(self, series):
+        self.series = series
+
+    @classmethod
+    def de_mensal(cls, mensal):
+        return cls({nome: SeriesTendencia.de_totais(totais_periodo(mensal, *definicao))
+                    for nome, definicao in SERIES_TENDENCIA.items()})
+
+    @classmethod
+    def de_dataframe(cls, df):
+        return cls.de_mensal(agregar_mensal(df))
+
+    def acrescentar(self, mensal_novo):
+        """Incorpora totais mensais novos (só das linhas novas) em todas as séries"""
+        for nome, definicao in SERIES_TENDENCIA.items():
+            self.series[nome].acrescentar(totais_periodo(mensal_novo, *definicao))
+
+    @property
+    def produto_mensal(self):
+        return self.series['produto_mensal']
+
+    @property
+    def vendedor_trimestral_qtd(self):
+        return self.series['vendedor_trimestral_qtd']
+
+    @property
+    def vendedor_trimestral_receita(self):
+        return self.series['vendedor_trimestral_receita']
+
+    def salvar(self, diretorio, geracao=None):
+        for nome, serie in self.series.items():
+            serie.salvar(os.path.join(diretorio, arquivo_geracao(f'tendencia_{nome}.csv', geracao)))
+
+    @classmethod
+    def carregar(cls, diretorio, geracao=None):
+        return cls({nome: SeriesTendencia.carregar(
+                        os.path.join(diretorio, arquivo_geracao(f'tendencia_{nome}.csv', geracao)))
+                    for nome in SERIES_TENDENCIA})
+
+
+class BaseIncremental:
+    """Totais mensais e tendências persistidos em um diretório, atualizados lote a lote"""
+
+    def __init__(self, diretorio, mensal, tendencias, normalizacao, controle, resumo=None):
+        self.diretorio = diretorio
+        self.mensal = mensal
+        self.tendencias = tendencias
+        self.normalizacao = normalizacao
+        self.controle = controle
+        self.resumo = resumo
+
+    @classmethod
+    def construir(cls, caminho_csv='datasets/vendas.csv', diretorio='output/incremental'):
+        """Primeira carga: agrega todo o CSV e grava o estado"""
+        with open(caminho_csv, 'rb') as f:
+            cabecalho = f.readline()
+        # O estado anterior, se houver, continua valendo até o novo controle ser gravado
+        caminho_controle = os.path.join(diretorio, ARQUIVO_CONTROLE)
+        geracao = -1
+        if os.path.exists(caminho_controle):
+            with open(caminho_controle, encoding='utf-8') as f:
+                geracao = json.load(f).get('geracao', -1)
+        arquivo_mensal = arquivo_geracao(ARQUIVO_MENSAL, geracao + 1)
+        if os.path.exists(os.path.join(diretorio, arquivo_mensal)):
+            os.remove(os.path.join(diretorio, arquivo_mensal))  # resto de uma construção interrompida
+        base = cls(diretorio, None, None, None,
+                   {'arquivo': caminho_csv, 'cabecalho': cabecalho.decode('utf-8'),
+                    'bytes_lidos': len(cabecalho), 'n_registros': 0,
+                    'data_inicial': None, 'data_final': None,
+                    'geracao': geracao, 'arquivo_mensal': arquivo_mensal, 'bytes_mensal': 0})
+        linhas = base._ler_linhas_novas()
+        if not len(linhas):
+            raise ValueError(f"{caminho_csv} não tem registros")
+        base.mensal = agregar_mensal(linhas)
+        base.tendencias = TendenciasVendas.de_mensal(base.mensal)
+        base.normalizacao = MomentosOnline.de_valores(linhas[METRICAS_NORMALIZACAO])
+        base.resumo = ResumoAproximado.de_dataframe(linhas)
+        base._gravar(linhas, base.mensal)
+        return base
+
+    @classmethod
+    def carregar(cls, diretorio='output/incremental'):
+        """Estado gravado por construir/sincronizar (totais mensais consolidados na leitura)"""
+        caminho_controle = os.path.join(diretorio, ARQUIVO_CONTROLE)
+        if not os.path.exists(caminho_controle):
+            raise ValueError(f"Nenhuma base incremental em {diretorio}. Rode com --construir primeiro")
+        with open(caminho_controle, encoding='utf-8') as f:
+            controle = json.load(f)
+
+        caminho_mensal = os.path.join(diretorio, controle.get('arquivo_mensal', ARQUIVO_MENSAL))
+        if os.path.getsize(caminho_mensal) > controle.get('bytes_mensal', os.path.getsize(caminho_mensal)):
+            # Lote de uma gravação interrompida antes do controle: as linhas serão lidas de novo
+            with open(caminho_mensal, 'r+b') as f:
+                f.truncate(controle['bytes_mensal'])
+        mensal = pd.read_csv(caminho_mensal)
+        mensal['Ano_Mes'] = pd.PeriodIndex(mensal['Ano_Mes'], freq='M')
+        mensal = mensal.groupby(['Ano_Mes'] + DIMENSOES_BASE[1:], sort=False)[METRICAS_BASE].sum().reset_index()
+        # Bases gravadas antes dos esboços ficam sem resumo aproximado até o próximo --construir
+        caminho_resumo = os.path.join(diretorio, arquivo_geracao(ARQUIVO_RESUMO, controle.get('geracao')))
+        resumo = ResumoAproximado.carregar(caminho_resumo) if os.path.exists(caminho_resumo) else None
+        return cls(diretorio, mensal, TendenciasVendas.carregar(diretorio, controle.get('geracao')),
+                   MomentosOnline.de_dict(controle['normalizacao']), controle, resumo)
+
+    def _ler_linhas_novas(self):
+        """Linhas do CSV após o último byte processado (uma linha final incompleta fica para depois)"""
+        caminho_csv = self.controle['arquivo']
+        with open(caminho_csv, 'rb') as f:
+            cabecalho = f.readline().decode('utf-8')
+            if cabecalho != self.controle['cabecalho']:
+                raise ValueError(f"O cabeçalho de {caminho_csv} mudou. Reconstrua a base com --construir")
+            tamanho = os.fstat(f.fileno()).st_size
+            if tamanho < self.controle['bytes_lidos']:
+                raise ValueError(f"{caminho_csv} ficou menor que a parte já processada. "
+                                 "Reconstrua a base com --construir")
+            f.seek(self.controle['bytes_lidos'])
+            conteudo = f.read()
+
+        completo = conteudo.rfind(b'\n') + 1
+        self.controle['bytes_lidos'] += completo
+        if not conteudo[:completo].strip():
+            return pd.DataFrame(columns=cabecalho.strip().split(','))
+        return pd.read_csv(BytesIO(cabecalho.encode('utf-8') + conteudo[:completo]))
+
+    def _gravar(self, novos, mensal_novo):
+        """Grava o estado de uma nova geração e, por último, o controle que passa a apontar para ela"""
+        geracao = self.controle.get('geracao', -1) + 1
+        self.controle.setdefault('arquivo_mensal', ARQUIVO_MENSAL)
+        if len(novos):
+            datas = pd.to_datetime(novos['Data'])
+            self.controle['n_registros'] += len(novos)
+            inicial, final = self.controle['data_inicial'], self.controle['data_final']
+            self.controle['data_inicial'] = str(min(datas.min(), pd.Timestamp(inicial or datas.min())).date())
+            self.controle['data_final'] = str(max(datas.max(), pd.Timestamp(final or datas.max())).date())
+
+            # Totais mensais: só o lote novo vai para o fim do arquivo
+            caminho_mensal = os.path.join(self.diretorio, self.controle['arquivo_mensal'])
+            garantir_diretorio(caminho_mensal)
+            with open(caminho_mensal, 'a', encoding='utf-8', newline='') as f:
+                mensal_novo.to_csv(f, index=False, header=not f.tell())
+                f.flush()
+                os.fsync(f.fileno())
+            self.controle['bytes_mensal'] = os.path.getsize(caminho_mensal)
+        self.tendencias.salvar(self.diretorio, geracao)
+        if self.resumo is not None:
+            self.resumo.salvar(os.path.join(self.diretorio, arquivo_geracao(ARQUIVO_RESUMO, geracao)))
+        self.controle['geracao'] = geracao
+        self.controle['normalizacao'] = self.normalizacao.para_dict()
+        self.controle['atualizado_em'] = datetime.now().isoformat(timespec='seconds')
+
+        # O controle é trocado de uma vez: até aqui o estado anterior continua valendo
+        caminho_controle = os.path.join(self.diretorio, ARQUIVO_CONTROLE)
+        with open(caminho_controle + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.controle, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(caminho_controle + '.tmp', caminho_controle)
+        self._remover_estado_antigo()
+
+    def _remover_estado_antigo(self):
+        """Apaga os arquivos de estado de gerações que o controle não usa mais"""
+        atuais = {self.controle['arquivo_mensal'], arquivo_geracao(ARQUIVO_RESUMO, self.controle['geracao'])}
+        atuais.update(arquivo_geracao(f'tendencia_{nome}.csv', self.controle['geracao']) for nome in SERIES_TENDENCIA)
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith(PREFIXOS_ESTADO) and nome.endswith(('.csv', '.json')) and nome not in atuais:
+                os.remove(os.path.join(self.diretorio, nome))
+
+    def incorporar(self, novos):
+        """Soma as linhas novas aos totais mensais e às tendências e grava o estado"""
+        mensal_novo = None
+        if len(novos):
+            mensal_novo = agregar_mensal(novos)
+            self.mensal = pd.concat([self.mensal, mensal_novo]).groupby(
+                ['Ano_Mes'] + DIMENSOES_BASE[1:], sort=False)[METRICAS_BASE].sum().reset_index()
+            self.tendencias.acrescentar(mensal_novo)
+            self.normalizacao.atualizar(novos[METRICAS_NORMALIZACAO])
+            if self.resumo is not None:
+                self.resumo.atualizar(novos)
+        self._gravar(novos, mensal_novo)
+        return len(novos)
+
+    def sincronizar(self):
+        """Incorpora as linhas acrescentadas ao CSV desde a última carga"""
+        return self.incorporar(self._ler_linhas_novas())
+
+    def acrescentar(self, novos):
+        """Acrescenta um lote de linhas ao CSV e o incorpora (sem reler o histórico)"""
+        colunas = self.controle['cabecalho'].strip().split(',')
+        faltando = set(colunas) - set(novos.columns)
+        if faltando:
+            raise ValueError(f"Colunas ausentes no lote: {', '.join(sorted(faltando))}")
+        # Linhas já acrescentadas por outro processo entram junto com o lote
+        pendentes = self._ler_linhas_novas()
+        if self.controle['bytes_lidos'] != os.path.getsize(self.controle['arquivo']):
+            raise ValueError(f"{self.controle['arquivo']} termina com uma linha incompleta")
+        with open(self.controle['arquivo'], 'ab') as f:
+            f.write(novos[colunas].to_csv(index=False, header=False).encode('utf-8'))
+        self.controle['bytes_lidos'] = os.path.getsize(self.controle['arquivo'])
+        if len(pendentes):
+            novos = pd.concat([pendentes, novos], ignore_index=True)
+        return self.incorporar(novos[colunas])
+
+    def agregados(self):
+        """Provedor de agregados (AgregadosVendas) a partir dos totais mensais persistidos"""
+        return AgregadosVendas.de_base(self.mensal, self.controle['n_registros'],
+                                       pd.Timestamp(self.controle['data_inicial']),
+                                       pd.Timestamp(self.controle['data_final']))
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Atualização incremental dos totais mensais e tendências")
+    acao = parser.add_mutually_exclusive_group(required=True)
+    acao.add_argument('--construir', action='store_true', help="Agrega todo o CSV (primeira carga)")
+    acao.add_argument('--sincronizar', action='store_true', help="Incorpora as linhas novas do CSV")
+    acao.add_argument('--acrescentar', metavar='LOTE_CSV', help="Acrescenta o lote ao CSV e o incorpora")
+    acao.add_argument('--previsoes', action='store_true', help="Mostra as previsões com as tendências gravadas")
+    acao.add_argument('--resumo', action='store_true', help="Resumo geral aproximado com os esboços gravados")
+    parser.add_argument('--csv', default='datasets/vendas.csv', help="CSV de vendas (padrão: datasets/vendas.csv)")
+    parser.add_argument('--diretorio', default='output/incremental', help="Diretório do estado incremental")
+    args = parser.parse_args()
+
+    inicio = datetime.now()
+    try:
+        if args.construir:
+            base = BaseIncremental.construir(args.csv, args.diretorio)
+            print(f"✅ Base construída: {base.controle['n_registros']:,} registros, "
+                  f"{len(base.mensal):,} totais mensais")
+        elif args.previsoes:
+            from analise_predicao_vendas import AnalisePredicaoVendas
+            analise = AnalisePredicaoVendas(None, tendencias=BaseIncremental.carregar(args.diretorio).tendencias)
+            analise.previsao_inteligente_produto()
+            analise.previsao_inteligente_vendedores()
+            return
+        elif args.resumo:
+            from analise_vendas import gerar_resumo_estatisticas
+            base = BaseIncremental.carregar(args.diretorio)
+            if base.resumo is None:
+                raise ValueError(f"A base em {args.diretorio} não tem esboços. Reconstrua com --construir")
+            gerar_resumo_estatisticas(base.resumo)
+            return
+        else:
+            base = BaseIncremental.carregar(args.diretorio)
+            n_novos = base.acrescentar(pd.read_csv(args.acrescentar)) if args.acrescentar else base.sincronizar()
+            print(f"✅ {n_novos:,} registros novos incorporados "
+                  f"(total: {base.controle['n_registros']:,}, até {base.controle['data_final']})")
+    except (FileNotFoundError, ValueError) as erro:
+        print(f"❌ Erro: {erro}")
+        return
+    print(f"⏱️ {(datetime.now() - inicio).total_seconds():.2f}s | 📁 {args.diretorio}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+🎛️ CENÁRIOS FINANCEIROS - PREÇO E INFLAÇÃO
+==========================================
+
+Tabelas de cenário com fatores de ajuste de receita e custo unitários para as
+previsões financeiras 2025, e modo de varredura que avalia centenas de
+combinações de fatores sobre a economia unitária já calculada, em uma única
+operação vetorizada.
+
+Formato da tabela de cenários (CSV):
+
+    Nivel,Chave,Fator_Receita,Fator_Custo
+    Tendencia,CRESCIMENTO,1.08,1.05
+    Regiao,Sul,1.02,1.03
+    Categoria,Informatica,1.05,1.04
+    Produto,Notebook,1.10,1.06
+
+Precedência por produto: Produto > Categoria > Regiao > Tendencia.
+Fatores por região são ponderados pela participação da região na receita do produto.
+Categorias vêm de CATEGORIAS_PRODUTO ou de um CSV Produto,Categoria (--categorias).
+
+Na varredura, os fatores da grade multiplicam os fatores já resolvidos da
+tabela (a padrão, sem --cenarios): o ponto 1.0 × 1.0 reproduz a previsão
+financeira do cenário.
+
+Uso:
+    python cenarios_financeiros.py --cenarios cenarios.csv --categorias categorias.csv
+    python cenarios_financeiros.py --cenarios cenarios.csv --varredura --passos 21
+"""
+
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+NIVEIS_CENARIO = ['Tendencia', 'Regiao', 'Categoria', 'Produto']
+COLUNAS_CENARIO = ['Nivel', 'Chave', 'Fator_Receita', 'Fator_Custo']
+
+# Mapeamento padrão Produto → Categoria dos produtos do dataset
+CATEGORIAS_PRODUTO = {
+    'Notebook': 'Informatica',
+    'Monitor': 'Informatica',
+    'Impressora': 'Informatica',
+    'Smartphone': 'Telefonia',
+    'Headset': 'Acessorios',
+}
+
+# Cenário padrão: crescimento permite melhor margem, queda exige redução de preço,
+# estável segue a inflação
+TENDENCIAS_PRODUTO = ['CRESCIMENTO', 'QUEDA', 'ESTÁVEL']
+CENARIO_PADRAO = pd.DataFrame({
+    'Nivel': 'Tendencia',
+    'Chave': TENDENCIAS_PRODUTO,
+    'Fator_Receita': [1.08, 0.95, 1.04],
+    'Fator_Custo': [1.05, 1.03, 1.04]
+}, columns=COLUNAS_CENARIO)
+
+
+def carregar_cenarios(caminho_arquivo):
+    """Carrega e valida uma tabela de cenários em CSV"""
+    cenarios = pd.read_csv(caminho_arquivo)
+
+    faltando = set(COLUNAS_CENARIO) - set(cenarios.columns)
+    if faltando:
+        raise ValueError(f"Tabela de cenários sem as colunas: {', '.join(sorted(faltando))}")
+
+    niveis_invalidos = set(cenarios['Nivel']) - set(NIVEIS_CENARIO)
+    if niveis_invalidos:
+        raise ValueError(f"Níveis de cenário inválidos: {', '.join(sorted(niveis_invalidos))}. "
+                         f"Use um de {NIVEIS_CENARIO}")
+
+    duplicadas = cenarios.duplicated(['Nivel', 'Chave'])
+    if duplicadas.any():
+        chaves = cenarios.loc[duplicadas, 'Chave'].astype(str)
+        raise ValueError(f"Chaves de cenário duplicadas: {', '.join(chaves)}")
+
+    return cenarios[COLUNAS_CENARIO]
+
+
+def carregar_categorias(caminho_arquivo):
+    """Carrega um mapeamento Produto → Categoria de um CSV com colunas Produto e Categoria"""
+    categorias = pd.read_csv(caminho_arquivo)
+    faltando = {'Produto', 'Categoria'} - set(categorias.columns)
+    if faltando:
+        raise ValueError(f"Tabela de categorias sem as colunas: {', '.join(sorted(faltando))}")
+    if categorias['Produto'].duplicated().any():
+        duplicados = categorias.loc[categorias['Produto'].duplicated(), 'Produto'].astype(str)
+        raise ValueError(f"Produtos duplicados na tabela de categorias: {', '.join(duplicados)}")
+    return dict(zip(categorias['Produto'], categorias['Categoria']))
+
+
+def _fatores_do_nivel(cenarios, nivel):
+    """Fatores (receita, custo) de um nível da tabela, indexados pela chave"""
+    linhas = cenarios[cenarios['Nivel'] == nivel]
+    return linhas.set_index('Chave')[['Fator_Receita', 'Fator_Custo']]
+
+
+def fatores_por_produto(economia, cenarios=None, participacao_regional=None, categorias=None):
+    """Resolve a tabela de cenários em um par de fatores (receita, custo) por produto
+
+    Sem `categorias`, usa CATEGORIAS_PRODUTO (produtos fora dele não têm categoria).
+    """
+    cenarios = CENARIO_PADRAO if cenarios is None else cenarios
+    categorias = CATEGORIAS_PRODUTO if categorias is None else categorias
+    produtos = economia.index
+    codigos_tendencia = pd.Categorical(economia['tendencia'], categories=TENDENCIAS_PRODUTO).codes
+
+    # Tendência: tabela de consulta indexada pelo código categórico (padrão para chaves ausentes)
+    tabela_tendencia = _fatores_do_nivel(CENARIO_PADRAO, 'Tendencia')
+    tabela_tendencia.update(_fatores_do_nivel(cenarios, 'Tendencia'))
+    tabela_tendencia = tabela_tendencia.reindex(TENDENCIAS_PRODUTO).values
+    fatores = tabela_tendencia[codigos_tendencia].copy()
+
+    # Região: média dos fatores regionais ponderada pela receita do produto em cada região
+    fatores_regiao = _fatores_do_nivel(cenarios, 'Regiao')
+    if not fatores_regiao.empty:
+        if participacao_regional is None:
+            raise ValueError("Cenários por região exigem a participação regional dos produtos")
+        participacao = participacao_regional.reindex(index=produtos, fill_value=0).values
+        regioes = participacao_regional.columns
+        tem_fator = regioes.isin(fatores_regiao.index)
+        tabela_regiao = fatores_regiao.reindex(regioes).values
+        for i in range(2):
+            por_regiao = np.where(tem_fator[None, :], tabela_regiao[None, :, i], fatores[:, i:i + 1])
+            fatores[:, i] = (participacao * por_regiao).sum(axis=1)
+
+    # Categoria e produto sobrescrevem os níveis anteriores
+    fatores_categoria = _fatores_do_nivel(cenarios, 'Categoria')
+    if not fatores_categoria.empty:
+        categoria_produto = pd.Series(categorias).reindex(produtos)
+        por_categoria = fatores_categoria.reindex(categoria_produto.values).values
+        fatores = np.where(np.isnan(por_categoria), fatores, por_categoria)
+
+    fatores_produto = _fatores_do_nivel(cenarios, 'Produto')
+    if not fatores_produto.empty:
+        por_produto = fatores_produto.reindex(produtos).values
+        fatores = np.where(np.isnan(por_produto), fatores, por_produto)
+
+    return fatores[:, 0], fatores[:, 1]
+
+
+def grade_cenarios(fatores_receita, fatores_custo):
+    """Todas as combinações de fatores de receita × custo, como dois vetores planos"""
+    grade_receita, grade_custo = np.meshgrid(np.asarray(fatores_receita, dtype=float),
+                                             np.asarray(fatores_custo, dtype=float),
+                                             indexing='ij')
+    return grade_receita.ravel(), grade_custo.ravel()
+
+
+def varrer_cenarios(economia, fatores_receita, fatores_custo, fatores_base=None):
+    """Avalia N cenários de uma vez sobre a economia unitária (broadcast N × produtos)
+
+    Os fatores podem ser vetores (N,), aplicados a todos os produtos, ou matrizes
+    (N, produtos) com fatores específicos por produto. `fatores_base` é o par
+    (receita, custo) por produto de uma tabela de cenários (fatores_por_produto),
+    multiplicado pelos fatores da varredura; sem ele, os valores unitários
+    históricos são usados sem ajuste.
+    """
+    fatores_receita = np.asarray(fatores_receita, dtype=float)
+    fatores_custo = np.asarray(fatores_custo, dtype=float)
+    if fatores_receita.ndim == 1:
+        fatores_receita = fatores_receita[:, None]
+    if fatores_custo.ndim == 1:
+        fatores_custo = fatores_custo[:, None]
+    globais_receita, globais_custo = fatores_receita, fatores_custo
+    if fatores_base is not None:
+        fatores_receita = fatores_receita * np.asarray(fatores_base[0], dtype=float)[None, :]
+        fatores_custo = fatores_custo * np.asarray(fatores_base[1], dtype=float)[None, :]
+
+    qtd = economia['qtd_prevista'].values
+    receita_base = qtd * economia['receita_unitaria'].values
+    custo_base = qtd * economia['custo_unitario'].values
+
+    # Uma única operação broadcast: cenários × produtos
+    receita = receita_base[None, :] * fatores_receita
+    custo = custo_base[None, :] * fatores_custo
+    lucro = receita - custo
+
+    receita_total = receita.sum(axis=1)
+    custo_total = custo.sum(axis=1)
+    lucro_total = lucro.sum(axis=1)
+
+    receita_atual = economia['receita_atual'].sum()
+    lucro_atual = economia['lucro_atual'].sum()
+
+    resultado = pd.DataFrame({
+        'receita_prevista': receita_total,
+        'custo_previsto': custo_total,
+        'lucro_previsto': lucro_total,
+        'margem_prevista_%': np.where(receita_total > 0, lucro_total / receita_total * 100, 0),
+        'variacao_receita_%': (receita_total - receita_atual) / receita_atual * 100,
+        'variacao_lucro_%': (lucro_total - lucro_atual) / lucro_atual * 100,
+        'produto_mais_lucrativo': economia.index.values[lucro.argmax(axis=1)]
+    })
+
+    # Fatores globais ficam registrados junto ao resultado de cada cenário
+    if globais_receita.shape[1] == 1:
+        resultado.insert(0, 'Fator_Receita', np.broadcast_to(globais_receita[:, 0], len(resultado)))
+    if globais_custo.shape[1] == 1:
+        resultado.insert(1 if 'Fator_Receita' in resultado else 0, 'Fator_Custo',
+                         np.broadcast_to(globais_custo[:, 0], len(resultado)))
+
+    return resultado
+
+
+def main():
+    """Função principal: varredura de cenários de preço × custo"""
+    import argparse
+    from io import StringIO
+    from analise_predicao_vendas import AnalisePredicaoVendas
+    from dataset_particionado import adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    parser = argparse.ArgumentParser(description="Cenários financeiros 2025")
+    parser.add_argument('--cenarios', help="CSV com a tabela de cenários (Nivel, Chave, Fator_Receita, Fator_Custo)")
+    parser.add_argument('--categorias', help="CSV com o mapeamento Produto,Categoria (padrão: CATEGORIAS_PRODUTO)")
+    parser.add_argument('--varredura', action='store_true',
+                        help="Varredura de fatores receita × custo sobre o cenário (1.0 = cenário sem ajuste)")
+    parser.add_argument('--passos', type=int, default=21, help="Passos por eixo da varredura")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
+    try:
+        cenarios = carregar_cenarios(args.cenarios) if args.cenarios else None
+        categorias = carregar_categorias(args.categorias) if args.categorias else None
+    except (FileNotFoundError, ValueError) as erro:
+        print(f"❌ Erro: {erro}")
+        return
+
+    df = carregar_vendas_argumentos(args)
+    analise = AnalisePredicaoVendas(df)
+
+    if args.cenarios:
+        analise.previsoes_financeiras_produtos(cenarios=cenarios, categorias=categorias)
+
+    if args.varredura:
+        # Economia unitária calculada uma única vez (silenciosa)
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            economia = analise.economia_unitaria_produtos()
+        finally:
+            sys.stdout = old_stdout
+
+        # A grade varia em torno do cenário carregado (ou do padrão)
+        participacao_regional = None
+        if cenarios is not None and (cenarios['Nivel'] == 'Regiao').any():
+            participacao_regional = analise.participacao_regional_produtos()
+        fatores_base = fatores_por_produto(economia, cenarios, participacao_regional, categorias)
+
+        fatores_receita, fatores_custo = grade_cenarios(np.linspace(0.90, 1.10, args.passos),
+                                                        np.linspace(0.95, 1.15, args.passos))
+        resultado = varrer_cenarios(economia, fatores_receita, fatores_custo, fatores_base)
+
+        print("=" * 70)
+        print(f"🎛️ VARREDURA DE CENÁRIOS - {len(resultado)} combinações receita × custo")
+        print("=" * 70)
+        colunas = ['Fator_Receita', 'Fator_Custo', 'lucro_previsto', 'margem_prevista_%', 'variacao_lucro_%']
+        print("\n🏆 Melhores cenários (lucro previsto):")
+        print(resultado.nlargest(5, 'lucro_previsto')[colunas].to_string(index=False))
+        print("\n⚠️  Piores cenários (lucro previsto):")
+        print(resultado.nsmallest(5, 'lucro_previsto')[colunas].to_string(index=False))
+        print(f"\n📉 Cenários com queda de lucro: {(resultado['variacao_lucro_%'] < 0).sum()} de {len(resultado)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+📨 CLIENTE DO SERVIDOR DE ANÁLISES
+==================================
+
+Cliente fino do servidor_analises.py: importa só a biblioteca padrão (nada de
+pandas/plotly), manda uma tarefa e imprime a resposta, então cada consulta
+custa o tempo da tarefa no servidor já aquecido, não o de carregar bibliotecas
+e dados.
+
+Uso:
+    python cliente_analises.py resumo --regiao Sul --de 2024-01
+    python cliente_analises.py previsao --regiao Norte
+    python cliente_analises.py ranking --por Vendedor --metrica Lucro -k 5
+    python cliente_analises.py grafico --nome heatmap --produto Notebook
+    python cliente_analises.py status | recarregar | parar
+    python cliente_analises.py resumo --porta 8765     # servidor em localhost
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+SOCKET_PADRAO = 'output/daemon/analises.sock'
+PORTA_PADRAO = 8765
+TAREFAS = ('resumo', 'previsao', 'ranking', 'grafico', 'status', 'recarregar', 'parar')
+
+
+def enviar_pedido(pedido, caminho_socket=SOCKET_PADRAO, porta=None, timeout=300):
+    """Envia um pedido (dict) e devolve a resposta (dict) do servidor"""
+    if porta is not None or not hasattr(socket, 'AF_UNIX'):
+        conexao = socket.create_connection(('127.0.0.1', PORTA_PADRAO if porta is None else porta), timeout)
+    else:
+        conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conexao.settimeout(timeout)
+        conexao.connect(caminho_socket)
+    with conexao, conexao.makefile('rwb') as canal:
+        canal.write(json.dumps(pedido, ensure_ascii=False).encode('utf-8') + b'\n')
+        canal.flush()
+        linha = canal.readline()
+    if not linha:
+        raise ConnectionError("O servidor fechou a conexão sem responder")
+    return json.loads(linha)
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cliente do servidor de análises")
+    parser.add_argument('tarefa', choices=TAREFAS)
+    parser.add_argument('--socket', default=SOCKET_PADRAO, help=f"Socket Unix do servidor (padrão: {SOCKET_PADRAO})")
+    parser.add_argument('--porta', type=int, help="Conecta em 127.0.0.1:PORTA em vez do socket Unix")
+    parser.add_argument('--de', help="Primeiro mês (AAAA-MM)")
+    parser.add_argument('--ate', help="Último mês (AAAA-MM)")
+    parser.add_argument('--regiao', nargs='+', help="Uma ou mais regiões")
+    parser.add_argument('--produto', nargs='+', help="Um ou mais produtos")
+    parser.add_argument('--vendedor', nargs='+', help="Um ou mais vendedores")
+    parser.add_argument('--nome', help="Gráfico: temporal, produtos, vendedores, regioes ou heatmap (padrão)")
+    parser.add_argument('--por', help="Ranking: Produto (padrão), Vendedor ou Regiao")
+    parser.add_argument('--metrica', help="Ranking: Qtd_Vendida, Receita (padrão) ou Lucro")
+    parser.add_argument('-k', type=int, help="Ranking: quantos colocados (padrão: 10)")
+    args = parser.parse_args()
+
+    pedido = {
+        'tarefa': args.tarefa,
+        'filtros': {chave: getattr(args, chave) for chave in ('de', 'ate', 'regiao', 'produto', 'vendedor')
+                    if getattr(args, chave)},
+        'opcoes': {chave: getattr(args, chave) for chave in ('nome', 'por', 'metrica', 'k')
+                   if getattr(args, chave) is not None},
+    }
+    inicio = time.perf_counter()
+    try:
+        resposta = enviar_pedido(pedido, args.socket, args.porta)
+    except (ConnectionError, FileNotFoundError, socket.timeout) as erro:
+        print(f"❌ Servidor de análises indisponível ({erro}). Inicie com: python servidor_analises.py")
+        sys.exit(1)
+
+    if not resposta.get('ok'):
+        print(f"❌ Erro: {resposta.get('erro')}")
+        sys.exit(1)
+    print(resposta.get('saida', ''), end='')
+    if resposta.get('arquivo'):
+        print(f"📁 Arquivo: {resposta['arquivo']}")
+    print(f"⏱️ {resposta['tempo_ms']:.1f} ms no servidor, {(time.perf_counter() - inicio) * 1000:.1f} ms no total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+🧊 CUBO DE VENDAS COM SOMAS ACUMULADAS POR MÊS
+==============================================
+
+Agrega os dados uma única vez em células Regiao × Produto × Vendedor (somente as
+combinações observadas) com somas acumuladas ao longo dos meses. Qualquer
+recorte por período e dimensões é respondido em O(células):
+
+- total de um intervalo de meses = acumulado[ate + 1] - acumulado[de]
+- filtros por região/produto/vendedor = máscara sobre os códigos das células
+- agrupamentos = bincount dos códigos da dimensão pedida
+- com centavos=True, Receita/Lucro são acumulados em centavos int64: somas
+  exatas, convertidas para reais só na saída
+
+Exemplo:
+    cubo = CuboVendas.de_dataframe(df)
+    cubo.consultar(por='Produto', de='2023-01', ate='2023-12', regiao=['Sul'])
+    cubo.serie_mensal(por='Vendedor', metrica='Receita', produto=['Notebook'])
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from moeda import COLUNAS_MONETARIAS, em_centavos, esta_em_centavos
+
+DIMENSOES_CUBO = ['Regiao', 'Produto', 'Vendedor']
+METRICAS_CUBO = ['Qtd_Vendida', 'Receita', 'Lucro']
+FILTROS_DIMENSAO = {'regiao': 'Regiao', 'produto': 'Produto', 'vendedor': 'Vendedor'}
+
+
+class CuboVendas:
+    def __init__(self, meses, valores_dimensao, codigos, acumulado, metricas, escala=None):
+        self.meses = meses
+        self.valores_dimensao = valores_dimensao
+        self.codigos = codigos
+        self.acumulado = acumulado
+        self.metricas = list(metricas)
+        # Divisor de cada métrica na saída (100 para as monetárias acumuladas em centavos)
+        self.escala = np.ones(len(self.metricas)) if escala is None else np.asarray(escala, dtype=float)
+
+    @classmethod
+    def de_dataframe(cls, df, metricas=METRICAS_CUBO, centavos=False):
+        """Monta o cubo em uma única passada sobre as linhas
+
+        centavos=True acumula as métricas monetárias em centavos int64 (somas exatas).
+        """
+        datas = pd.to_datetime(df['Data'])
+        mes_abs = datas.dt.year.values * 12 + datas.dt.month.values - 1
+        mes_inicial = int(mes_abs.min())
+        mes_idx = mes_abs - mes_inicial
+        n_meses = int(mes_idx.max()) + 1
+        meses = pd.period_range(
+            start=pd.Period(year=mes_inicial // 12, month=mes_inicial % 12 + 1, freq='M'),
+            periods=n_meses, freq='M'
+        )
+
+        # Código de cada dimensão e chave combinada da célula
+        valores_dimensao = {}
+        chave = np.zeros(len(df), dtype=np.int64)
+        for dimensao in DIMENSOES_CUBO:
+            codigos_dim, valores = pd.factorize(df[dimensao], sort=True)
+            valores_dimensao[dimensao] = pd.Index(valores, name=dimensao)
+            chave = chave * len(valores) + codigos_dim
+
+        celula, chaves_celula = pd.factorize(chave)
+        n_celulas = len(chaves_celula)
+
+        # Decodificar a chave combinada de volta em códigos por dimensão
+        codigos = {}
+        resto = np.asarray(chaves_celula, dtype=np.int64)
+        for dimensao in reversed(DIMENSOES_CUBO):
+            n_valores = len(valores_dimensao[dimensao])
+            codigos[dimensao] = (resto % n_valores).astype(np.int32)
+            resto = resto // n_valores
+
+        # Métricas em centavos (monetárias) ou como estão; inteiras vão para int64
+        colunas = [em_centavos(df[metrica], esta_em_centavos(df)) if centavos and metrica in COLUNAS_MONETARIAS else df[metrica]
+                   for metrica in metricas]
+        escala = [100 if centavos and metrica in COLUNAS_MONETARIAS else 1 for metrica in metricas]
+        inteiro = all(pd.api.types.is_integer_dtype(coluna) for coluna in colunas)
+
+        # Somas mensais por célula e acumulado ao longo dos meses (bincount soma em
+        # float64, exato para inteiros até 2**53 por célula-mês)
+        indice = celula * n_meses + mes_idx
+        acumulado = np.zeros((len(metricas), n_celulas, n_meses + 1), dtype=np.int64 if inteiro else float)
+        for i, coluna in enumerate(colunas):
+            mensal = np.bincount(indice, weights=coluna.values, minlength=n_celulas * n_meses)
+            if inteiro:
+                mensal = np.rint(mensal).astype(np.int64)
+            np.cumsum(mensal.reshape(n_celulas, n_meses), axis=1, out=acumulado[i, :, 1:])
+
+        return cls(meses, valores_dimensao, codigos, acumulado, metricas, escala)
+
+    @property
+    def n_celulas(self):
+        return self.acumulado.shape[1]
+
+    def intervalo(self, de=None, ate=None):
+        """Índices [inicio, fim] (inclusivos) dos meses do intervalo pedido"""
+        inicio = 0 if de is None else pd.Period(de, freq='M').ordinal - self.meses[0].ordinal
+        fim = len(self.meses) - 1 if ate is None else pd.Period(ate, freq='M').ordinal - self.meses[0].ordinal
+        return max(inicio, 0), min(fim, len(self.meses) - 1)
+
+    def mascara(self, regiao=None, produto=None, vendedor=None):
+        """Máscara das células que atendem aos filtros de dimensão"""
+        mascara = np.ones(self.n_celulas, dtype=bool)
+        for chave, valores in (('regiao', regiao), ('produto', produto), ('vendedor', vendedor)):
+            if valores is None:
+                continue
+            if isinstance(valores, str):
+                valores = [valores]
+            dimensao = FILTROS_DIMENSAO[chave]
+            codigos_filtro = self.valores_dimensao[dimensao].get_indexer(list(valores))
+            mascara &= np.isin(self.codigos[dimensao], codigos_filtro[codigos_filtro >= 0])
+        return mascara
+
+    def _somas_intervalo(self, mascara, inicio, fim):
+        """Somas de cada célula no intervalo de meses: acumulado[fim + 1] - acumulado[inicio]"""
+        if fim < inicio:
+            return np.zeros((int(mascara.sum()), len(self.metricas)))
+        return (self.acumulado[:, mascara, fim + 1] - self.acumulado[:, mascara, inicio]).T
+
+    def _agrupar(self, dimensao, mascara, valores):
+        """Soma linhas de células por código da dimensão (somente grupos presentes)"""
+        codigos = self.codigos[dimensao][mascara]
+        n_grupos = len(self.valores_dimensao[dimensao])
+        presentes = np.bincount(codigos, minlength=n_grupos) > 0
+        somas = np.column_stack([np.bincount(codigos, weights=valores[:, i], minlength=n_grupos)
+                                 for i in range(valores.shape[1])]) / self.escala
+        return pd.DataFrame(somas[presentes], index=self.valores_dimensao[dimensao][presentes],
+                            columns=self.metricas)
+
+    def consultar(self, por=None, de=None, ate=None, **filtros):
+        """Totais do recorte; agrupados por uma dimensão quando `por` é informado"""
+        inicio, fim = self.intervalo(de, ate)
+        mascara = self.mascara(**filtros)
+        valores = self._somas_intervalo(mascara, inicio, fim)
+
+        if por is None:
+            return pd.Series(valores.sum(axis=0) / self.escala, index=self.metricas)
+        return self._agrupar(por, mascara, valores)
+
+    def serie_mensal(self, por=None, metrica=None, de=None, ate=None, **filtros):
+        """Série mensal do recorte: todas as métricas, ou uma métrica por grupo (meses × grupos)"""
+        inicio, fim = self.intervalo(de, ate)
+        mascara = self.mascara(**filtros)
+        fim = max(fim, inicio - 1)
+        indice = pd.Index(self.meses[inicio:fim + 1].astype(str), name='Data_Str')
+
+        # Agrupa os acumulados (operação linear) e só então diferencia: meses × grupos
+        if por is None:
+            codigos = np.zeros(self.n_celulas, dtype=np.int32)
+            n_grupos = 1
+            colunas = list(range(len(self.metricas)))
+        else:
+            codigos = self.codigos[por]
+            n_grupos = len(self.valores_dimensao[por])
+            colunas = [self.metricas.index(metrica or self.metricas[0])]
+        indicador = sparse.csr_matrix((mascara.astype(float), (codigos, np.arange(self.n_celulas))),
+                                      shape=(n_grupos, self.n_celulas))
+
+        series = [np.diff(indicador @ self.acumulado[i, :, inicio:fim + 2], axis=1) / self.escala[i] for i in colunas]
+        if por is None:
+            return pd.DataFrame(np.column_stack([serie[0] for serie in series]),
+                                index=indice, columns=self.metricas)
+
+        presentes = np.bincount(codigos[mascara], minlength=n_grupos) > 0
+        return pd.DataFrame(series[0][presentes].T, index=indice,
+                            columns=self.valores_dimensao[por][presentes])
+
+    def matriz(self, linhas, colunas, metrica='Qtd_Vendida', de=None, ate=None, **filtros):
+        """Matriz linhas × colunas de uma métrica (ex.: Vendedor × Produto)"""
+        inicio, fim = self.intervalo(de, ate)
+        mascara = self.mascara(**filtros)
+        i = self.metricas.index(metrica)
+        valores = self._somas_intervalo(mascara, inicio, fim)[:, i]
+
+        n_linhas = len(self.valores_dimensao[linhas])
+        n_colunas = len(self.valores_dimensao[colunas])
+        plano = self.codigos[linhas][mascara].astype(np.int64) * n_colunas + self.codigos[colunas][mascara]
+        matriz = np.bincount(plano, weights=valores, minlength=n_linhas * n_colunas).reshape(n_linhas, n_colunas)
+        matriz = matriz / self.escala[i]
+        presentes = np.bincount(plano, minlength=n_linhas * n_colunas).reshape(n_linhas, n_colunas) > 0
+        linhas_presentes = presentes.any(axis=1)
+        colunas_presentes = presentes.any(axis=0)
+        return pd.DataFrame(matriz[np.ix_(linhas_presentes, colunas_presentes)],
+                            index=self.valores_dimensao[linhas][linhas_presentes],
+                            columns=self.valores_dimensao[colunas][colunas_presentes])
@@ -20,6 +20,13 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.io as pio
+from agregados import obter_agregados
+from diretorios import garantir_diretorio
+from heatmap_escalavel import HeatmapEscalavel
+from modelos_graficos import BarrasRotuladas, cores_por_faixa, FAIXAS_MARGEM, FAIXAS_ROI
+from pacote_dashboard import PacoteDashboard
+from figuras_compactas import salvar_html_compacto
+from visualizacao_interativa import VisualizacaoInterativa
 from datetime import datetime
 import warnings
 import os
@@ -29,25 +36,39 @@ import sys
 if sys.platform == "win32":
     os.system("chcp 65001 > nul")
 
-def garantir_diretorio(caminho_arquivo):
-    """Garante que o diretório do arquivo existe, criando se necessário"""
-    diretorio = os.path.dirname(caminho_arquivo)
-    if diretorio and not os.path.exists(diretorio):
-        os.makedirs(diretorio, exist_ok=True)
-        print(f"📁 Diretório criado: {diretorio}")
-
 warnings.filterwarnings('ignore')
 
+# Imagens do relatório (relativas a output/) exibidas na aba de imagens do pacote
+IMAGENS_RELATORIO = [
+    ('imagens/dashboard_vendas_gerais.png', "📊 Dashboard Geral"),
+    ('imagens/heatmap_performance.png', "🔥 Heatmap Performance"),
+    ('imagens/analise_financeira_detalhada.png', "💰 Análise Financeira"),
+    ('imagens/previsoes_financeiras_inteligentes.png', "🔮 Previsões Financeiras"),
+    ('imagens/previsoes_financeiras_produtos_2025.png', "💰 Previsões por Produto 2025"),
+    ('imagens/previsoes_2025.png', "🔮 Previsões 2025"),
+]
+
 # Configurações visuais
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 pio.templates.default = "plotly_white"
 
 class DashboardCompleto:
-    def __init__(self, df):
+    def __init__(self, df, modo_lote=False, diretorio_saida='output'):
         self.df = df.copy()
+        self.modo_lote = modo_lote
+        # Raiz dos arquivos gerados (imagens/, html_interativos/, index_dashboard.html)
+        self.diretorio_saida = diretorio_saida
+        # Quando definido, as figuras interativas vão para o pacote de página única
+        self.pacote = None
+        if modo_lote:
+            # Renderização sem janela: backend Agg, sem abas no navegador e figuras liberadas
+            plt.switch_backend('Agg')
         self.preparar_dados()
         self.criar_diretorios()
+        # Totais compartilhados por todos os gráficos (calculados uma única vez por conjunto de dados)
+        self.agregados = obter_agregados(self.df)
+        self.heatmap = HeatmapEscalavel()
         
         # Configurar cores
         self.cores_produtos = px.colors.qualitative.Set3
@@ -70,12 +91,39 @@ class DashboardCompleto:
     def criar_diretorios(self):
         """Cria diretórios para organizar os gráficos"""
         # Estrutura principal de output
-        if not os.path.exists('output'):
-            os.makedirs('output')
-        if not os.path.exists('output/imagens'):
-            os.makedirs('output/imagens')
-        if not os.path.exists('output/html_interativos'):
-            os.makedirs('output/html_interativos')
+        for subdiretorio in ('imagens', 'html_interativos'):
+            os.makedirs(os.path.join(self.diretorio_saida, subdiretorio), exist_ok=True)
+    
+    def _caminho_saida(self, *partes):
+        """Caminho de um arquivo gerado, dentro do diretório de saída"""
+        return os.path.join(self.diretorio_saida, *partes)
+    
+    def _finalizar_grafico(self):
+        """Exibe o gráfico atual ou, em modo lote, fecha a figura para liberar memória"""
+        if self.modo_lote:
+            plt.close(plt.gcf())
+        else:
+            plt.show()
+    
+    def _finalizar_figura(self, fig, exibir=True):
+        """Exibe a figura plotly ou, em modo lote, descarta seus dados após gravar o HTML"""
+        if self.modo_lote:
+            fig.data = ()
+            fig.layout = {}
+        elif exibir:
+            fig.show()
+    
+    def _salvar_figura(self, fig, caminho_arquivo):
+        """Grava o HTML da figura (ou a adiciona ao pacote de página única) e finaliza"""
+        if self.pacote is not None:
+            nome = os.path.splitext(os.path.basename(caminho_arquivo))[0]
+            self.pacote.adicionar_figura(nome, fig)
+            self._finalizar_figura(fig, exibir=False)
+            return
+        
+        # Arrays numéricos gravados como arrays tipados (bdata), não como listas em texto
+        salvar_html_compacto(fig, caminho_arquivo)
+        self._finalizar_figura(fig)
     
     def dashboard_vendas_gerais(self):
         """Dashboard geral de vendas - Estático"""
@@ -85,34 +133,27 @@ class DashboardCompleto:
         fig.suptitle('📊 DASHBOARD GERAL DE VENDAS', fontsize=16, fontweight='bold')
         
         # 1. Top produtos (quantidade)
-        produto_qtd = self.df.groupby('Produto')['Qtd_Vendida'].sum().sort_values(ascending=True)
-        axes[0,0].barh(produto_qtd.index, produto_qtd.values, color='skyblue', alpha=0.8)
+        produto_qtd = self.agregados.por('Produto')['Qtd_Vendida'].sort_values(ascending=True)
+        BarrasRotuladas(axes[0,0], len(produto_qtd), horizontal=True, color='skyblue', alpha=0.8
+                        ).atualizar(produto_qtd.index, produto_qtd.values)
         axes[0,0].set_title('🏆 Top Produtos - Quantidade', fontweight='bold')
         axes[0,0].set_xlabel('Unidades Vendidas')
         
-        # Adicionar valores
-        for i, v in enumerate(produto_qtd.values):
-            axes[0,0].text(v + v*0.01, i, f'{v:,}', va='center', ha='left')
-        
         # 2. Top vendedores
-        vendedor_qtd = self.df.groupby('Vendedor')['Qtd_Vendida'].sum().sort_values(ascending=False)
-        axes[0,1].bar(vendedor_qtd.index, vendedor_qtd.values, color='lightgreen', alpha=0.8)
+        vendedor_qtd = self.agregados.por('Vendedor')['Qtd_Vendida'].sort_values(ascending=False)
+        BarrasRotuladas(axes[0,1], len(vendedor_qtd), rotacao=45, color='lightgreen', alpha=0.8
+                        ).atualizar(vendedor_qtd.index, vendedor_qtd.values)
         axes[0,1].set_title('👥 Top Vendedores', fontweight='bold')
         axes[0,1].set_ylabel('Unidades Vendidas')
-        axes[0,1].tick_params(axis='x', rotation=45)
-        
-        # Adicionar valores
-        for i, v in enumerate(vendedor_qtd.values):
-            axes[0,1].text(i, v + v*0.01, f'{v:,}', ha='center', va='bottom')
         
         # 3. Distribuição por região
-        regiao_vendas = self.df.groupby('Regiao')['Qtd_Vendida'].sum()
+        regiao_vendas = self.agregados.por('Regiao')['Qtd_Vendida']
         axes[0,2].pie(regiao_vendas.values, labels=regiao_vendas.index, autopct='%1.1f%%', 
                      startangle=90, colors=['lightblue', 'lightcoral', 'lightgreen', 'gold'])
         axes[0,2].set_title('🗺️ Vendas por Região', fontweight='bold')
         
         # 4. Evolução temporal
-        vendas_mensais = self.df.groupby('Ano_Mes')['Qtd_Vendida'].sum()
+        vendas_mensais = self.agregados.por('Ano_Mes')['Qtd_Vendida']
         axes[1,0].plot(range(len(vendas_mensais)), vendas_mensais.values, 
                       marker='o', linewidth=2, markersize=6, color='blue')
         axes[1,0].set_title('📈 Evolução Temporal', fontweight='bold')
@@ -120,7 +161,7 @@ class DashboardCompleto:
         axes[1,0].grid(True, alpha=0.3)
         
         # 5. Sazonalidade
-        sazonalidade = self.df.groupby('Mes')['Qtd_Vendida'].sum()
+        sazonalidade = self.agregados.sazonalidade('Qtd_Vendida')
         meses_nomes = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
                       'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
         axes[1,1].bar(meses_nomes, sazonalidade.values, color='orange', alpha=0.8)
@@ -129,9 +170,7 @@ class DashboardCompleto:
         axes[1,1].tick_params(axis='x', rotation=45)
         
         # 6. Receita vs Lucro vs Custo
-        dados_financeiros = self.df.groupby('Produto').agg({'Receita': 'sum', 'Lucro': 'sum'})
-        # Calcular custo (Receita - Lucro)
-        dados_financeiros['Custo'] = dados_financeiros['Receita'] - dados_financeiros['Lucro']
+        dados_financeiros = self.agregados.por('Produto')[['Receita', 'Lucro', 'Custo']]
         
         axes[1,2].scatter(dados_financeiros['Receita'], dados_financeiros['Lucro'], 
                          s=dados_financeiros['Custo']/1000, alpha=0.7, color='purple', 
@@ -154,8 +193,8 @@ class DashboardCompleto:
                               xytext=(5, 5), textcoords='offset points', fontsize=8)
         
         plt.tight_layout()
-        plt.savefig('output/imagens/dashboard_vendas_gerais.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(self._caminho_saida('imagens', 'dashboard_vendas_gerais.png'), dpi=300, bbox_inches='tight')
+        self._finalizar_grafico()
         
     def heatmap_performance(self):
         """Heatmap de performance - Estático"""
@@ -163,12 +202,11 @@ class DashboardCompleto:
         
         plt.figure(figsize=(14, 8))
         
-        # Dados para heatmap
-        heatmap_data = self.df.groupby(['Vendedor', 'Produto'])['Qtd_Vendida'].sum().unstack(fill_value=0)
+        # Dados para heatmap (matriz esparsa; anotado só quando pequeno)
+        grade = self.heatmap.preparar(self.agregados.por('Vendedor', 'Produto')['Qtd_Vendida'])
         
         # Criar heatmap
-        sns.heatmap(heatmap_data, annot=True, fmt='g', cmap='YlOrRd', 
-                   cbar_kws={'label': 'Quantidade Vendida'})
+        self.heatmap.heatmap_matplotlib(grade, plt.gca(), cmap='YlOrRd', rotulo_barra='Quantidade Vendida')
         
         plt.title('🔥 HEATMAP: PERFORMANCE VENDEDOR × PRODUTO', fontsize=14, fontweight='bold')
         plt.ylabel('Vendedores')
@@ -176,8 +214,8 @@ class DashboardCompleto:
         plt.xticks(rotation=45)
         
         plt.tight_layout()
-        plt.savefig('output/imagens/heatmap_performance.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(self._caminho_saida('imagens', 'heatmap_performance.png'), dpi=300, bbox_inches='tight')
+        self._finalizar_grafico()
     
     def analise_financeira_detalhada(self):
         """Análise financeira detalhada - Estático"""
@@ -186,16 +224,7 @@ class DashboardCompleto:
         plt.figure(figsize=(18, 12))
         
         # Dados financeiros por produto
-        dados_produto = self.df.groupby('Produto').agg({
-            'Receita': 'sum',
-            'Lucro': 'sum',
-            'Qtd_Vendida': 'sum'
-        }).reset_index()
-        dados_produto['Custo'] = dados_produto['Receita'] - dados_produto['Lucro']
-        dados_produto['Margem_%'] = (dados_produto['Lucro'] / dados_produto['Receita']) * 100
-        dados_produto['Receita_Unitaria'] = dados_produto['Receita'] / dados_produto['Qtd_Vendida']
-        dados_produto['Lucro_Unitario'] = dados_produto['Lucro'] / dados_produto['Qtd_Vendida']
-        dados_produto['Custo_Unitario'] = dados_produto['Custo'] / dados_produto['Qtd_Vendida']
+        dados_produto = self.agregados.financeiro('Produto').reset_index()
         
         # 1. Receita, Custo e Lucro por produto
         plt.subplot(2, 3, 1)
@@ -215,28 +244,19 @@ class DashboardCompleto:
         
         # 2. Margem de lucro por produto
         plt.subplot(2, 3, 2)
-        cores_margem = ['green' if m >= 30 else 'orange' if m >= 20 else 'red' for m in dados_produto['Margem_%']]
-        bars = plt.bar(dados_produto['Produto'], dados_produto['Margem_%'], color=cores_margem, alpha=0.8)
+        BarrasRotuladas(plt.gca(), len(dados_produto), formato='{:.1f}%', folga_relativa=0, folga_fixa=0.5,
+                        fontsize=9, rotacao=45, alpha=0.8
+                        ).atualizar(dados_produto['Produto'], dados_produto['Margem_%'],
+                                    cores=cores_por_faixa(dados_produto['Margem_%'], FAIXAS_MARGEM))
         plt.title('📊 Margem de Lucro por Produto', fontweight='bold')
         plt.ylabel('Margem (%)')
-        plt.xticks(rotation=45)
         plt.axhline(y=30, color='green', linestyle='--', alpha=0.7, label='Meta 30%')
         plt.axhline(y=20, color='orange', linestyle='--', alpha=0.7, label='Mínimo 20%')
         plt.legend()
         
-        # Adicionar valores nas barras
-        for bar, valor in zip(bars, dados_produto['Margem_%']):
-            plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.5,
-                    f'{valor:.1f}%', ha='center', va='bottom', fontsize=9)
-        
         # 3. Evolução financeira temporal
         plt.subplot(2, 3, 3)
-        evolucao_financeira = self.df.groupby('Data_Str').agg({
-            'Receita': 'sum',
-            'Lucro': 'sum'
-        })
-        evolucao_financeira['Custo'] = evolucao_financeira['Receita'] - evolucao_financeira['Lucro']
-        evolucao_financeira['Margem_%'] = (evolucao_financeira['Lucro'] / evolucao_financeira['Receita']) * 100
+        evolucao_financeira = self.agregados.financeiro('Data_Str', metricas=['Margem_%'])
         
         x_temp = range(len(evolucao_financeira))
         plt.plot(x_temp, evolucao_financeira['Receita'], marker='o', label='Receita', linewidth=2)
@@ -267,21 +287,16 @@ class DashboardCompleto:
         
         # 5. ROI por produto (Retorno sobre Investimento)
         plt.subplot(2, 3, 5)
-        dados_produto['ROI_%'] = (dados_produto['Lucro'] / dados_produto['Custo']) * 100
-        cores_roi = ['green' if roi >= 50 else 'orange' if roi >= 25 else 'red' for roi in dados_produto['ROI_%']]
-        bars = plt.bar(dados_produto['Produto'], dados_produto['ROI_%'], color=cores_roi, alpha=0.8)
+        BarrasRotuladas(plt.gca(), len(dados_produto), formato='{:.1f}%', folga_relativa=0, folga_fixa=1,
+                        fontsize=9, rotacao=45, alpha=0.8
+                        ).atualizar(dados_produto['Produto'], dados_produto['ROI_%'],
+                                    cores=cores_por_faixa(dados_produto['ROI_%'], FAIXAS_ROI))
         plt.title('📈 ROI por Produto (Retorno/Custo)', fontweight='bold')
         plt.ylabel('ROI (%)')
-        plt.xticks(rotation=45)
         plt.axhline(y=50, color='green', linestyle='--', alpha=0.7, label='Excelente 50%+')
         plt.axhline(y=25, color='orange', linestyle='--', alpha=0.7, label='Bom 25%+')
         plt.legend()
         
-        # Adicionar valores
-        for bar, valor in zip(bars, dados_produto['ROI_%']):
-            plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 1,
-                    f'{valor:.1f}%', ha='center', va='bottom', fontsize=9)
-        
         # 6. Análise de contribuição (Lucro vs Volume)
         plt.subplot(2, 3, 6)
         plt.scatter(dados_produto['Qtd_Vendida'], dados_produto['Lucro'], 
@@ -302,8 +317,8 @@ class DashboardCompleto:
         plt.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig('output/imagens/analise_financeira_detalhada.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(self._caminho_saida('imagens', 'analise_financeira_detalhada.png'), dpi=300, bbox_inches='tight')
+        self._finalizar_grafico()
     
     def previsoes_financeiras_inteligentes(self):
         """Previsões financeiras usando análise inteligente - Estático"""
@@ -312,13 +327,7 @@ class DashboardCompleto:
         plt.figure(figsize=(18, 12))
         
         # Preparar dados históricos financeiros
-        historico_mensal = self.df.groupby(self.df['Data'].dt.to_period('M')).agg({
-            'Receita': 'sum',
-            'Lucro': 'sum',
-            'Qtd_Vendida': 'sum'
-        })
-        historico_mensal['Custo'] = historico_mensal['Receita'] - historico_mensal['Lucro']
-        historico_mensal['Margem_%'] = (historico_mensal['Lucro'] / historico_mensal['Receita']) * 100
+        historico_mensal = self.agregados.financeiro('Ano_Mes', metricas=['Margem_%'])
         
         # Gerar previsões usando tendência linear simples
         import numpy as np
@@ -477,8 +486,8 @@ class DashboardCompleto:
         plt.title('📋 Resumo das Previsões Financeiras', fontweight='bold', pad=20)
         
         plt.tight_layout()
-        plt.savefig('output/imagens/previsoes_financeiras_inteligentes.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(self._caminho_saida('imagens', 'previsoes_financeiras_inteligentes.png'), dpi=300, bbox_inches='tight')
+        self._finalizar_grafico()
     
     def previsoes_financeiras_produtos_2025(self):
         """Gráfico específico das previsões financeiras por produto"""
@@ -504,16 +513,16 @@ class DashboardCompleto:
         fig.suptitle('💰 PREVISÕES FINANCEIRAS POR PRODUTO 2025', fontsize=16, fontweight='bold')
         
         # Preparar dados
-        produtos = list(previsoes_financeiras.keys())
-        receitas_previstas = [previsoes_financeiras[p]['receita_prevista'] for p in produtos]
-        custos_previstos = [previsoes_financeiras[p]['custo_previsto'] for p in produtos]
-        lucros_previstos = [previsoes_financeiras[p]['lucro_previsto'] for p in produtos]
-        margens_previstas = [previsoes_financeiras[p]['margem_prevista_%'] for p in produtos]
+        produtos = list(previsoes_financeiras.index)
+        receitas_previstas = previsoes_financeiras['receita_prevista'].values
+        custos_previstos = previsoes_financeiras['custo_previsto'].values
+        lucros_previstos = previsoes_financeiras['lucro_previsto'].values
+        margens_previstas = previsoes_financeiras['margem_prevista_%'].values
         
         # Dados históricos para comparação
-        receitas_atuais = [previsoes_financeiras[p]['historico']['receita_atual'] for p in produtos]
-        lucros_atuais = [previsoes_financeiras[p]['historico']['lucro_atual'] for p in produtos]
-        custos_atuais = [previsoes_financeiras[p]['historico']['custo_atual'] for p in produtos]
+        receitas_atuais = previsoes_financeiras['receita_atual'].values
+        lucros_atuais = previsoes_financeiras['lucro_atual'].values
+        custos_atuais = previsoes_financeiras['custo_atual'].values
         
         # 1. Comparação Receita: Atual vs Prevista
         axes[0,0].bar(np.arange(len(produtos)) - 0.2, receitas_atuais, 0.4, 
@@ -552,9 +561,9 @@ class DashboardCompleto:
         axes[0,2].grid(True, alpha=0.3)
         
         # 4. Variações percentuais
-        variacoes_receita = [previsoes_financeiras[p]['variacao_receita_%'] for p in produtos]
-        variacoes_lucro = [previsoes_financeiras[p]['variacao_lucro_%'] for p in produtos]
-        variacoes_custo = [previsoes_financeiras[p]['variacao_custo_%'] for p in produtos]
+        variacoes_receita = previsoes_financeiras['variacao_receita_%'].values
+        variacoes_lucro = previsoes_financeiras['variacao_lucro_%'].values
+        variacoes_custo = previsoes_financeiras['variacao_custo_%'].values
         
         x = np.arange(len(produtos))
         width = 0.25
@@ -572,23 +581,18 @@ class DashboardCompleto:
         axes[1,0].axhline(y=0, color='black', linestyle='-', alpha=0.5)
         
         # 5. Margem de lucro prevista
-        cores_margem = ['green' if m >= 30 else 'orange' if m >= 20 else 'red' for m in margens_previstas]
-        bars = axes[1,1].bar(produtos, margens_previstas, color=cores_margem, alpha=0.8)
+        BarrasRotuladas(axes[1,1], len(produtos), formato='{:.1f}%', folga_relativa=0, folga_fixa=0.5,
+                        fontsize=9, rotacao=45, alpha=0.8
+                        ).atualizar(produtos, margens_previstas, cores=cores_por_faixa(margens_previstas, FAIXAS_MARGEM))
         axes[1,1].set_title('📊 Margens de Lucro Previstas 2025', fontweight='bold')
         axes[1,1].set_ylabel('Margem (%)')
-        axes[1,1].set_xticklabels(produtos, rotation=45)
         axes[1,1].axhline(y=30, color='green', linestyle='--', alpha=0.7, label='Meta 30%')
         axes[1,1].axhline(y=20, color='orange', linestyle='--', alpha=0.7, label='Mínimo 20%')
         axes[1,1].legend()
         axes[1,1].grid(True, alpha=0.3)
         
-        # Adicionar valores nas barras
-        for bar, valor in zip(bars, margens_previstas):
-            axes[1,1].text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.5,
-                          f'{valor:.1f}%', ha='center', va='bottom', fontsize=9)
-        
         # 6. Lucratividade absoluta prevista (bubble chart)
-        qtds_previstas = [previsoes_financeiras[p]['qtd_prevista'] for p in produtos]
+        qtds_previstas = previsoes_financeiras['qtd_prevista'].values
         
         scatter = axes[1,2].scatter(qtds_previstas, lucros_previstos, 
                                    s=[m*10 for m in margens_previstas], 
@@ -611,8 +615,8 @@ class DashboardCompleto:
         cbar.set_label('Margem (%)')
         
         plt.tight_layout()
-        plt.savefig('output/imagens/previsoes_financeiras_produtos_2025.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(self._caminho_saida('imagens', 'previsoes_financeiras_produtos_2025.png'), dpi=300, bbox_inches='tight')
+        self._finalizar_grafico()
         
     def grafico_previsoes_estatico(self):
         """Gráfico de previsões 2025 - Estático"""
@@ -633,7 +637,7 @@ class DashboardCompleto:
         try:
             produtos_tendencia = analise.previsao_inteligente_produto()
             vendedores_analise = analise.previsao_inteligente_vendedores()  
-            previsoes_2025 = analise.media_vendas_2025_inteligente()
+            previsoes_2025 = analise.media_vendas_2025_inteligente(metodo_reconciliacao='mint')
         finally:
             sys.stdout = old_stdout
         
@@ -654,16 +658,10 @@ class DashboardCompleto:
             else:
                 produtos_cores.append('orange')
         
-        bars1 = axes[0,0].bar(produtos_nomes, produtos_previsoes, color=produtos_cores, alpha=0.7)
+        BarrasRotuladas(axes[0,0], len(produtos_nomes), formato='{:.0f}', rotacao=45, alpha=0.7
+                        ).atualizar(produtos_nomes, produtos_previsoes, cores=produtos_cores)
         axes[0,0].set_title('📈 Previsão Produtos 2025\n(unidades/mês)', fontweight='bold')
         axes[0,0].set_ylabel('Quantidade Prevista')
-        axes[0,0].tick_params(axis='x', rotation=45)
-        
-        # Adicionar valores
-        for bar in bars1:
-            height = bar.get_height()
-            axes[0,0].text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                          f'{int(height)}', ha='center', va='bottom')
         
         # 2. Previsão vendedores
         vendedores_nomes = list(vendedores_analise.keys())
@@ -678,19 +676,13 @@ class DashboardCompleto:
             else:
                 vendedores_cores.append('orange')
         
-        bars2 = axes[0,1].bar(vendedores_nomes, vendedores_previsoes, color=vendedores_cores, alpha=0.7)
+        BarrasRotuladas(axes[0,1], len(vendedores_nomes), formato='{:.0f}', rotacao=45, alpha=0.7
+                        ).atualizar(vendedores_nomes, vendedores_previsoes, cores=vendedores_cores)
         axes[0,1].set_title('🚀 Previsão Vendedores 2025\n(unidades/trimestre)', fontweight='bold')
         axes[0,1].set_ylabel('Quantidade Prevista')
-        axes[0,1].tick_params(axis='x', rotation=45)
-        
-        # Adicionar valores
-        for bar in bars2:
-            height = bar.get_height()
-            axes[0,1].text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                          f'{int(height)}', ha='center', va='bottom')
         
         # 3. Histórico vs Previsão
-        historico_vendedores = self.df.groupby('Vendedor')['Qtd_Vendida'].sum() / len(self.df['Ano'].unique())
+        historico_vendedores = self.agregados.por('Vendedor')['Qtd_Vendida'] / self.agregados.n_anos
         previsao_vendedores_valores = [previsoes_2025[vend]['previsao'] for vend in historico_vendedores.index]
         
         x = np.arange(len(historico_vendedores))
@@ -717,8 +709,8 @@ class DashboardCompleto:
         axes[1,1].set_title('🥧 Share de Mercado\nPrevisto 2025', fontweight='bold')
         
         plt.tight_layout()
-        plt.savefig('output/imagens/previsoes_2025.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(self._caminho_saida('imagens', 'previsoes_2025.png'), dpi=300, bbox_inches='tight')
+        self._finalizar_grafico()
     
     def dashboard_interativo_completo(self):
         """Dashboard interativo completo"""
@@ -736,7 +728,7 @@ class DashboardCompleto:
         )
         
         # 1. Top produtos
-        produto_qtd = self.df.groupby('Produto')['Qtd_Vendida'].sum().sort_values(ascending=False)
+        produto_qtd = self.agregados.por('Produto')['Qtd_Vendida'].sort_values(ascending=False)
         fig.add_trace(
             go.Bar(x=produto_qtd.index, y=produto_qtd.values, name='Produtos',
                   marker_color=self.cores_produtos[0]),
@@ -744,7 +736,7 @@ class DashboardCompleto:
         )
         
         # 2. Performance vendedores
-        vendedor_qtd = self.df.groupby('Vendedor')['Qtd_Vendida'].sum().sort_values(ascending=False)
+        vendedor_qtd = self.agregados.por('Vendedor')['Qtd_Vendida'].sort_values(ascending=False)
         fig.add_trace(
             go.Bar(x=vendedor_qtd.index, y=vendedor_qtd.values, name='Vendedores',
                   marker_color=self.cores_vendedores[0]),
@@ -752,17 +744,14 @@ class DashboardCompleto:
         )
         
         # 3. Vendas por região
-        regiao_vendas = self.df.groupby('Regiao')['Qtd_Vendida'].sum()
+        regiao_vendas = self.agregados.por('Regiao')['Qtd_Vendida']
         fig.add_trace(
             go.Pie(values=regiao_vendas.values, labels=regiao_vendas.index, name="Regiões"),
             row=1, col=3
         )
         
         # 4. Evolução temporal
-        dados_temporais = self.df.groupby('Data_Str').agg({
-            'Qtd_Vendida': 'sum',
-            'Receita': 'sum'
-        }).reset_index()
+        dados_temporais = self.agregados.por('Data_Str')[['Qtd_Vendida', 'Receita']].reset_index()
         
         fig.add_trace(
             go.Scatter(x=dados_temporais['Data_Str'], y=dados_temporais['Qtd_Vendida'],
@@ -771,9 +760,7 @@ class DashboardCompleto:
         )
         
         # 5. Sazonalidade
-        sazonalidade = self.df.groupby('Mes_Nome')['Qtd_Vendida'].sum().reindex(
-            ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-        )
+        sazonalidade = self.agregados.sazonalidade('Qtd_Vendida')
         fig.add_trace(
             go.Bar(x=sazonalidade.index, y=sazonalidade.values, name='Sazonalidade',
                   marker_color='orange'),
@@ -781,7 +768,7 @@ class DashboardCompleto:
         )
         
         # 6. Receita vs Lucro
-        dados_financeiros = self.df.groupby('Produto').agg({'Receita': 'sum', 'Lucro': 'sum'}).reset_index()
+        dados_financeiros = self.agregados.por('Produto')[['Receita', 'Lucro']].reset_index()
         fig.add_trace(
             go.Scatter(x=dados_financeiros['Receita'], y=dados_financeiros['Lucro'],
                       mode='markers+text', text=dados_financeiros['Produto'],
@@ -823,7 +810,7 @@ class DashboardCompleto:
         )
         
         # 9. Resumo financeiro
-        receita_total = self.df['Receita'].sum()
+        receita_total = self.agregados.totais()['Receita']
         fig.add_trace(
             go.Indicator(
                 mode = "number",
@@ -844,10 +831,8 @@ class DashboardCompleto:
         )
         
         # Salvar
-        caminho_arquivo = "output/html_interativos/dashboard_completo.html"
-        garantir_diretorio(caminho_arquivo)
-        fig.write_html(caminho_arquivo)
-        fig.show()
+        caminho_arquivo = self._caminho_saida('html_interativos', 'dashboard_completo.html')
+        self._salvar_figura(fig, caminho_arquivo)
     
     def relatorio_visual_completo(self):
         """Gera relatório visual completo"""
@@ -855,10 +840,11 @@ class DashboardCompleto:
         print("=" * 60)
         
         # Estatísticas gerais
-        print(f"📊 Período: {self.df['Data'].min().strftime('%d/%m/%Y')} a {self.df['Data'].max().strftime('%d/%m/%Y')}")
-        print(f"📊 Total vendido: {self.df['Qtd_Vendida'].sum():,} unidades")
-        print(f"📊 Receita total: R$ {self.df['Receita'].sum():,.2f}")
-        print(f"📊 Lucro total: R$ {self.df['Lucro'].sum():,.2f}")
+        totais = self.agregados.totais()
+        print(f"📊 Período: {self.agregados.data_inicial.strftime('%d/%m/%Y')} a {self.agregados.data_final.strftime('%d/%m/%Y')}")
+        print(f"📊 Total vendido: {totais['Qtd_Vendida']:,} unidades")
+        print(f"📊 Receita total: R$ {totais['Receita']:,.2f}")
+        print(f"📊 Lucro total: R$ {totais['Lucro']:,.2f}")
         print()
         
         # Gerar todos os gráficos
@@ -880,200 +866,61 @@ class DashboardCompleto:
         print("6️⃣ Previsões 2025...")
         self.grafico_previsoes_estatico()
         
-        print("7️⃣ Dashboard Interativo...")
-        self.dashboard_interativo_completo()
-        
-        # Criar índice HTML
-        self.criar_indice_html()
+        print("7️⃣ Dashboard Interativo (página única)...")
+        self.criar_pacote_html()
         
         print("\n✅ RELATÓRIO VISUAL COMPLETO GERADO!")
         print("📁 Arquivos criados:")
-        print("   �️  Imagens (PNG): output/imagens/")
-        print("   📄 HTML Estáticos: output/html_estaticos/")
-        print("   🌐 HTML Interativos: output/html_interativos/")
-        print("   📋 Índice principal: output/index_dashboard.html")
-        print("\n💡 Abra output/index_dashboard.html no navegador para acessar tudo!")
+        print(f"   �️  Imagens (PNG): {self._caminho_saida('imagens')}/")
+        print(f"   📋 Dashboard (página única com todos os gráficos interativos): {self._caminho_saida('index_dashboard.html')}")
+        print(f"\n💡 Abra {self._caminho_saida('index_dashboard.html')} no navegador para acessar tudo!")
     
-    def criar_indice_html(self):
-        """Cria página HTML principal com links para todos os gráficos"""
-        html_content = """
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>📊 Dashboard de Vendas - Análise Completa</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background: rgba(255, 255, 255, 0.1);
-            padding: 30px;
-            border-radius: 15px;
-            backdrop-filter: blur(10px);
-        }
-        h1 {
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 2.5em;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-            margin-top: 30px;
-        }
-        .card {
-            background: rgba(255, 255, 255, 0.2);
-            padding: 25px;
-            border-radius: 10px;
-            text-align: center;
-            transition: transform 0.3s ease;
-            border: 1px solid rgba(255, 255, 255, 0.3);
-        }
-        .card:hover {
-            transform: translateY(-5px);
-            background: rgba(255, 255, 255, 0.3);
-        }
-        .card h3 {
-            margin-top: 0;
-            font-size: 1.5em;
-        }
-        .btn {
-            display: inline-block;
-            padding: 12px 25px;
-            background: rgba(255, 255, 255, 0.2);
-            color: white;
-            text-decoration: none;
-            border-radius: 25px;
-            margin: 10px;
-            transition: all 0.3s ease;
-            border: 2px solid rgba(255, 255, 255, 0.3);
-        }
-        .btn:hover {
-            background: rgba(255, 255, 255, 0.4);
-            transform: scale(1.05);
-        }
-        .stats {
-            background: rgba(255, 255, 255, 0.15);
-            padding: 20px;
-            border-radius: 10px;
-            margin: 20px 0;
-            text-align: center;
-        }
-        .stat-item {
-            display: inline-block;
-            margin: 0 20px;
-            padding: 10px;
-        }
-        .stat-number {
-            font-size: 2em;
-            font-weight: bold;
-            display: block;
-        }
-        .footer {
-            text-align: center;
-            margin-top: 40px;
-            opacity: 0.8;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 Dashboard de Vendas - Análise Completa</h1>
-        
-        <div class="stats">
-            <div class="stat-item">
-                <span class="stat-number">""" + f"{self.df['Qtd_Vendida'].sum():,}" + """</span>
-                <span>Unidades Vendidas</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-number">R$ """ + f"{self.df['Receita'].sum():,.0f}" + """</span>
-                <span>Receita Total</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-number">""" + f"{self.df['Produto'].nunique()}" + """</span>
-                <span>Produtos</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-number">""" + f"{self.df['Vendedor'].nunique()}" + """</span>
-                <span>Vendedores</span>
-            </div>
-        </div>
-
-        <div class="grid">
-            <div class="card">
-                <h3>📊 Dashboard Geral</h3>
-                <p>Visão geral de produtos, vendedores e performance</p>
-                <a href="imagens/dashboard_vendas_gerais.png" class="btn" target="_blank">Ver Gráfico</a>
-            </div>
-
-            <div class="card">
-                <h3>🔥 Heatmap Performance</h3>
-                <p>Análise de performance vendedor × produto</p>
-                <a href="imagens/heatmap_performance.png" class="btn" target="_blank">Ver Heatmap</a>
-            </div>
-
-            <div class="card">
-                <h3>🔮 Previsões 2025</h3>
-                <p>Análise preditiva para produtos e vendedores</p>
-                <a href="imagens/previsoes_2025.png" class="btn" target="_blank">Ver Previsões</a>
-            </div>
-
-            <div class="card">
-                <h3>🌐 Dashboard Interativo</h3>
-                <p>Dashboard completo com gráficos interativos</p>
-                <a href="html_interativos/dashboard_completo.html" class="btn" target="_blank">Abrir Dashboard</a>
-            </div>
-
-            <div class="card">
-                <h3>📈 Análise Básica</h3>
-                <p>Execute análise básica de vendas</p>
-                <a href="#" onclick="alert('Execute: python analise_vendas.py')" class="btn">Ver Código</a>
-            </div>
-
-            <div class="card">
-                <h3>🧠 Análise Preditiva</h3>
-                <p>Execute análise preditiva avançada</p>
-                <a href="#" onclick="alert('Execute: python analise_predicao_vendas.py')" class="btn">Ver Código</a>
-            </div>
-        </div>
-
-        <div class="footer">
-            <p>🎨 Gerado automaticamente pelo Sistema de Análise de Vendas</p>
-            <p>📅 """ + datetime.now().strftime('%d/%m/%Y %H:%M') + """</p>
-        </div>
-    </div>
-</body>
-</html>
-        """
-        
-        with open('output/index_dashboard.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
+    def criar_pacote_html(self, caminho_arquivo=None):
+        """Página única com todas as figuras interativas (comprimidas, desenhadas ao abrir a aba) e as imagens"""
+        caminho_arquivo = caminho_arquivo or self._caminho_saida('index_dashboard.html')
+        totais = self.agregados.totais()
+        pacote = PacoteDashboard("📊 Dashboard de Vendas - Análise Completa")
+        pacote.adicionar_indicador("Unidades Vendidas", f"{totais['Qtd_Vendida']:,}")
+        pacote.adicionar_indicador("Receita Total", f"R$ {totais['Receita']:,.0f}")
+        pacote.adicionar_indicador("Produtos", len(self.agregados.valores('Produto')))
+        pacote.adicionar_indicador("Vendedores", len(self.agregados.valores('Vendedor')))
+        
+        # Dashboard principal e demais gráficos interativos (mesmos agregados compartilhados)
+        self.pacote = pacote
+        try:
+            self.dashboard_interativo_completo()
+        finally:
+            self.pacote = None
+        VisualizacaoInterativa(self.df, modo_lote=self.modo_lote).gerar_pacote(caminho_arquivo=None, pacote=pacote)
+        
+        # Imagens estáticas geradas nesta execução (carregadas só ao abrir a aba)
+        for arquivo, titulo in IMAGENS_RELATORIO:
+            if os.path.exists(os.path.join(os.path.dirname(caminho_arquivo), arquivo)):
+                pacote.adicionar_imagem(arquivo, titulo)
+        
+        pacote.salvar(caminho_arquivo)
+        print(f"   ✅ {caminho_arquivo} ({len(pacote.figuras)} gráficos interativos, {len(pacote.imagens)} imagens)")
 
 def main():
     """Função principal"""
+    import argparse
+    from dataset_particionado import adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    parser = argparse.ArgumentParser(description="Sistema completo de visualização de vendas")
+    parser.add_argument('--lote', action='store_true',
+                        help="Modo lote (headless): não exibe janelas e libera as figuras após salvar")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
     print("🎨 SISTEMA COMPLETO DE VISUALIZAÇÃO DE VENDAS")
     print("=" * 60)
     
-    # Carregar dados
-    try:
-        df = pd.read_csv('datasets/vendas.csv')
-        print(f"✅ Dados carregados: {len(df)} registros")
-    except FileNotFoundError:
-        print("❌ Erro: Arquivo datasets/vendas.csv não encontrado!")
-        return
+    # Carregar dados (só as partições que atendem aos filtros)
+    df = carregar_vendas_argumentos(args)
+    print(f"✅ Dados carregados: {len(df)} registros")
     
     # Criar dashboard
-    dashboard = DashboardCompleto(df)
+    dashboard = DashboardCompleto(df, modo_lote=args.lote)
     
     # Gerar relatório completo
     dashboard.relatorio_visual_completo()
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+🗂️ DATASET PARTICIONADO COM PODA POR DATA, REGIÃO E PRODUTO
+===========================================================
+
+Layout em diretórios no estilo Hive, uma pasta por valor de cada nível:
+
+    datasets/vendas/ano=2024/mes=03/regiao=Sul/vendas.csv
+
+- escrito por _gerarDataSets.py e pelo conversor deste módulo (vendas.csv ->
+  diretório particionado), com opção de acrescentar lotes novos
+- carregar_vendas abre só as partições que atendem aos filtros: de/ate (meses)
+  pelos níveis ano/mes, regiao/produto/vendedor pelos níveis de mesmo nome;
+  filtros sem nível correspondente (ex.: produto) valem nas linhas lidas
+- as linhas voltam na ordem do vendas.csv de origem (cada partição guarda a
+  posição de origem de suas linhas na coluna _linha)
+- sem o diretório particionado (ou com ele desatualizado em relação ao
+  vendas.csv de origem: tamanho ou conteúdo (SHA-256) diferentes; a data de
+  modificação só evita recalcular o hash quando não mudou, então uma cópia ou
+  um clone do repositório continuam valendo), lê o vendas.csv e filtra as
+  linhas pelo índice invertido (indice_vendas), gravado ao lado do CSV só com
+  salvar_indice=True
+- os scripts aceitam --de/--ate/--regiao/--produto (adicionar_argumentos_filtro)
+
+Uso:
+    python dataset_particionado.py --converter
+    python dataset_particionado.py --de 2024-01 --ate 2024-06 --regiao Sul Norte
+    python analise_vendas.py --de 2024-01 --produto Notebook
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+from indice_vendas import IndiceVendas
+
+DIRETORIO_PARTICIONADO = 'datasets/vendas'
+CSV_VENDAS = 'datasets/vendas.csv'
+ARQUIVO_PARTICAO = 'vendas.csv'
+ARQUIVO_METADADOS = '_metadados.json'
+NIVEIS_PARTICAO = ('ano', 'mes', 'regiao')
+FILTROS_DIMENSAO = {'regiao': 'Regiao', 'produto': 'Produto', 'vendedor': 'Vendedor'}
+COLUNA_ORDEM = '_linha'
+
+
+def _valores_nivel(df, datas, nivel):
+    """Valor de cada linha em um nível de partição (texto usado no nome da pasta)"""
+    if nivel == 'ano':
+        return datas.dt.year.astype(str)
+    if nivel == 'mes':
+        return datas.dt.month.map('{:02d}'.format)
+    if nivel in FILTROS_DIMENSAO:
+        return df[FILTROS_DIMENSAO[nivel]].astype(str)
+    raise ValueError(f"Nível de partição desconhecido: {nivel}. Use ano, mes ou um de {list(FILTROS_DIMENSAO)}")
+
+
+def escrever_particionado(df, diretorio=DIRETORIO_PARTICIONADO, niveis=NIVEIS_PARTICAO,
+                          acrescentar=False, origem=None):
+    """Grava as linhas no layout particionado; retorna o número de partições gravadas
+
+    Sem acrescentar=True o diretório é recriado. `origem` é o CSV de onde as
+    linhas vieram (permite detectar partições desatualizadas).
+    """
+    niveis = list(niveis)
+    metadados = ler_metadados(diretorio)
+    if acrescentar and metadados and metadados['niveis'] != niveis:
+        raise ValueError(f"O diretório {diretorio} está particionado por {metadados['niveis']}, não por {niveis}")
+    if not acrescentar and os.path.isdir(diretorio):
+        shutil.rmtree(diretorio)
+
+    # Posição de cada linha no fluxo de origem (partições gravadas sem ela continuam sem)
+    n_linhas = (metadados or {}).get('n_linhas') if acrescentar else 0
+    if n_linhas is not None:
+        df = df.assign(**{COLUNA_ORDEM: range(n_linhas, n_linhas + len(df))})
+        n_linhas += len(df)
+
+    datas = pd.to_datetime(df['Data'])
+    chaves = [_valores_nivel(df, datas, nivel).rename(nivel) for nivel in niveis]
+    n_particoes = 0
+    for valores, grupo in df.groupby(chaves, sort=True):
+        valores = valores if isinstance(valores, tuple) else (valores,)
+        pasta = os.path.join(diretorio, *(f"{nivel}={quote(valor, safe='')}" for nivel, valor in zip(niveis, valores)))
+        os.makedirs(pasta, exist_ok=True)
+        caminho = os.path.join(pasta, ARQUIVO_PARTICAO)
+        grupo.to_csv(caminho, index=False, mode='a' if acrescentar else 'w',
+                     header=not (acrescentar and os.path.exists(caminho)))
+        n_particoes += 1
+
+    os.makedirs(diretorio, exist_ok=True)
+    metadados = {'niveis': niveis, 'origem': origem if origem is not None else (metadados or {}).get('origem'),
+                 'n_linhas': n_linhas}
+    if metadados['origem'] and os.path.exists(metadados['origem']):
+        metadados.update(assinatura_origem(metadados['origem']))
+    with open(os.path.join(diretorio, ARQUIVO_METADADOS), 'w', encoding='utf-8') as f:
+        json.dump(metadados, f, ensure_ascii=False, indent=2)
+    return n_particoes
+
+
+def converter_csv(caminho_csv=CSV_VENDAS, diretorio=DIRETORIO_PARTICIONADO, niveis=NIVEIS_PARTICAO):
+    """Converte o vendas.csv para o layout particionado"""
+    # round_trip: os floats gravados nas partições são exatamente os do CSV de origem
+    return escrever_particionado(pd.read_csv(caminho_csv, float_precision='round_trip'), diretorio, niveis,
+                                 origem=caminho_csv)
+
+
+def ler_metadados(diretorio=DIRETORIO_PARTICIONADO):
+    caminho = os.path.join(diretorio, ARQUIVO_METADADOS)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """SHA-256 (hex) do conteúdo do arquivo, lido em blocos"""
+    resumo = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def assinatura_origem(caminho_csv):
+    """Tamanho, data de modificação (ns) e SHA-256 do CSV de origem"""
+    estado = os.stat(caminho_csv)
+    return {'bytes_origem': estado.st_size, 'mtime_ns_origem': estado.st_mtime_ns,
+            'sha256_origem': hash_arquivo(caminho_csv)}
+
+
+def particoes_desatualizadas(diretorio=DIRETORIO_PARTICIONADO):
+    """True se o CSV de origem mudou (tamanho ou conteúdo) depois da conversão
+
+    A data de modificação é só uma dica: igual, o conteúdo não é relido; diferente
+    (cópia, clone, checkout), decide o hash.
+    """
+    metadados = ler_metadados(diretorio) or {}
+    origem = metadados.get('origem')
+    if not (origem and os.path.exists(origem)):
+        return False
+    estado = os.stat(origem)
+    if metadados.get('bytes_origem') != estado.st_size:
+        return True
+    if metadados.get('mtime_ns_origem') == estado.st_mtime_ns:
+        return False
+    return metadados.get('sha256_origem') != hash_arquivo(origem)
+
+
+def listar_particoes(diretorio=DIRETORIO_PARTICIONADO):
+    """Uma linha por arquivo de partição, com o valor de cada nível e o caminho"""
+    particoes = []
+    for pasta, _, arquivos in os.walk(diretorio):
+        if ARQUIVO_PARTICAO not in arquivos:
+            continue
+        niveis = dict(parte.split('=', 1) for parte in os.path.relpath(pasta, diretorio).split(os.sep) if '=' in parte)
+        particoes.append({**{nivel: unquote(valor) for nivel, valor in niveis.items()},
+                          'caminho': os.path.join(pasta, ARQUIVO_PARTICAO)})
+    return pd.DataFrame(particoes).sort_values('caminho', ignore_index=True) if particoes else pd.DataFrame()
+
+
+def podar_particoes(particoes, de=None, ate=None, **filtros):
+    """Partições que podem conter linhas dos filtros (só pelos nomes das pastas)"""
+    mascara = pd.Series(True, index=particoes.index)
+    if (de or ate) and 'ano' in particoes:
+        inicio = pd.Period(de or '0001-01', freq='M')
+        fim = pd.Period(ate or '9999-12', freq='M')
+        ano = particoes['ano'].astype(int)
+        if 'mes' in particoes:
+            mes_abs = ano * 12 + particoes['mes'].astype(int) - 1
+            mascara &= mes_abs.between(inicio.year * 12 + inicio.month - 1, fim.year * 12 + fim.month - 1)
+        else:
+            mascara &= ano.between(inicio.year, fim.year)
+    for chave, valores in filtros.items():
+        if valores and chave in particoes:
+            mascara &= particoes[chave].isin([valores] if isinstance(valores, str) else list(valores))
+    return particoes[mascara]
+
+
+def filtrar_linhas(df, de=None, ate=None, **filtros):
+    """Aplica os filtros às linhas (meses de `de` a `ate`, inclusive, e valores das dimensões)"""
+    mascara = pd.Series(True, index=df.index)
+    if de or ate:
+        meses = pd.to_datetime(df['Data']).dt.to_period('M')
+        if de:
+            mascara &= meses >= pd.Period(de, freq='M')
+        if ate:
+            mascara &= meses <= pd.Period(ate, freq='M')
+    for chave, valores in filtros.items():
+        if valores:
+            mascara &= df[FILTROS_DIMENSAO[chave]].isin([valores] if isinstance(valores, str) else list(valores))
+    return df if mascara.all() else df[mascara].reset_index(drop=True)
+
+
+def carregar_vendas(de=None, ate=None, regiao=None, produto=None, vendedor=None,
+                    diretorio=DIRETORIO_PARTICIONADO, caminho_csv=CSV_VENDAS, verbose=False,
+                    salvar_indice=False):
+    """Vendas filtradas, lendo só as partições necessárias (ou o CSV, sem diretório particionado)"""
+    filtros = {'regiao': regiao, 'produto': produto, 'vendedor': vendedor}
+    particoes = listar_particoes(diretorio) if os.path.isdir(diretorio) else pd.DataFrame()
+
+    if len(particoes) and particoes_desatualizadas(diretorio):
+        print(f"⚠️ {diretorio} está desatualizado em relação a {caminho_csv}; "
+              f"lendo o CSV (atualize com: python dataset_particionado.py --converter)")
+        particoes = pd.DataFrame()
+
+    if len(particoes):
+        selecionadas = podar_particoes(particoes, de, ate, **filtros)
+        if verbose:
+            print(f"📂 {len(selecionadas)} de {len(particoes)} partições lidas")
+        if not len(selecionadas):
+            raise ValueError("Nenhum registro para os filtros informados")
+        df = pd.concat([pd.read_csv(caminho) for caminho in selecionadas['caminho']], ignore_index=True)
+        if COLUNA_ORDEM in df.columns:
+            # Ordem do CSV de origem, não a das pastas
+            df = df.sort_values(COLUNA_ORDEM, kind='stable').drop(columns=COLUNA_ORDEM).reset_index(drop=True)
+        df = filtrar_linhas(df, de, ate, **filtros)
+    else:
+        df = pd.read_csv(caminho_csv)
+        if de or ate or any(filtros.values()):
+            # Índice gravado ao lado do CSV, se houver e ainda valer; senão montado em memória
+            indice = IndiceVendas.para_arquivo(df, caminho_csv, salvar=salvar_indice)
+            df = indice.fatiar(df, de, ate, **filtros).reset_index(drop=True)
+    if not len(df):
+        raise ValueError("Nenhum registro para os filtros informados")
+    return df
+
+
+def adicionar_argumentos_filtro(parser):
+    """--de/--ate (AAAA-MM), --regiao, --produto e --vendedor de um script"""
+    filtros = parser.add_argument_group('filtros dos dados')
+    filtros.add_argument('--de', help="Primeiro mês (AAAA-MM)")
+    filtros.add_argument('--ate', help="Último mês (AAAA-MM)")
+    filtros.add_argument('--regiao', nargs='+', help="Uma ou mais regiões")
+    filtros.add_argument('--produto', nargs='+', help="Um ou mais produtos")
+    filtros.add_argument('--vendedor', nargs='+', help="Um ou mais vendedores")
+    return parser
+
+
+def carregar_vendas_argumentos(args):
+    """carregar_vendas com os filtros da linha de comando; encerra o script com erro amigável"""
+    try:
+        return carregar_vendas(de=args.de, ate=args.ate, regiao=args.regiao,
+                               produto=args.produto, vendedor=args.vendedor)
+    except FileNotFoundError:
+        print(f"❌ Erro: Arquivo {CSV_VENDAS} não encontrado!")
+    except ValueError as erro:
+        print(f"❌ Erro: {erro}")
+    sys.exit(1)
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dataset de vendas particionado por ano/mês/região")
+    parser.add_argument('--converter', action='store_true', help=f"Converte {CSV_VENDAS} para {DIRETORIO_PARTICIONADO}/")
+    parser.add_argument('--acrescentar', metavar='LOTE_CSV', help="Acrescenta as linhas do lote às partições")
+    parser.add_argument('--niveis', nargs='+', default=list(NIVEIS_PARTICAO),
+                        help="Níveis de partição (ano, mes, regiao, produto, vendedor)")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
+    try:
+        if args.converter:
+            n_particoes = converter_csv(niveis=args.niveis)
+            print(f"✅ {n_particoes} partições gravadas em {DIRETORIO_PARTICIONADO}/")
+            return
+        if args.acrescentar:
+            n_particoes = escrever_particionado(pd.read_csv(args.acrescentar, float_precision='round_trip'),
+                                                niveis=args.niveis, acrescentar=True)
+            print(f"✅ Lote acrescentado a {n_particoes} partições")
+            return
+        df = carregar_vendas(de=args.de, ate=args.ate, regiao=args.regiao,
+                             produto=args.produto, vendedor=args.vendedor, verbose=True)
+    except FileNotFoundError as erro:
+        print(f"❌ Erro: {erro}")
+        return
+    except ValueError as erro:
+        print(f"❌ Erro: {erro}")
+        return
+    print(f"✅ {len(df):,} registros ({df['Data'].min()} a {df['Data'].max()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+📁 DIRETÓRIOS DE SAÍDA
+======================
+
+Criação dos diretórios de saída (output/, output/imagens/, ...) usada pelos
+scripts de relatórios, gráficos e pelos serviços que gravam arquivos.
+
+Exemplo:
+    garantir_diretorio('output/imagens/produtos.png')   # cria output/imagens/
+"""
+
+import os
+
+
+def garantir_diretorio(caminho_arquivo):
+    """Garante que o diretório do arquivo existe, criando se necessário"""
+    diretorio = os.path.dirname(caminho_arquivo)
+    if diretorio and not os.path.exists(diretorio):
+        os.makedirs(diretorio, exist_ok=True)
+        print(f"📁 Diretório criado: {diretorio}")
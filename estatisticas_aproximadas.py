@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+🧮 ESTATÍSTICAS APROXIMADAS (HYPERLOGLOG / KLL) EM MEMÓRIA CONSTANTE
+====================================================================
+
+Esboços combináveis para resumir arquivos grandes demais para a memória,
+atualizados lote a lote durante a leitura (ou a carga incremental):
+
+- HyperLogLog: contagem de valores distintos com 2^precisao registradores de
+  1 byte (16 KB com precisao=14), erro padrão ≈ 1.04 / √(2^precisao) ≈ 0.8%
+- KLL: quantis (mediana, p90, p99...) com compactadores de capacidade
+  decrescente; no máximo 3·k valores guardados (a soma das capacidades; em
+  geral entre k/2 e 2·k), erro de posição ≈ 1.7% com k=200, independente do
+  número de linhas
+- ResumoAproximado junta os esboços das dimensões e métricas do resumo geral
+  com os totais exatos (contagem, quantidade e centavos) e uma amostra
+  limitada dos valores de cada dimensão
+- esboços de lotes, faixas do arquivo ou processos diferentes se combinam
+  (combinar) com o mesmo erro de um esboço único; serializáveis em JSON
+
+Exemplo:
+    resumo = ResumoAproximado.de_csv('datasets/vendas.csv')
+    gerar_resumo_estatisticas(resumo)                  # analise_vendas
+    resumo.quantis['Receita'].quantil([0.5, 0.9, 0.99])
+
+Uso:
+    python estatisticas_aproximadas.py --csv datasets/vendas.csv --processos 4
+"""
+
+import base64
+import json
+import os
+import sys
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from moeda import esta_em_centavos, total_centavos
+
+DIMENSOES_RESUMO = ['Produto', 'Vendedor', 'Regiao']
+METRICAS_QUANTIS = ['Qtd_Vendida', 'Receita']
+LIMITE_VALORES_LISTADOS = 20
+TAMANHO_LOTE = 1_000_000
+PRECISAO_HLL = 14
+K_KLL = 200
+
+
+def _comprimento_bits(valores):
+    """Número de bits significativos de cada uint64 (busca binária vetorizada)"""
+    valores = valores.copy()
+    comprimento = np.zeros(len(valores), dtype=np.int64)
+    for deslocamento in (32, 16, 8, 4, 2, 1):
+        grandes = valores >= (np.uint64(1) << np.uint64(deslocamento))
+        comprimento[grandes] += deslocamento
+        valores[grandes] >>= np.uint64(deslocamento)
+    return comprimento + (valores > 0)
+
+
+class HyperLogLog:
+    """Contagem aproximada de valores distintos, combinável entre lotes"""
+
+    def __init__(self, precisao=PRECISAO_HLL, registradores=None):
+        if not 4 <= precisao <= 18:
+            raise ValueError(f"Precisão do HyperLogLog fora do intervalo 4-18: {precisao}")
+        self.precisao = precisao
+        self.registradores = (np.zeros(2 ** precisao, dtype=np.uint8) if registradores is None
+                              else np.asarray(registradores, dtype=np.uint8))
+
+    def atualizar(self, valores):
+        """Inclui um lote de valores (hash de 64 bits de cada um)"""
+        hashes = pd.util.hash_pandas_object(pd.Series(valores), index=False).to_numpy()
+        if not len(hashes):
+            return self
+        bits_resto = 64 - self.precisao
+        registrador = (hashes >> np.uint64(bits_resto)).astype(np.intp)
+        resto = hashes & np.uint64((1 << bits_resto) - 1)
+        # Posição do primeiro bit 1 nos bits restantes
+        posicao = (bits_resto - _comprimento_bits(resto) + 1).astype(np.uint8)
+        np.maximum.at(self.registradores, registrador, posicao)
+        return self
+
+    def combinar(self, outro):
+        if outro.precisao != self.precisao:
+            raise ValueError(f"Precisões diferentes: {self.precisao} e {outro.precisao}")
+        return HyperLogLog(self.precisao, np.maximum(self.registradores, outro.registradores))
+
+    @property
+    def erro_padrao(self):
+        return 1.04 / np.sqrt(len(self.registradores))
+
+    def estimativa(self):
+        m = len(self.registradores)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimativa = alfa * m * m / np.sum(np.ldexp(1.0, -self.registradores.astype(np.int64)))
+        vazios = int(np.count_nonzero(self.registradores == 0))
+        if estimativa <= 2.5 * m and vazios:
+            # Contagem linear para cardinalidades pequenas
+            estimativa = m * np.log(m / vazios)
+        return float(estimativa)
+
+    def para_dict(self):
+        return {'precisao': self.precisao,
+                'registradores': base64.b64encode(self.registradores.tobytes()).decode('ascii')}
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(dados['precisao'], np.frombuffer(base64.b64decode(dados['registradores']), dtype=np.uint8).copy())
+
+
+class KLL:
+    """Quantis aproximados (esboço KLL), combinável entre lotes"""
+
+    def __init__(self, k=K_KLL, niveis=None, n=0, minimo=np.inf, maximo=-np.inf, semente=0):
+        self.k = k
+        self.niveis = [np.asarray(nivel, dtype=float) for nivel in niveis] if niveis else [np.empty(0)]
+        self.n = n
+        self.minimo = minimo
+        self.maximo = maximo
+        self._rng = np.random.default_rng(semente)
+
+    def _capacidade(self, nivel):
+        """Capacidade do compactador: k no nível mais alto, 2/3 disso a cada nível abaixo"""
+        altura = len(self.niveis) - 1 - nivel
+        return max(2, int(np.ceil(self.k * (2 / 3) ** altura)))
+
+    def _compactar(self):
+        """Compacta os níveis acima da capacidade: ordena e promove um item de cada par (peso dobra)"""
+        while any(len(itens) > self._capacidade(nivel) for nivel, itens in enumerate(self.niveis)):
+            for nivel in range(len(self.niveis)):
+                itens = self.niveis[nivel]
+                if len(itens) <= self._capacidade(nivel):
+                    continue
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append(np.empty(0))
+                itens = np.sort(itens)
+                # Com quantidade ímpar, um item fica no nível (o peso total se mantém)
+                fica, itens = itens[len(itens) - len(itens) % 2:], itens[:len(itens) - len(itens) % 2]
+                promovidos = itens[self._rng.integers(2)::2]
+                self.niveis[nivel + 1] = np.concatenate([self.niveis[nivel + 1], promovidos])
+                self.niveis[nivel] = fica
+
+    def atualizar(self, valores):
+        """Inclui um lote de valores"""
+        valores = np.asarray(valores, dtype=float)
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return self
+        self.n += len(valores)
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+        self.niveis[0] = np.concatenate([self.niveis[0], valores])
+        self._compactar()
+        return self
+
+    def combinar(self, outro):
+        """Esboço da união dos dados dos dois (níveis de mesmo peso são concatenados)"""
+        niveis = [np.concatenate([self.niveis[i] if i < len(self.niveis) else np.empty(0),
+                                  outro.niveis[i] if i < len(outro.niveis) else np.empty(0)])
+                  for i in range(max(len(self.niveis), len(outro.niveis)))]
+        combinado = KLL(max(self.k, outro.k), niveis, self.n + outro.n,
+                        min(self.minimo, outro.minimo), max(self.maximo, outro.maximo),
+                        semente=self._rng.integers(2 ** 32))
+        combinado._compactar()
+        return combinado
+
+    def quantil(self, q):
+        """Valor(es) no(s) quantil(is) q (0 = mínimo exato, 1 = máximo exato)"""
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        if not self.n:
+            resultado = np.full(len(qs), np.nan)
+        else:
+            valores = np.concatenate(self.niveis)
+            pesos = np.concatenate([np.full(len(itens), 2.0 ** nivel) for nivel, itens in enumerate(self.niveis)])
+            ordem = np.argsort(valores, kind='stable')
+            acumulado = np.cumsum(pesos[ordem])
+            posicoes = np.searchsorted(acumulado, qs * acumulado[-1], side='left')
+            resultado = valores[ordem][np.minimum(posicoes, len(valores) - 1)]
+            resultado = np.where(qs <= 0, self.minimo, np.where(qs >= 1, self.maximo, resultado))
+        return resultado if np.ndim(q) else float(resultado[0])
+
+    @property
+    def n_guardados(self):
+        return sum(len(itens) for itens in self.niveis)
+
+    def para_dict(self):
+        return {'k': self.k, 'n': self.n, 'minimo': self.minimo, 'maximo': self.maximo,
+                'niveis': [itens.tolist() for itens in self.niveis]}
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(dados['k'], dados['niveis'], dados['n'], dados['minimo'], dados['maximo'])
+
+
+class ResumoAproximado:
+    """Esboços e totais exatos do resumo geral de vendas, em memória constante"""
+
+    def __init__(self, distintos=None, quantis=None, valores=None, n_registros=0, qtd_total=0,
+                 receita_centavos=0, lucro_centavos=0, data_inicial=None, data_final=None):
+        self.distintos = distintos or {dimensao: HyperLogLog() for dimensao in DIMENSOES_RESUMO}
+        self.quantis = quantis or {metrica: KLL() for metrica in METRICAS_QUANTIS}
+        self.valores = valores or {dimensao: [] for dimensao in DIMENSOES_RESUMO}
+        self.n_registros = n_registros
+        self.qtd_total = qtd_total
+        self.receita_centavos = receita_centavos
+        self.lucro_centavos = lucro_centavos
+        self.data_inicial = data_inicial
+        self.data_final = data_final
+
+    @classmethod
+    def de_dataframe(cls, df):
+        return cls().atualizar(df)
+
+    @classmethod
+    def de_lotes(cls, lotes):
+        resumo = cls()
+        for lote in lotes:
+            resumo.atualizar(lote)
+        return resumo
+
+    @classmethod
+    def de_csv(cls, caminho_arquivo='datasets/vendas.csv', processos=1, tamanho_lote=TAMANHO_LOTE):
+        """Resumo do CSV lido em lotes (processos > 1 ou None: faixas em paralelo, esboços combinados)"""
+        opcoes_csv = {'usecols': ['Data', 'Qtd_Vendida', 'Receita', 'Lucro'] + DIMENSOES_RESUMO}
+        if processos != 1:
+            from leitura_paralela import agregar_lotes_paralelo
+            parciais = agregar_lotes_paralelo(cls.de_lotes, caminho_arquivo, processos, tamanho_lote, opcoes_csv)
+            return reduce(lambda a, b: a.combinar(b), parciais)
+        return cls.de_lotes(pd.read_csv(caminho_arquivo, chunksize=tamanho_lote, **opcoes_csv))
+
+    def atualizar(self, lote):
+        """Inclui um lote de linhas (no próprio objeto)"""
+        if not len(lote):
+            return self
+        for dimensao in DIMENSOES_RESUMO:
+            self.distintos[dimensao].atualizar(lote[dimensao])
+            self._guardar_valores(dimensao, pd.unique(lote[dimensao]))
+        for metrica in METRICAS_QUANTIS:
+            self.quantis[metrica].atualizar(lote[metrica])
+        self.n_registros += len(lote)
+        self.qtd_total += int(lote['Qtd_Vendida'].sum())
+        self.receita_centavos += total_centavos(lote['Receita'], esta_em_centavos(lote))
+        self.lucro_centavos += total_centavos(lote['Lucro'], esta_em_centavos(lote))
+        datas = pd.to_datetime(lote['Data'])
+        self._ampliar_periodo(datas.min(), datas.max())
+        return self
+
+    def _guardar_valores(self, dimensao, novos):
+        """Primeiros valores vistos da dimensão, até LIMITE_VALORES_LISTADOS"""
+        vistos = self.valores[dimensao]
+        for valor in novos:
+            if len(vistos) >= LIMITE_VALORES_LISTADOS:
+                break
+            if valor not in vistos:
+                vistos.append(valor)
+
+    def _ampliar_periodo(self, inicial, final):
+        inicial, final = pd.Timestamp(inicial), pd.Timestamp(final)
+        self.data_inicial = inicial if self.data_inicial is None else min(self.data_inicial, inicial)
+        self.data_final = final if self.data_final is None else max(self.data_final, final)
+
+    def combinar(self, outro):
+        """Resumo da união dos dados dos dois"""
+        combinado = ResumoAproximado(
+            {d: self.distintos[d].combinar(outro.distintos[d]) for d in DIMENSOES_RESUMO},
+            {m: self.quantis[m].combinar(outro.quantis[m]) for m in METRICAS_QUANTIS},
+            {d: list(self.valores[d]) for d in DIMENSOES_RESUMO},
+            self.n_registros + outro.n_registros, self.qtd_total + outro.qtd_total,
+            self.receita_centavos + outro.receita_centavos, self.lucro_centavos + outro.lucro_centavos,
+            self.data_inicial, self.data_final)
+        for dimensao in DIMENSOES_RESUMO:
+            combinado._guardar_valores(dimensao, outro.valores[dimensao])
+        if outro.data_inicial is not None:
+            combinado._ampliar_periodo(outro.data_inicial, outro.data_final)
+        return combinado
+
+    def n_distintos(self, dimensao):
+        """Estimativa de valores distintos; exata enquanto todos couberem na amostra guardada"""
+        if len(self.valores[dimensao]) < LIMITE_VALORES_LISTADOS:
+            return len(self.valores[dimensao])
+        return max(int(round(self.distintos[dimensao].estimativa())), LIMITE_VALORES_LISTADOS)
+
+    def para_dict(self):
+        """Estado em tipos do JSON"""
+        return {
+            'distintos': {d: hll.para_dict() for d, hll in self.distintos.items()},
+            'quantis': {m: kll.para_dict() for m, kll in self.quantis.items()},
+            'valores': {d: [str(v) for v in valores] for d, valores in self.valores.items()},
+            'n_registros': self.n_registros, 'qtd_total': self.qtd_total,
+            'receita_centavos': self.receita_centavos, 'lucro_centavos': self.lucro_centavos,
+            'data_inicial': None if self.data_inicial is None else str(self.data_inicial.date()),
+            'data_final': None if self.data_final is None else str(self.data_final.date()),
+        }
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls({d: HyperLogLog.de_dict(h) for d, h in dados['distintos'].items()},
+                   {m: KLL.de_dict(q) for m, q in dados['quantis'].items()},
+                   {d: list(v) for d, v in dados['valores'].items()},
+                   dados['n_registros'], dados['qtd_total'], dados['receita_centavos'], dados['lucro_centavos'],
+                   dados['data_inicial'] and pd.Timestamp(dados['data_inicial']),
+                   dados['data_final'] and pd.Timestamp(dados['data_final']))
+
+    def salvar(self, caminho_arquivo):
+        os.makedirs(os.path.dirname(caminho_arquivo) or '.', exist_ok=True)
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            json.dump(self.para_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def carregar(cls, caminho_arquivo):
+        with open(caminho_arquivo, encoding='utf-8') as f:
+            return cls.de_dict(json.load(f))
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+    import time
+    from analise_vendas import gerar_resumo_aproximado
+
+    parser = argparse.ArgumentParser(description="Resumo geral aproximado (HyperLogLog/KLL) em memória constante")
+    parser.add_argument('--csv', default='datasets/vendas.csv', help="CSV de vendas")
+    parser.add_argument('--processos', type=int, default=1, help="Processos para ler o CSV em faixas (padrão: 1)")
+    parser.add_argument('--salvar', metavar='JSON', help="Grava os esboços para combinar ou consultar depois")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    try:
+        resumo = ResumoAproximado.de_csv(args.csv, args.processos)
+    except FileNotFoundError:
+        print(f"❌ Erro: Arquivo {args.csv} não encontrado!")
+        return
+    gerar_resumo_aproximado(resumo)
+    if args.salvar:
+        resumo.salvar(args.salvar)
+        print(f"\n💾 Esboços gravados em {args.salvar}")
+    print(f"\n⏱️ {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+📐 ESTATÍSTICAS ONLINE (WELFORD / CHAN)
+=======================================
+
+Contagem, médias e co-momentos (somas dos produtos dos desvios em relação à
+média) de várias variáveis, por grupo, atualizados lote a lote sem guardar
+as linhas:
+
+- cada lote é resumido com duas passadas sobre o próprio lote (médias, depois
+  desvios), que já está em memória; linhas com NaN em alguma variável ficam de
+  fora, como no mean/std do pandas
+- resumos de lotes, processos ou arquivos diferentes se combinam pela fórmula
+  de Chan: n = nA + nB e co-momentos corrigidos por δ = médiaB - médiaA
+- uma observação já incluída pode ser trocada por outra (remoção e inclusão de
+  Welford), como quando o total de um período recebe linhas atrasadas
+- variância, desvio, correlação e inclinação saem dos co-momentos, sem a
+  subtração de somas grandes (Σy² - (Σy)²/n) que perde precisão
+- serializável em JSON (para_dict/de_dict) e em tabela (para_dataframe)
+
+Exemplo:
+    momentos = MomentosOnline(['Qtd_Vendida', 'Receita'])
+    for lote in pd.read_csv('datasets/vendas.csv', chunksize=100_000):
+        momentos.atualizar(lote[['Qtd_Vendida', 'Receita']], grupos=lote['Produto'])
+    momentos.correlacao('Qtd_Vendida', 'Receita')
+    total = momentos_processo_1.combinar(momentos_processo_2)
+"""
+
+import numpy as np
+import pandas as pd
+
+GRUPO_UNICO = 'Total'
+
+
+class MomentosOnline:
+    """Contagem, médias e co-momentos de várias variáveis, por grupo, combináveis entre lotes"""
+
+    def __init__(self, variaveis, grupos=(), n=None, media=None, comomentos=None):
+        self.variaveis = list(variaveis)
+        self.grupos = pd.Index(grupos)
+        n_grupos, k = len(self.grupos), len(self.variaveis)
+        self.n = np.zeros(n_grupos) if n is None else np.asarray(n, dtype=float).reshape(n_grupos)
+        self.media = (np.zeros((n_grupos, k)) if media is None
+                      else np.asarray(media, dtype=float).reshape(n_grupos, k))
+        self.comomentos = (np.zeros((n_grupos, k, k)) if comomentos is None
+                           else np.asarray(comomentos, dtype=float).reshape(n_grupos, k, k))
+
+    @classmethod
+    def de_valores(cls, valores, grupos=None, variaveis=None):
+        """Momentos de um lote de observações (linhas × variáveis), opcionalmente por grupo (sem NaN)"""
+        if isinstance(valores, pd.Series):
+            valores = valores.to_frame()
+        if isinstance(valores, pd.DataFrame):
+            if variaveis is not None:
+                valores = valores[list(variaveis)]
+            variaveis = list(valores.columns)
+            valores = valores.to_numpy(dtype=float)
+        else:
+            valores = np.asarray(valores, dtype=float)
+            if valores.ndim == 1:
+                valores = valores[:, None]
+            variaveis = variaveis or [f'v{i}' for i in range(valores.shape[1])]
+        validas = ~np.isnan(valores).any(axis=1)
+        if not validas.all():
+            valores = valores[validas]
+            grupos = None if grupos is None else np.asarray(grupos, dtype=object)[validas]
+        if not len(valores):
+            return cls(variaveis)
+
+        if grupos is None:
+            codigos, rotulos = np.zeros(len(valores), dtype=np.intp), pd.Index([GRUPO_UNICO])
+        else:
+            codigos, rotulos = pd.factorize(np.asarray(grupos, dtype=object))
+        n_grupos, k = len(rotulos), len(variaveis)
+
+        n = np.bincount(codigos, minlength=n_grupos).astype(float)
+        media = np.column_stack([np.bincount(codigos, weights=valores[:, i], minlength=n_grupos)
+                                 for i in range(k)]) / n[:, None]
+        desvios = valores - media[codigos]
+        comomentos = np.zeros((n_grupos, k, k))
+        for i in range(k):
+            for j in range(i, k):
+                comomentos[:, i, j] = comomentos[:, j, i] = np.bincount(
+                    codigos, weights=desvios[:, i] * desvios[:, j], minlength=n_grupos)
+        return cls(variaveis, rotulos, n, media, comomentos)
+
+    def _reindexar(self, grupos):
+        """Cópia com os grupos pedidos (grupos ausentes ficam vazios)"""
+        posicoes = grupos.get_indexer(self.grupos)
+        outro = MomentosOnline(self.variaveis, grupos)
+        outro.n[posicoes] = self.n
+        outro.media[posicoes] = self.media
+        outro.comomentos[posicoes] = self.comomentos
+        return outro
+
+    def combinar(self, outro):
+        """Momentos da união dos dados dos dois (fórmula de Chan), com os grupos alinhados pelo rótulo"""
+        if outro.variaveis != self.variaveis:
+            raise ValueError(f"Variáveis diferentes: {self.variaveis} e {outro.variaveis}")
+        grupos = self.grupos.append(outro.grupos.difference(self.grupos, sort=False))
+        a, b = self._reindexar(grupos), outro._reindexar(grupos)
+
+        n = a.n + b.n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            peso_b = np.where(n > 0, b.n / n, 0)
+            fator = np.where(n > 0, a.n * b.n / n, 0)
+        delta = b.media - a.media
+        media = a.media + delta * peso_b[:, None]
+        comomentos = (a.comomentos + b.comomentos
+                      + fator[:, None, None] * delta[:, :, None] * delta[:, None, :])
+        return MomentosOnline(self.variaveis, grupos, n, media, comomentos)
+
+    def atualizar(self, valores, grupos=None):
+        """Inclui um lote de observações (no próprio objeto)"""
+        lote = MomentosOnline.de_valores(valores, grupos, self.variaveis)
+        if len(lote.grupos):
+            combinado = self.combinar(lote)
+            self.grupos, self.n, self.media, self.comomentos = (
+                combinado.grupos, combinado.n, combinado.media, combinado.comomentos)
+        return self
+
+    def substituir(self, grupo, antigo, novo):
+        """Troca uma observação já incluída no grupo por outra (remoção e inclusão de Welford)"""
+        i = self.grupos.get_loc(grupo)
+        antigo, novo = np.asarray(antigo, dtype=float), np.asarray(novo, dtype=float)
+        n = self.n[i]
+        if n <= 1:
+            self.media[i] = novo
+            self.comomentos[i] = 0
+            return
+
+        # Remove a observação antiga...
+        desvio = antigo - self.media[i]
+        media_sem = self.media[i] - desvio / (n - 1)
+        comomentos = self.comomentos[i] - np.outer(desvio, desvio) * n / (n - 1)
+        # ...e inclui a nova
+        desvio = novo - media_sem
+        self.media[i] = media_sem + desvio / n
+        self.comomentos[i] = comomentos + np.outer(desvio, desvio) * (n - 1) / n
+
+    def redefinir(self, outro):
+        """Substitui os momentos dos grupos de `outro` (ex.: recalculados do zero)"""
+        grupos = self.grupos.append(outro.grupos.difference(self.grupos, sort=False))
+        atual = self._reindexar(grupos)
+        posicoes = grupos.get_indexer(outro.grupos)
+        atual.n[posicoes] = outro.n
+        atual.media[posicoes] = outro.media
+        atual.comomentos[posicoes] = outro.comomentos
+        self.grupos, self.n, self.media, self.comomentos = atual.grupos, atual.n, atual.media, atual.comomentos
+
+    def _indice(self, variavel):
+        if variavel not in self.variaveis:
+            raise ValueError(f"Variável desconhecida: {variavel}. Use uma de {self.variaveis}")
+        return self.variaveis.index(variavel)
+
+    def contagens(self):
+        return pd.Series(self.n, index=self.grupos)
+
+    def medias(self):
+        return pd.DataFrame(self.media, index=self.grupos, columns=self.variaveis)
+
+    def variancias(self, ddof=1):
+        diagonal = np.diagonal(self.comomentos, axis1=1, axis2=2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.DataFrame(diagonal / (self.n - ddof)[:, None], index=self.grupos, columns=self.variaveis)
+
+    def desvios(self, ddof=1):
+        return np.sqrt(self.variancias(ddof).clip(lower=0))
+
+    def correlacao(self, variavel_a, variavel_b):
+        """Correlação de Pearson entre duas variáveis em cada grupo (NaN sem variação)"""
+        i, j = self._indice(variavel_a), self._indice(variavel_b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(self.comomentos[:, i, j] / np.sqrt(self.comomentos[:, i, i] * self.comomentos[:, j, j]),
+                             index=self.grupos)
+
+    def inclinacao(self, variavel_x, variavel_y):
+        """Inclinação da reta de mínimos quadrados de y em função de x, em cada grupo"""
+        i, j = self._indice(variavel_x), self._indice(variavel_y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(self.comomentos[:, i, j] / self.comomentos[:, i, i], index=self.grupos)
+
+    def zscore(self, valores, variavel, grupo=GRUPO_UNICO, ddof=1):
+        """(valores - média) / desvio da variável no grupo"""
+        i, g = self._indice(variavel), self.grupos.get_loc(grupo)
+        desvio = np.sqrt(self.comomentos[g, i, i] / (self.n[g] - ddof))
+        return (valores - self.media[g, i]) / desvio
+
+    @staticmethod
+    def colunas(variaveis):
+        """Colunas de para_dataframe: n, media_*, m2_* e c_*_* (co-momentos fora da diagonal)"""
+        return (['n'] + [f'media_{v}' for v in variaveis] + [f'm2_{v}' for v in variaveis]
+                + [f'c_{a}_{b}' for i, a in enumerate(variaveis) for b in variaveis[i + 1:]])
+
+    def para_dataframe(self):
+        k = len(self.variaveis)
+        superior = np.triu_indices(k, 1)
+        dados = np.column_stack([self.n, self.media, np.diagonal(self.comomentos, axis1=1, axis2=2),
+                                 self.comomentos[:, superior[0], superior[1]]])
+        return pd.DataFrame(dados, index=self.grupos, columns=self.colunas(self.variaveis))
+
+    @classmethod
+    def de_dataframe(cls, tabela, variaveis):
+        k = len(variaveis)
+        superior = np.triu_indices(k, 1)
+        comomentos = np.zeros((len(tabela), k, k))
+        comomentos[:, np.arange(k), np.arange(k)] = tabela[[f'm2_{v}' for v in variaveis]].to_numpy(dtype=float)
+        fora = tabela[cls.colunas(variaveis)[1 + 2 * k:]].to_numpy(dtype=float)
+        comomentos[:, superior[0], superior[1]] = fora
+        comomentos[:, superior[1], superior[0]] = fora
+        return cls(variaveis, tabela.index, tabela['n'].to_numpy(dtype=float),
+                   tabela[[f'media_{v}' for v in variaveis]].to_numpy(dtype=float), comomentos)
+
+    def para_dict(self):
+        """Estado em tipos do JSON"""
+        return {'variaveis': self.variaveis, 'grupos': self.grupos.tolist(), 'n': self.n.tolist(),
+                'media': self.media.tolist(), 'comomentos': self.comomentos.tolist()}
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(dados['variaveis'], dados['grupos'], dados['n'], dados['media'], dados['comomentos'])
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+🗜️ EXPORTAÇÃO COMPACTA DE FIGURAS PLOTLY
+========================================
+
+Serializa as figuras com os arrays numéricos dos traços codificados como
+arrays tipados em base64 (codificação `bdata` do plotly.js, >= 2.28), no lugar
+de listas de números em texto JSON:
+
+- cada array usa o menor tipo que representa seus valores sem perda
+  (u1/i1/u2/i2/u4/i4 para inteiros, f4/f8 para reais)
+- matrizes (ex.: `z` de um heatmap) vão como um único bloco com `shape`
+- listas Python e Series (ex.: previsões montadas em laço) também são
+  codificadas, não só arrays numpy
+- textos continuam como listas; rótulos por ponto devem ser gerados no
+  navegador com `texttemplate` (ex.: 'R$ %{y:,.0f}')
+
+Com um plotly.js antigo (sem suporte a `bdata`) a figura sai sem alterações.
+
+Exemplo:
+    salvar_html_compacto(fig, 'output/html_interativos/heatmap.html')
+    corpo = para_json_compacto(fig)
+"""
+
+import base64
+
+import numpy as np
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+from diretorios import garantir_diretorio
+
+# Arrays menores que isso ficam como lista (o cabeçalho do bdata não compensa)
+TAMANHO_MINIMO_BDATA = 8
+VERSAO_MINIMA_BDATA = (2, 28)
+
+TIPOS_INTEIROS = [np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32]
+CODIGOS_PLOTLY = {
+    np.dtype(np.int8): 'i1', np.dtype(np.uint8): 'u1',
+    np.dtype(np.int16): 'i2', np.dtype(np.uint16): 'u2',
+    np.dtype(np.int32): 'i4', np.dtype(np.uint32): 'u4',
+    np.dtype(np.float32): 'f4', np.dtype(np.float64): 'f8',
+}
+
+
+def suporta_bdata(versao_plotlyjs=None):
+    """Indica se o plotly.js (o embutido, por padrão) decodifica arrays `bdata`"""
+    versao = versao_plotlyjs or get_plotlyjs_version()
+    try:
+        return tuple(int(parte) for parte in versao.split('.')[:2]) >= VERSAO_MINIMA_BDATA
+    except ValueError:
+        return False
+
+
+def _menor_tipo(valores):
+    """Array convertido para o menor tipo suportado pelo plotly.js sem perder valores"""
+    if np.issubdtype(valores.dtype, np.integer):
+        if valores.size:
+            minimo, maximo = valores.min(), valores.max()
+            for tipo in TIPOS_INTEIROS:
+                limites = np.iinfo(tipo)
+                if limites.min <= minimo and maximo <= limites.max:
+                    return valores.astype(tipo)
+        # int64 não existe no plotly.js: inteiros grandes vão como f8
+        return valores.astype(np.float64)
+    if valores.dtype == np.float32:
+        return valores
+    return valores.astype(np.float64)
+
+
+def codificar_array(valores):
+    """Especificação `bdata` de um array numérico, ou None se não for numérico"""
+    if isinstance(valores, (list, tuple)):
+        if not valores or any(isinstance(v, (str, bool, dict, np.bool_)) for v in valores):
+            return None
+    try:
+        array = np.asarray(valores)
+    except ValueError:  # listas irregulares
+        return None
+    if array.dtype == np.bool_ or not np.issubdtype(array.dtype, np.number) or np.iscomplexobj(array):
+        return None
+    if array.ndim not in (1, 2) or array.size < TAMANHO_MINIMO_BDATA:
+        return None
+
+    array = np.ascontiguousarray(_menor_tipo(array))
+    especificacao = {
+        'dtype': CODIGOS_PLOTLY[array.dtype],
+        'bdata': base64.b64encode(array.astype(array.dtype.newbyteorder('<'), copy=False).tobytes()).decode('ascii'),
+    }
+    if array.ndim == 2:
+        especificacao['shape'] = f"{array.shape[0]}, {array.shape[1]}"
+    return especificacao
+
+
+def _compactar(objeto):
+    """Percorre as propriedades de um traço codificando os arrays numéricos"""
+    if isinstance(objeto, dict):
+        if 'bdata' in objeto:  # já codificado
+            return objeto
+        return {chave: _compactar(valor) for chave, valor in objeto.items()}
+    if isinstance(objeto, (list, tuple, np.ndarray)):
+        especificacao = codificar_array(objeto)
+        if especificacao is not None:
+            return especificacao
+        if isinstance(objeto, np.ndarray):
+            return objeto
+        return [_compactar(item) if isinstance(item, dict) else item for item in objeto]
+    return objeto
+
+
+def figura_compacta(fig):
+    """Dicionário da figura com os arrays numéricos dos traços em `bdata`
+
+    Só os traços são codificados; o layout (eixos, anotações, template) fica como está.
+    """
+    figura = fig if isinstance(fig, dict) else fig.to_plotly_json()
+    if not suporta_bdata():
+        return figura
+    return {**figura, 'data': [_compactar(traco) for traco in figura.get('data', [])]}
+
+
+def para_json_compacto(fig):
+    """JSON da figura com arrays numéricos codificados"""
+    return pio.to_json(figura_compacta(fig), validate=False)
+
+
+def salvar_html_compacto(fig, caminho_arquivo, **kwargs):
+    """Equivalente a fig.write_html, com os arrays numéricos codificados"""
+    garantir_diretorio(caminho_arquivo)
+    pio.write_html(figura_compacta(fig), caminho_arquivo, validate=False, **kwargs)
+    return caminho_arquivo
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+🔥 HEATMAP ESCALÁVEL (VENDEDOR × PRODUTO E SIMILARES)
+====================================================
+
+Heatmaps montados a partir dos totais agregados em formato longo (só as
+combinações que existem), guardados como matriz esparsa, no lugar do pivot
+denso com anotação em todas as células:
+
+- matriz esparsa (scipy.sparse) construída direto dos totais agregados
+- ordenação das linhas/colunas por agrupamento hierárquico (perfis parecidos
+  ficam vizinhos) ou por total (top-K); opcionalmente só as K maiores, com o
+  restante somado em 'Outros'. Sem ordenação escolhida, eixos pequenos ficam
+  na ordem original (alfabética, como no pivot) e só os com mais de
+  LIMITE_ORDEM_ORIGINAL itens são agrupados
+- acima da resolução configurada a matriz vira um raster: blocos de
+  linhas × colunas consecutivas (na ordem escolhida) somados em uma célula,
+  como um datashader, direto das entradas não nulas
+- valores escritos nas células só abaixo do limite de células
+
+Exemplo:
+    heatmap = HeatmapEscalavel(ordenacao='cluster', top_k=(50, 50))
+    grade = heatmap.preparar(agregados.por('Vendedor', 'Produto')['Qtd_Vendida'])
+    fig = go.Figure(heatmap.heatmap_plotly(grade, colorscale='Viridis'))
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from scipy import sparse
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.sparse.linalg import svds
+
+LIMITE_ANOTACAO = 600
+RESOLUCAO_RASTER = (400, 600)
+LIMITE_CLUSTER = 3000
+COMPONENTES_CLUSTER = 20
+LIMITE_ORDEM_ORIGINAL = 50
+ROTULO_OUTROS = 'Outros'
+
+
+def matriz_esparsa(totais):
+    """Matriz esparsa (CSR) de uma Series indexada por (linha, coluna), com os rótulos dos eixos"""
+    if totais.index.nlevels != 2:
+        raise ValueError("Os totais devem ser indexados por exatamente duas dimensões (ex.: Vendedor, Produto)")
+    codigos_linha, rotulos_linha = pd.factorize(totais.index.get_level_values(0), sort=True)
+    codigos_coluna, rotulos_coluna = pd.factorize(totais.index.get_level_values(1), sort=True)
+    matriz = sparse.coo_matrix(
+        (totais.to_numpy(dtype=float), (codigos_linha, codigos_coluna)),
+        shape=(len(rotulos_linha), len(rotulos_coluna))
+    ).tocsr()
+    return matriz, np.asarray(rotulos_linha), np.asarray(rotulos_coluna)
+
+
+def ordem_por_total(matriz, eixo=0):
+    """Índices das linhas (eixo=0) ou colunas (eixo=1) do maior para o menor total"""
+    totais = np.asarray(matriz.sum(axis=1 - eixo)).ravel()
+    return np.argsort(-totais, kind='stable')
+
+
+def ordem_cluster(matriz, eixo=0, limite=LIMITE_CLUSTER):
+    """Ordem das folhas de um agrupamento hierárquico (Ward) dos perfis de cada linha/coluna
+
+    Cada linha é normalizada pelo seu total (compara o mix, não o volume) e, se
+    tiver muitas colunas, projetada em poucas componentes (SVD esparso). Acima
+    de `limite` itens a matriz de distâncias não compensa e a ordem é por total.
+    """
+    matriz = sparse.csr_matrix(matriz if eixo == 0 else matriz.T)
+    n_itens, n_atributos = matriz.shape
+    if n_itens < 3:
+        return np.arange(n_itens)
+    if n_itens > limite:
+        return ordem_por_total(matriz)
+
+    totais = np.asarray(matriz.sum(axis=1)).ravel()
+    perfis = sparse.diags(1 / np.where(totais == 0, 1, totais)) @ matriz
+    if n_atributos > COMPONENTES_CLUSTER + 1:
+        u, s, _ = svds(perfis, k=min(COMPONENTES_CLUSTER, n_itens - 1))
+        atributos = u * s
+    else:
+        atributos = perfis.toarray()
+    return leaves_list(linkage(atributos, method='ward'))
+
+
+def _colapsar_eixo(n_itens, mantidos):
+    """Matriz de projeção (K+1 × n) que mantém os índices escolhidos e soma o resto na última linha"""
+    destino = np.full(n_itens, len(mantidos))
+    destino[mantidos] = np.arange(len(mantidos))
+    return sparse.csr_matrix((np.ones(n_itens), (destino, np.arange(n_itens))),
+                             shape=(len(mantidos) + 1, n_itens))
+
+
+def _blocos(n_itens, n_blocos):
+    """Bloco de cada posição ao dividir n_itens consecutivos em n_blocos de tamanho quase igual"""
+    return np.arange(n_itens) * n_blocos // n_itens
+
+
+class GradeHeatmap:
+    """Matriz pronta para desenhar: valores, rótulos e como deve ser exibida"""
+
+    def __init__(self, z, linhas, colunas, anotar, rasterizado, dimensoes_originais, nao_nulos):
+        self.z = z
+        self.linhas = linhas
+        self.colunas = colunas
+        self.anotar = anotar
+        self.rasterizado = rasterizado
+        self.dimensoes_originais = dimensoes_originais
+        self.nao_nulos = nao_nulos
+
+    @property
+    def densidade(self):
+        n_linhas, n_colunas = self.dimensoes_originais
+        return self.nao_nulos / max(n_linhas * n_colunas, 1)
+
+    def para_dataframe(self):
+        return pd.DataFrame(self.z, index=self.linhas, columns=self.colunas)
+
+
+class HeatmapEscalavel:
+    """Heatmap de duas dimensões que se adapta ao número de linhas e colunas
+
+    Com as opções padrão, eixos de até limite_ordem_original itens ficam na
+    ordem original e os maiores são agrupados; a grade só é rasterizada acima
+    da resolução. A linha/coluna 'Outros' do top-K fica sempre por último.
+    """
+
+    def __init__(self, ordenacao=None, top_k=None, limite_anotacao=LIMITE_ANOTACAO,
+                 resolucao=RESOLUCAO_RASTER, limite_cluster=LIMITE_CLUSTER,
+                 limite_ordem_original=LIMITE_ORDEM_ORIGINAL):
+        if ordenacao not in ('cluster', 'total', None):
+            raise ValueError(f"Ordenação desconhecida: {ordenacao}. Use 'cluster', 'total' ou None")
+        self.ordenacao = ordenacao
+        self.top_k = top_k
+        self.limite_anotacao = limite_anotacao
+        self.resolucao = resolucao
+        self.limite_cluster = limite_cluster
+        self.limite_ordem_original = limite_ordem_original
+
+    def _ordem(self, matriz, eixo, outros=False):
+        """Ordem de um eixo; sem ordenação escolhida, agrupa só eixos maiores que limite_ordem_original
+
+        Com outros=True o último item ('Outros') fica fora da ordenação e vai para o fim.
+        """
+        n = matriz.shape[eixo] - outros
+        matriz = matriz[:n] if eixo == 0 else matriz[:, :n]
+        if self.ordenacao == 'cluster' or (self.ordenacao is None and n > self.limite_ordem_original):
+            ordem = ordem_cluster(matriz, eixo, self.limite_cluster)
+        elif self.ordenacao == 'total':
+            ordem = ordem_por_total(matriz, eixo)
+        else:
+            ordem = np.arange(n)
+        return np.append(ordem, n) if outros else ordem
+
+    def _aplicar_top_k(self, matriz, linhas, colunas):
+        """Mantém as K linhas/colunas de maior total e soma as demais em 'Outros' (último item do eixo)
+
+        Retorna também, por eixo, se 'Outros' foi acrescentado.
+        """
+        k_linhas, k_colunas = self.top_k if isinstance(self.top_k, tuple) else (self.top_k, self.top_k)
+        outros = [False, False]
+        if k_linhas and matriz.shape[0] > k_linhas + 1:
+            mantidas = np.sort(ordem_por_total(matriz, 0)[:k_linhas])
+            matriz = _colapsar_eixo(matriz.shape[0], mantidas) @ matriz
+            linhas = np.append(linhas[mantidas], ROTULO_OUTROS)
+            outros[0] = True
+        if k_colunas and matriz.shape[1] > k_colunas + 1:
+            mantidas = np.sort(ordem_por_total(matriz, 1)[:k_colunas])
+            matriz = matriz @ _colapsar_eixo(matriz.shape[1], mantidas).T
+            colunas = np.append(colunas[mantidas], ROTULO_OUTROS)
+            outros[1] = True
+        return matriz.tocsr(), linhas, colunas, outros
+
+    def _rotulos_blocos(self, rotulos, blocos, n_blocos):
+        """'primeiro … último (n)' para cada bloco do raster"""
+        inicios = np.searchsorted(blocos, np.arange(n_blocos))
+        fins = np.append(inicios[1:], len(blocos)) - 1
+        return np.array([rotulos[i] if i == f else f"{rotulos[i]} … {rotulos[f]} ({f - i + 1})"
+                         for i, f in zip(inicios, fins)], dtype=object)
+
+    def _rasterizar(self, matriz, linhas, colunas):
+        """Soma as entradas não nulas em blocos de linhas × colunas consecutivas"""
+        n_linhas, n_colunas = matriz.shape
+        blocos_linha = min(n_linhas, self.resolucao[0])
+        blocos_coluna = min(n_colunas, self.resolucao[1])
+        bloco_linha = _blocos(n_linhas, blocos_linha)
+        bloco_coluna = _blocos(n_colunas, blocos_coluna)
+
+        entradas = matriz.tocoo()
+        celula = bloco_linha[entradas.row] * blocos_coluna + bloco_coluna[entradas.col]
+        z = np.bincount(celula, weights=entradas.data,
+                        minlength=blocos_linha * blocos_coluna).reshape(blocos_linha, blocos_coluna)
+        return (z, self._rotulos_blocos(linhas, bloco_linha, blocos_linha),
+                self._rotulos_blocos(colunas, bloco_coluna, blocos_coluna))
+
+    def preparar(self, totais):
+        """Grade do heatmap a partir de totais em formato longo (Series indexada por linha, coluna)"""
+        matriz, linhas, colunas = matriz_esparsa(totais)
+        dimensoes_originais, nao_nulos = matriz.shape, matriz.nnz
+
+        outros = [False, False]
+        if self.top_k:
+            matriz, linhas, colunas, outros = self._aplicar_top_k(matriz, linhas, colunas)
+
+        ordem_linhas, ordem_colunas = self._ordem(matriz, 0, outros[0]), self._ordem(matriz, 1, outros[1])
+        matriz = matriz[ordem_linhas][:, ordem_colunas]
+        linhas, colunas = linhas[ordem_linhas], colunas[ordem_colunas]
+
+        rasterizado = matriz.shape[0] > self.resolucao[0] or matriz.shape[1] > self.resolucao[1]
+        if rasterizado:
+            z, linhas, colunas = self._rasterizar(matriz, linhas, colunas)
+        else:
+            z = matriz.toarray()
+
+        return GradeHeatmap(z, linhas, colunas, anotar=z.size <= self.limite_anotacao,
+                            rasterizado=rasterizado, dimensoes_originais=dimensoes_originais,
+                            nao_nulos=nao_nulos)
+
+    def heatmap_plotly(self, grade, formato=',.0f', **kwargs):
+        """go.Heatmap da grade; valores nas células só quando a grade é pequena"""
+        if grade.anotar:
+            kwargs.setdefault('texttemplate', f"%{{z:{formato}}}")
+        if grade.rasterizado:
+            kwargs.setdefault('hovertemplate', f"%{{y}}<br>%{{x}}<br>Soma do bloco: %{{z:{formato}}}<extra></extra>")
+        return go.Heatmap(z=grade.z, x=grade.colunas, y=grade.linhas, hoverongaps=False, **kwargs)
+
+    def heatmap_matplotlib(self, grade, ax, cmap='YlOrRd', rotulo_barra=None):
+        """Heatmap matplotlib: seaborn anotado quando pequeno, imagem (imshow) quando grande"""
+        import matplotlib.pyplot as plt
+
+        if not grade.rasterizado and grade.z.size <= self.resolucao[0] * self.resolucao[1] // 10:
+            import seaborn as sns
+            sns.heatmap(grade.para_dataframe(), annot=grade.anotar, fmt='g', cmap=cmap, ax=ax,
+                        cbar_kws={'label': rotulo_barra} if rotulo_barra else None)
+            return ax
+
+        imagem = ax.imshow(grade.z, aspect='auto', interpolation='nearest', cmap=cmap)
+        plt.colorbar(imagem, ax=ax, label=rotulo_barra)
+        # Poucos rótulos, espalhados, para não sobrepor
+        for rotulos, definir in ((grade.linhas, ax.set_yticks), (grade.colunas, ax.set_xticks)):
+            posicoes = np.unique(np.linspace(0, len(rotulos) - 1, min(len(rotulos), 20)).astype(int))
+            definir(posicoes, [str(rotulos[p]) for p in posicoes])
+        return ax
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+🔎 ÍNDICE INVERTIDO E ZONE MAPS PARA FILTROS POR DIMENSÃO
+=========================================================
+
+Montado uma vez ao carregar os dados, para que recortes por região, produto,
+vendedor e período não varram todas as linhas a cada filtro:
+
+- para cada valor de Regiao/Produto/Vendedor, as posições das suas linhas
+  (um argsort estável dos códigos + deslocamentos por bincount, O(linhas) no
+  total, qualquer que seja o número de valores); filtros combinados = união
+  das posições dos valores de uma dimensão e interseção entre dimensões
+- zone maps: data mínima e máxima de cada bloco de linhas; blocos fora do
+  período são descartados, blocos inteiros dentro entram sem olhar as linhas
+  e só os blocos de fronteira comparam data a data
+- pode ser gravado em .npz ao lado do CSV de origem (datasets/vendas_indice.npz,
+  com --salvar ou salvar=True) e é reaproveitado enquanto o CSV não mudar
+  (mesmo tamanho, data de modificação e número de linhas)
+
+As posições são as das linhas do quadro indexado, na ordem em que foi lido.
+
+Exemplo:
+    indice = IndiceVendas.de_dataframe(df)
+    df_sul = indice.fatiar(df, regiao='Sul')
+    posicoes = indice.selecionar(de='2024-01', ate='2024-06', produto=['Notebook', 'Monitor'])
+
+Uso:
+    python indice_vendas.py --regiao Sul --de 2024-01 --salvar
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+DIMENSOES_INDICE = ['Regiao', 'Produto', 'Vendedor']
+FILTROS_DIMENSAO = {'regiao': 'Regiao', 'produto': 'Produto', 'vendedor': 'Vendedor'}
+TAMANHO_BLOCO = 4096
+VERSAO_INDICE = 2
+
+
+def caminho_indice(caminho_csv):
+    """Arquivo do índice persistido ao lado do CSV (vendas.csv -> vendas_indice.npz)"""
+    return os.path.splitext(caminho_csv)[0] + '_indice.npz'
+
+
+def assinatura_csv(caminho_csv, n_linhas):
+    """Identifica a versão do CSV para a qual um índice gravado vale"""
+    estado = os.stat(caminho_csv)
+    return {'versao': VERSAO_INDICE, 'bytes_origem': estado.st_size,
+            'mtime_ns_origem': estado.st_mtime_ns, 'n_linhas': n_linhas}
+
+
+class IndiceVendas:
+    """Posições das linhas por valor das dimensões e zone maps de data por bloco de linhas"""
+
+    def __init__(self, n_linhas, valores_dimensao, posicoes, inicios, dias, zona_min, zona_max,
+                 tamanho_bloco=TAMANHO_BLOCO, assinatura=None):
+        self.n_linhas = n_linhas
+        self.valores_dimensao = valores_dimensao
+        self.posicoes = posicoes
+        self.inicios = inicios
+        self.dias = dias
+        self.zona_min = zona_min
+        self.zona_max = zona_max
+        self.tamanho_bloco = tamanho_bloco
+        self.assinatura = assinatura or {}
+
+    @classmethod
+    def de_dataframe(cls, df, tamanho_bloco=TAMANHO_BLOCO, assinatura=None):
+        """Monta as listas de posições e os zone maps em uma passada por coluna"""
+        n_linhas = len(df)
+        tipo_posicao = np.int32 if n_linhas <= np.iinfo(np.int32).max else np.int64
+        valores_dimensao, posicoes, inicios = {}, {}, {}
+        for dimensao in DIMENSOES_INDICE:
+            codigos, valores = pd.factorize(df[dimensao], sort=True)
+            valores_dimensao[dimensao] = pd.Index(valores, name=dimensao)
+            # Linhas agrupadas por valor (em ordem crescente dentro de cada valor)
+            posicoes[dimensao] = np.argsort(codigos, kind='stable').astype(tipo_posicao)
+            inicios[dimensao] = np.r_[0, np.cumsum(np.bincount(codigos, minlength=len(valores)))]
+
+        # Dias desde 1970-01-01 (a data é por dia; horas não entram nos filtros)
+        dias = pd.to_datetime(df['Data']).to_numpy().astype('datetime64[D]').astype(np.int32)
+        blocos = np.arange(0, n_linhas, tamanho_bloco)
+        zona_min = np.minimum.reduceat(dias, blocos) if n_linhas else np.empty(0, np.int32)
+        zona_max = np.maximum.reduceat(dias, blocos) if n_linhas else np.empty(0, np.int32)
+        return cls(n_linhas, valores_dimensao, posicoes, inicios, dias, zona_min, zona_max,
+                   tamanho_bloco, assinatura)
+
+    @classmethod
+    def para_arquivo(cls, df, caminho_csv, salvar=False):
+        """Índice gravado do CSV, se ainda vale para ele e para `df` (lido do CSV); senão monta
+
+        Só grava o índice montado com salvar=True.
+        """
+        assinatura = assinatura_csv(caminho_csv, len(df))
+        caminho = caminho_indice(caminho_csv)
+        if os.path.exists(caminho):
+            try:
+                indice = cls.carregar(caminho)
+            except (KeyError, ValueError):
+                indice = None  # gravado em um formato anterior
+            if indice is not None and indice.assinatura == assinatura:
+                return indice
+        indice = cls.de_dataframe(df, assinatura=assinatura)
+        if salvar:
+            indice.salvar(caminho)
+        return indice
+
+    def posicoes_dimensao(self, dimensao, valores):
+        """Posições (ordenadas) das linhas com algum dos valores pedidos (valores ausentes são ignorados)"""
+        valores = [valores] if isinstance(valores, str) else list(valores)
+        codigos = self.valores_dimensao[dimensao].get_indexer(valores)
+        inicios, posicoes = self.inicios[dimensao], self.posicoes[dimensao]
+        trechos = [posicoes[inicios[codigo]:inicios[codigo + 1]] for codigo in np.unique(codigos[codigos >= 0])]
+        if len(trechos) == 1:
+            return trechos[0]
+        return np.sort(np.concatenate(trechos)) if trechos else posicoes[:0]
+
+    def _limites_periodo(self, de=None, ate=None):
+        """Primeiro e último dia (desde 1970-01-01) dos meses `de` a `ate`"""
+        inicio = pd.Period(de or '1970-01', freq='M').start_time.to_datetime64().astype('datetime64[D]').astype(np.int64)
+        fim = pd.Period(ate or '2200-12', freq='M').end_time.to_datetime64().astype('datetime64[D]').astype(np.int64)
+        return inicio, fim
+
+    def bitmap_periodo(self, de=None, ate=None):
+        """Bitmap das linhas com data entre os meses `de` e `ate` (inclusive), pelos zone maps"""
+        inicio, fim = self._limites_periodo(de, ate)
+        dentro = np.zeros(self.n_linhas, dtype=bool)
+        inteiros = (self.zona_min >= inicio) & (self.zona_max <= fim)
+        fronteira = (self.zona_max >= inicio) & (self.zona_min <= fim) & ~inteiros
+        for bloco in np.flatnonzero(inteiros):
+            dentro[bloco * self.tamanho_bloco:(bloco + 1) * self.tamanho_bloco] = True
+        for bloco in np.flatnonzero(fronteira):
+            faixa = slice(bloco * self.tamanho_bloco, (bloco + 1) * self.tamanho_bloco)
+            dentro[faixa] = (self.dias[faixa] >= inicio) & (self.dias[faixa] <= fim)
+        return np.packbits(dentro)
+
+    def selecionar(self, de=None, ate=None, **filtros):
+        """Posições (ordenadas) das linhas que atendem aos filtros"""
+        resultado = None
+        for chave, valores in filtros.items():
+            if chave not in FILTROS_DIMENSAO:
+                raise ValueError(f"Filtro desconhecido: {chave}. Use um de {list(FILTROS_DIMENSAO)}")
+            if valores is None:
+                continue
+            posicoes = self.posicoes_dimensao(FILTROS_DIMENSAO[chave], valores)
+            resultado = posicoes if resultado is None else np.intersect1d(resultado, posicoes, assume_unique=True)
+        if de or ate:
+            if resultado is None:
+                return np.flatnonzero(np.unpackbits(self.bitmap_periodo(de, ate), count=self.n_linhas))
+            # Poucas linhas já selecionadas: a data é conferida só nelas
+            inicio, fim = self._limites_periodo(de, ate)
+            dias = self.dias[resultado]
+            resultado = resultado[(dias >= inicio) & (dias <= fim)]
+        return np.arange(self.n_linhas) if resultado is None else resultado
+
+    def bitmap(self, de=None, ate=None, **filtros):
+        """Bitmap (np.packbits) das linhas que atendem aos filtros"""
+        dentro = np.zeros(self.n_linhas, dtype=bool)
+        dentro[self.selecionar(de, ate, **filtros)] = True
+        return np.packbits(dentro)
+
+    def contar(self, de=None, ate=None, **filtros):
+        return len(self.selecionar(de, ate, **filtros))
+
+    def fatiar(self, df, de=None, ate=None, **filtros):
+        """Linhas de `df` (o quadro indexado) que atendem aos filtros"""
+        if len(df) != self.n_linhas:
+            raise ValueError(f"O índice tem {self.n_linhas} linhas e o quadro, {len(df)}")
+        return df.iloc[self.selecionar(de, ate, **filtros)]
+
+    def grupos(self, dimensao):
+        """Posições das linhas de cada valor da dimensão"""
+        inicios, posicoes = self.inicios[dimensao], self.posicoes[dimensao]
+        return {valor: posicoes[inicios[codigo]:inicios[codigo + 1]]
+                for codigo, valor in enumerate(self.valores_dimensao[dimensao])}
+
+    def salvar(self, caminho):
+        """Grava o índice em .npz"""
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        arrays = {f'posicoes_{dimensao}': posicoes for dimensao, posicoes in self.posicoes.items()}
+        arrays.update({f'inicios_{dimensao}': inicios for dimensao, inicios in self.inicios.items()})
+        arrays.update({f'valores_{dimensao}': np.asarray(valores, dtype=str)
+                       for dimensao, valores in self.valores_dimensao.items()})
+        metadados = {'n_linhas': self.n_linhas, 'tamanho_bloco': self.tamanho_bloco, 'assinatura': self.assinatura}
+        np.savez_compressed(caminho, dias=self.dias, zona_min=self.zona_min, zona_max=self.zona_max,
+                            metadados=np.asarray(json.dumps(metadados)), **arrays)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho) as dados:
+            metadados = json.loads(str(dados['metadados']))
+            valores_dimensao = {dimensao: pd.Index(dados[f'valores_{dimensao}'].astype(object), name=dimensao)
+                                for dimensao in DIMENSOES_INDICE}
+            posicoes = {dimensao: dados[f'posicoes_{dimensao}'] for dimensao in DIMENSOES_INDICE}
+            inicios = {dimensao: dados[f'inicios_{dimensao}'] for dimensao in DIMENSOES_INDICE}
+            return cls(metadados['n_linhas'], valores_dimensao, posicoes, inicios, dados['dias'],
+                       dados['zona_min'], dados['zona_max'], metadados['tamanho_bloco'], metadados['assinatura'])
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+    import time
+    from dataset_particionado import CSV_VENDAS, adicionar_argumentos_filtro
+
+    parser = argparse.ArgumentParser(description="Índice invertido e zone maps do CSV de vendas")
+    parser.add_argument('--csv', default=CSV_VENDAS, help=f"CSV de vendas (padrão: {CSV_VENDAS})")
+    parser.add_argument('--salvar', action='store_true', help="Grava o índice ao lado do CSV para as próximas leituras")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
+    try:
+        df = pd.read_csv(args.csv)
+    except FileNotFoundError:
+        print(f"❌ Erro: Arquivo {args.csv} não encontrado!")
+        return
+    indice = IndiceVendas.para_arquivo(df, args.csv, salvar=args.salvar)
+    print(f"✅ Índice: {indice.n_linhas:,} linhas, {len(indice.zona_min)} blocos"
+          + (f" ({caminho_indice(args.csv)})" if args.salvar else ""))
+
+    filtros = {'regiao': args.regiao, 'produto': args.produto, 'vendedor': args.vendedor}
+    inicio = time.perf_counter()
+    posicoes = indice.selecionar(args.de, args.ate, **filtros)
+    print(f"🔎 {len(posicoes):,} linhas selecionadas em {(time.perf_counter() - inicio) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""
+📡 INGESTÃO AO VIVO COM PAINEL ATUALIZADO POR EVENTOS
+=====================================================
+
+Segue um arquivo só de acréscimo (CSV ou JSONL exportado pelo PDV) como um
+`tail -f`: as linhas novas atualizam totais em memória e o painel no navegador
+recebe só o que mudou por Server-Sent Events, sem regerar os HTML da
+VisualizacaoInterativa:
+
+- o arquivo é lido a partir do último byte processado, no máximo
+  TAMANHO_BLOCO bytes por quadro (um atraso grande é consumido em vários
+  quadros, com memória limitada); uma linha final incompleta fica para o
+  próximo quadro, e um arquivo rotacionado (ou truncado) é lido do início
+  como continuação do fluxo
+- totais por mês e por produto, região e vendedor (dinheiro em centavos int64,
+  ver moeda.py), somados lote a lote
+- as linhas que chegam entre dois quadros viram um único lote e um único
+  evento 'delta' (frequência configurável com --fps); o evento traz os totais
+  absolutos só das chaves que mudaram, então repetir um evento não altera nada
+- cada conexão nova recebe o estado completo ('estado') antes dos deltas;
+  um navegador lento demais é desconectado e, ao reconectar, recebe o estado
+- linhas inválidas (campos a mais, data, números ou dimensões ausentes, linha
+  maior que um bloco) são contadas e ignoradas
+
+Endpoints:
+- GET /              painel com os gráficos
+- GET /api/estado    totais atuais em JSON
+- GET /eventos       fluxo SSE ('estado' na conexão, depois 'delta' a cada quadro)
+
+Uso:
+    python ingestao_ao_vivo.py --arquivo exportacao_pdv.jsonl --fps 2
+    python ingestao_ao_vivo.py --arquivo datasets/vendas.csv --do-fim   # só o que chegar a partir de agora
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from moeda import em_centavos
+
+COLUNAS_FEED = ['Data', 'Regiao', 'Produto', 'Vendedor', 'Qtd_Vendida', 'Receita', 'Lucro']
+DIMENSOES_PAINEL = ['Produto', 'Regiao', 'Vendedor']
+METRICAS_PAINEL = ['Qtd_Vendida', 'Receita', 'Lucro']
+QUADROS_POR_SEGUNDO = 2
+PORTA_PADRAO = 8051
+TAMANHO_BLOCO = 4 << 20  # bytes lidos por quadro, no máximo
+INTERVALO_PING = 15      # segundos sem eventos até mandar um comentário (mantém a conexão)
+LIMITE_FILA = 64         # eventos pendentes por navegador antes de desconectá-lo
+
+
+class LeitorIncremental:
+    """Linhas completas acrescentadas a um arquivo CSV ou JSONL desde a última leitura"""
+
+    def __init__(self, caminho, formato=None, do_inicio=True):
+        self.caminho = caminho
+        self.formato = formato or ('jsonl' if caminho.endswith(('.jsonl', '.ndjson')) else 'csv')
+        if self.formato not in ('csv', 'jsonl'):
+            raise ValueError(f"Formato desconhecido: {self.formato}. Use csv ou jsonl")
+        self.identidade = None
+        self.posicao = 0
+        self.cabecalho = None
+        self.rejeitadas = 0
+        self.descartando = False  # no meio de uma linha maior que um bloco
+        if not do_inicio and os.path.exists(caminho):
+            self._ir_para_o_fim()
+
+    def _ir_para_o_fim(self):
+        """Ignora o conteúdo atual (mantendo o cabeçalho do CSV)"""
+        estado = os.stat(self.caminho)
+        self.identidade = (estado.st_dev, estado.st_ino)
+        with open(self.caminho, 'rb') as f:
+            if self.formato == 'csv':
+                self._definir_cabecalho(f.readline())
+            # Começa depois da última linha completa
+            f.seek(max(0, estado.st_size - (1 << 20)))
+            final = f.read(estado.st_size - f.tell())
+        self.posicao = max(self.posicao, estado.st_size - len(final) + final.rfind(b'\n') + 1)
+
+    def _definir_cabecalho(self, linha):
+        colunas = linha.decode('utf-8').strip().split(',')
+        faltando = set(COLUNAS_FEED) - set(colunas)
+        if faltando:
+            raise ValueError(f"Colunas ausentes em {self.caminho}: {', '.join(sorted(faltando))}")
+        self.cabecalho = linha
+
+    def ler(self):
+        """Lote (DataFrame validado, possivelmente vazio) das linhas completas novas"""
+        try:
+            estado = os.stat(self.caminho)
+        except FileNotFoundError:
+            return self._validar(pd.DataFrame(columns=COLUNAS_FEED))  # a exportação ainda não criou o arquivo
+        identidade = (estado.st_dev, estado.st_ino)
+        if identidade != self.identidade or estado.st_size < self.posicao:
+            if self.identidade is not None:
+                print(f"🔄 {self.caminho} foi recriado ou truncado; relendo do início")
+            self.identidade, self.posicao, self.cabecalho = identidade, 0, None
+            self.descartando = False
+        if estado.st_size == self.posicao:
+            return self._validar(pd.DataFrame(columns=COLUNAS_FEED))
+
+        with open(self.caminho, 'rb') as f:
+            f.seek(self.posicao)
+            conteudo = f.read(min(estado.st_size - self.posicao, TAMANHO_BLOCO))
+        if self.descartando:
+            # Resto da linha longa demais: pulado até a próxima quebra de linha
+            fim = conteudo.find(b'\n') + 1
+            self.posicao += fim or len(conteudo)
+            if not fim:
+                return self._validar(pd.DataFrame(columns=COLUNAS_FEED))
+            self.descartando = False
+            conteudo = conteudo[fim:]
+        completo = conteudo.rfind(b'\n') + 1
+        if not completo and len(conteudo) == TAMANHO_BLOCO:
+            self.rejeitadas += 1
+            self.descartando = True
+            self.posicao += len(conteudo)
+            return self._validar(pd.DataFrame(columns=COLUNAS_FEED))
+        self.posicao += completo
+        conteudo = conteudo[:completo]
+        if self.formato == 'csv' and self.cabecalho is None and conteudo:
+            fim = conteudo.index(b'\n') + 1
+            self._definir_cabecalho(conteudo[:fim])
+            conteudo = conteudo[fim:]
+        return self._validar(self._interpretar(conteudo))
+
+    def _interpretar(self, conteudo):
+        if not conteudo.strip():
+            return pd.DataFrame(columns=COLUNAS_FEED)
+        if self.formato == 'csv':
+            linhas = pd.read_csv(BytesIO(self.cabecalho + conteudo), on_bad_lines='skip')
+            # Linhas com campos a mais são puladas pelo pandas: entram como rejeitadas
+            self.rejeitadas += sum(1 for linha in conteudo.split(b'\n') if linha.strip()) - len(linhas)
+            return linhas
+        registros = []
+        for linha in conteudo.splitlines():
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                registro = None
+            if isinstance(registro, dict):
+                registros.append(registro)
+            else:
+                self.rejeitadas += 1
+        return pd.DataFrame.from_records(registros, columns=COLUNAS_FEED)
+
+    def _validar(self, linhas):
+        """Colunas do painel (Ano_Mes, dimensões, Qtd_Vendida e dinheiro em centavos) das linhas válidas"""
+        linhas = linhas.reindex(columns=COLUNAS_FEED)
+        datas = pd.to_datetime(linhas['Data'], errors='coerce', format='ISO8601')
+        numeros = linhas[METRICAS_PAINEL].apply(pd.to_numeric, errors='coerce')
+        validas = datas.notna() & numeros.notna().all(axis=1) & linhas[DIMENSOES_PAINEL].notna().all(axis=1)
+        self.rejeitadas += int((~validas).sum())
+
+        lote = linhas.loc[validas, DIMENSOES_PAINEL].astype(str)
+        lote.insert(0, 'Ano_Mes', datas[validas].dt.strftime('%Y-%m'))
+        lote['Qtd_Vendida'] = np.rint(numeros.loc[validas, 'Qtd_Vendida'].to_numpy(dtype=float)).astype(np.int64)
+        for coluna in ('Receita', 'Lucro'):
+            lote[coluna] = em_centavos(numeros.loc[validas, coluna].astype(float))
+        return lote
+
+
+class TotaisAoVivo:
+    """Totais por mês e por valor de cada dimensão (Receita e Lucro em centavos)"""
+
+    CHAVES = ['Ano_Mes'] + DIMENSOES_PAINEL
+
+    def __init__(self):
+        self.tabelas = {chave: pd.DataFrame(columns=METRICAS_PAINEL, dtype=np.int64).rename_axis(chave)
+                        for chave in self.CHAVES}
+        self.n_registros = 0
+
+    def incorporar(self, lote):
+        """Soma o lote aos totais e devolve os totais (absolutos) das chaves que mudaram"""
+        alteradas = {}
+        for chave in self.CHAVES:
+            somas = lote.groupby(chave, sort=False)[METRICAS_PAINEL].sum()
+            self.tabelas[chave] = self.tabelas[chave].add(somas, fill_value=0).astype(np.int64)
+            alteradas[chave] = self.tabelas[chave].loc[somas.index]
+        self.n_registros += len(lote)
+        return alteradas
+
+    def totais(self):
+        """Totais gerais (Receita e Lucro em reais)"""
+        somas = self.tabelas['Ano_Mes'].sum()
+        return {'n_registros': self.n_registros, 'Qtd_Vendida': int(somas['Qtd_Vendida']),
+                'Receita': int(somas['Receita']) / 100, 'Lucro': int(somas['Lucro']) / 100}
+
+
+def tabelas_para_json(tabelas):
+    """{chave: {valor: {métrica: total}}} com Receita e Lucro em reais"""
+    return {chave: {str(valor): {'Qtd_Vendida': int(qtd), 'Receita': receita / 100, 'Lucro': lucro / 100}
+                    for valor, qtd, receita, lucro in tabela[METRICAS_PAINEL].itertuples()}
+            for chave, tabela in tabelas.items()}
+
+
+class PainelAoVivo:
+    """Leitor, totais e navegadores inscritos nos eventos, atualizados a cada quadro"""
+
+    def __init__(self, leitor, quadros_por_segundo=QUADROS_POR_SEGUNDO):
+        if quadros_por_segundo <= 0:
+            raise ValueError("A frequência de quadros (--fps) deve ser positiva")
+        self.leitor = leitor
+        self.totais = TotaisAoVivo()
+        self.intervalo = 1 / quadros_por_segundo
+        self.trava = threading.Lock()
+        self.assinantes = set()
+        self.sequencia = 0
+        self.atualizado_em = None
+
+    def _cabecalho_evento(self):
+        return {'sequencia': self.sequencia, 'atualizado_em': self.atualizado_em,
+                'rejeitadas': self.leitor.rejeitadas, 'totais': self.totais.totais()}
+
+    def estado(self):
+        """Totais completos (o que um navegador recém-conectado precisa)"""
+        with self.trava:
+            return {**self._cabecalho_evento(), **tabelas_para_json(self.totais.tabelas)}
+
+    @staticmethod
+    def formatar_evento(tipo, sequencia, dados):
+        corpo = json.dumps(dados, ensure_ascii=False)
+        return f"id: {sequencia}\nevent: {tipo}\ndata: {corpo}\n\n".encode('utf-8')
+
+    def inscrever(self):
+        """Fila de eventos de um navegador e o evento 'estado' inicial, consistentes entre si"""
+        fila = queue.Queue(LIMITE_FILA)
+        with self.trava:
+            inicial = self.formatar_evento('estado', self.sequencia,
+                                           {**self._cabecalho_evento(), **tabelas_para_json(self.totais.tabelas)})
+            self.assinantes.add(fila)
+        return fila, inicial
+
+    def cancelar(self, fila):
+        with self.trava:
+            self.assinantes.discard(fila)
+
+    def processar_quadro(self):
+        """Lê as linhas novas, atualiza os totais e publica um único 'delta' (retorna quantas linhas)"""
+        lote = self.leitor.ler()
+        if not len(lote):
+            return 0
+        with self.trava:
+            alteradas = self.totais.incorporar(lote)
+            self.sequencia += 1
+            self.atualizado_em = datetime.now().isoformat(timespec='seconds')
+            evento = self.formatar_evento('delta', self.sequencia, {**self._cabecalho_evento(), 'novos': len(lote),
+                                                                    **tabelas_para_json(alteradas)})
+            for fila in list(self.assinantes):
+                try:
+                    fila.put_nowait(evento)
+                except queue.Full:
+                    self.assinantes.discard(fila)  # reconecta e recebe o estado completo
+        return len(lote)
+
+    def seguir(self, parar):
+        """Processa um quadro a cada 1/fps segundos até `parar` (threading.Event) ser sinalizado"""
+        while not parar.is_set():
+            inicio = time.monotonic()
+            n_novos = self.processar_quadro()
+            if n_novos:
+                print(f"📥 {n_novos:,} registros (total: {self.totais.n_registros:,}, "
+                      f"{len(self.assinantes)} painéis conectados)")
+            parar.wait(max(0.0, self.intervalo - (time.monotonic() - inicio)))
+
+    def pagina_inicial(self):
+        """Página HTML que aplica os eventos aos gráficos"""
+        return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <title>📡 Vendas ao Vivo</title>
+    <script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, sans-serif; margin: 20px; }}
+        .linha {{ display: flex; flex-wrap: wrap; }}
+        .grafico {{ height: 420px; flex: 1 1 600px; }}
+        #resumo {{ font-weight: bold; }}
+        #conexao {{ color: gray; }}
+    </style>
+</head>
+<body>
+    <h1>📡 Vendas ao Vivo</h1>
+    <div id="resumo">Aguardando dados...</div>
+    <div id="conexao"></div>
+    <div id="g-mensal" class="grafico"></div>
+    <div class="linha">
+        <div id="g-Produto" class="grafico"></div>
+        <div id="g-Regiao" class="grafico"></div>
+        <div id="g-Vendedor" class="grafico"></div>
+    </div>
+    <script>
+        const chaves = ['Ano_Mes', 'Produto', 'Regiao', 'Vendedor'];
+        let estado = null, agendado = false;
+
+        function aplicar(dados, completo) {{
+            if (completo || !estado) estado = {{Ano_Mes: {{}}, Produto: {{}}, Regiao: {{}}, Vendedor: {{}}}};
+            for (const chave of chaves)
+                Object.assign(estado[chave], dados[chave] || {{}});
+            estado.cabecalho = dados;
+            if (!agendado) {{ agendado = true; requestAnimationFrame(desenhar); }}
+        }}
+
+        function colunas(tabela, metrica, ordenar) {{
+            let nomes = Object.keys(tabela);
+            nomes = ordenar ? nomes.sort() : nomes.sort((a, b) => tabela[b][metrica] - tabela[a][metrica]);
+            return [nomes, nomes.map(n => tabela[n][metrica])];
+        }}
+
+        function desenhar() {{
+            agendado = false;
+            const c = estado.cabecalho, t = c.totais;
+            document.getElementById('resumo').textContent =
+                `Registros: ${{t.n_registros.toLocaleString('pt-BR')}} | ` +
+                `Unidades: ${{t.Qtd_Vendida.toLocaleString('pt-BR')}} | ` +
+                `Receita: R$ ${{Math.round(t.Receita).toLocaleString('pt-BR')}} | ` +
+                `Margem: ${{(t.Receita ? t.Lucro / t.Receita * 100 : 0).toFixed(1)}}%`;
+            document.getElementById('conexao').textContent =
+                `Atualizado em ${{c.atualizado_em || '-'}} | linhas ignoradas: ${{c.rejeitadas}}`;
+
+            const [meses, qtd] = colunas(estado.Ano_Mes, 'Qtd_Vendida', true);
+            const receita = meses.map(m => estado.Ano_Mes[m].Receita);
+            Plotly.react('g-mensal', [
+                {{x: meses, y: qtd, type: 'bar', name: 'Quantidade', marker: {{color: 'steelblue'}}}},
+                {{x: meses, y: receita, type: 'scatter', mode: 'lines+markers', name: 'Receita',
+                  yaxis: 'y2', line: {{color: 'red'}}}}
+            ], {{title: '📅 Evolução Mensal', yaxis: {{title: 'Quantidade'}},
+                 yaxis2: {{title: 'Receita (R$)', overlaying: 'y', side: 'right'}}}});
+
+            const [produtos, receitaProduto] = colunas(estado.Produto, 'Receita');
+            Plotly.react('g-Produto', [{{x: produtos, y: receitaProduto, type: 'bar',
+                                          marker: {{color: 'seagreen'}}}}], {{title: '🏆 Receita por Produto'}});
+            const [regioes, qtdRegiao] = colunas(estado.Regiao, 'Qtd_Vendida');
+            Plotly.react('g-Regiao', [{{labels: regioes, values: qtdRegiao, type: 'pie', sort: false}}],
+                         {{title: '🗺️ Vendas por Região'}});
+            const [vendedores, qtdVendedor] = colunas(estado.Vendedor, 'Qtd_Vendida');
+            Plotly.react('g-Vendedor', [{{x: vendedores, y: qtdVendedor, type: 'bar',
+                                           marker: {{color: 'darkorange'}}}}], {{title: '👥 Quantidade por Vendedor'}});
+        }}
+
+        const fonte = new EventSource('/eventos');
+        fonte.addEventListener('estado', e => aplicar(JSON.parse(e.data), true));
+        fonte.addEventListener('delta', e => aplicar(JSON.parse(e.data), false));
+        fonte.onerror = () => {{ document.getElementById('conexao').textContent = 'Reconectando...'; }};
+    </script>
+</body>
+</html>"""
+
+
+class ManipuladorAoVivo(BaseHTTPRequestHandler):
+    """Página, estado em JSON e fluxo de eventos do PainelAoVivo"""
+
+    def log_message(self, formato, *args):
+        pass
+
+    def enviar(self, status, corpo, tipo='application/json; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        painel = self.server.painel
+        caminho = urlparse(self.path).path.rstrip('/') or '/'
+        if caminho == '/':
+            self.enviar(200, painel.pagina_inicial().encode('utf-8'), 'text/html; charset=utf-8')
+        elif caminho == '/api/estado':
+            self.enviar(200, json.dumps(painel.estado(), ensure_ascii=False).encode('utf-8'))
+        elif caminho == '/eventos':
+            self.transmitir(painel)
+        else:
+            self.enviar(404, json.dumps({'erro': "Rota não encontrada"}, ensure_ascii=False).encode('utf-8'))
+
+    def transmitir(self, painel):
+        """Mantém a conexão aberta enviando os eventos do navegador"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        fila, inicial = painel.inscrever()
+        try:
+            self.wfile.write(b'retry: 2000\n\n' + inicial)
+            while fila in painel.assinantes:
+                try:
+                    evento = fila.get(timeout=INTERVALO_PING)
+                except queue.Empty:
+                    evento = b': ping\n\n'
+                self.wfile.write(evento)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            painel.cancelar(fila)
+
+
+def criar_servidor(painel, host='127.0.0.1', porta=PORTA_PADRAO):
+    """Cria o servidor HTTP (use porta=0 para escolher uma porta livre)"""
+    httpd = ThreadingHTTPServer((host, porta), ManipuladorAoVivo)
+    httpd.daemon_threads = True
+    httpd.painel = painel
+    return httpd
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingestão ao vivo de um arquivo de vendas com painel por eventos (SSE)")
+    parser.add_argument('--arquivo', required=True, help="CSV ou JSONL só de acréscimo (ex.: exportação do PDV)")
+    parser.add_argument('--formato', choices=['csv', 'jsonl'], help="Padrão: pela extensão (.jsonl/.ndjson ou csv)")
+    parser.add_argument('--fps', type=float, default=QUADROS_POR_SEGUNDO,
+                        help=f"Atualizações por segundo enviadas ao painel (padrão: {QUADROS_POR_SEGUNDO})")
+    parser.add_argument('--do-fim', action='store_true', help="Ignora o conteúdo atual e segue só as linhas novas")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO)
+    args = parser.parse_args()
+
+    print("📡 INGESTÃO AO VIVO")
+    print("=" * 60)
+    try:
+        painel = PainelAoVivo(LeitorIncremental(args.arquivo, args.formato, do_inicio=not args.do_fim), args.fps)
+        painel.processar_quadro()
+    except ValueError as erro:
+        print(f"❌ Erro: {erro}")
+        return
+    print(f"✅ {painel.totais.n_registros:,} registros iniciais de {args.arquivo}")
+
+    httpd = criar_servidor(painel, args.host, args.porta)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    print(f"🚀 Acesse http://{args.host}:{httpd.server_address[1]}/ "
+          f"({args.fps:g} atualizações/s; Ctrl+C para encerrar)")
+    parar = threading.Event()
+    try:
+        painel.seguir(parar)
+    except ValueError as erro:
+        print(f"❌ Erro: {erro}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    print("\n👋 Ingestão encerrada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+⚡ LEITURA PARALELA DO CSV POR FAIXAS DE BYTES
+=============================================
+
+Divide o CSV em faixas de bytes que começam e terminam em quebras de linha e
+lê cada faixa em um processo (ou, com motor='pyarrow', usa o leitor
+multithread do pyarrow):
+
+- o cabeçalho é lido uma vez e repassado para cada faixa
+- cada processo faz o parse e a preparação linha a linha (preparar_dados de
+  analise_vendas) da sua faixa; textos voltam como categorias, que custam
+  bem menos para serializar entre processos
+- as categorias das faixas são unificadas (union_categoricals), então o
+  resultado tem um único dicionário por coluna; com categoricas=False as
+  colunas voltam a texto e o resultado é idêntico ao de carregar_dados
+- em vez do quadro, cada faixa pode devolver um agregado parcial (ex.: totais
+  mensais e momentos online), combinado no processo principal
+- agregar_lotes_paralelo lê cada faixa em lotes de tamanho_lote linhas (sem
+  carregar a faixa inteira), para agregados em memória constante
+
+As linhas não podem ter quebras de linha dentro de campos entre aspas (o
+vendas.csv não tem).
+
+Exemplo:
+    df = carregar_paralelo('datasets/vendas.csv', processos=8)
+    mensal, normalizacao = totais_mensais_paralelo('datasets/vendas.csv', processos=8)
+
+Uso:
+    python leitura_paralela.py --benchmark --processos 1 2 4 8 16
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from io import BufferedReader, BytesIO, RawIOBase
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+TAMANHO_MINIMO_FAIXA = 4 * 1024 * 1024
+FAIXAS_POR_PROCESSO = 2
+MOTORES = ('auto', 'processos', 'pyarrow')
+
+
+def pyarrow_disponivel():
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def faixas_de_bytes(caminho_arquivo, n_faixas, tamanho_minimo=TAMANHO_MINIMO_FAIXA):
+    """Cabeçalho e faixas [inicio, fim) do corpo do arquivo, alinhadas em quebras de linha"""
+    tamanho = os.path.getsize(caminho_arquivo)
+    with open(caminho_arquivo, 'rb') as f:
+        cabecalho = f.readline()
+        inicio_corpo = f.tell()
+        n_faixas = max(1, min(n_faixas, (tamanho - inicio_corpo) // max(tamanho_minimo, 1)))
+
+        cortes = [inicio_corpo]
+        for i in range(1, n_faixas):
+            f.seek(inicio_corpo + (tamanho - inicio_corpo) * i // n_faixas)
+            f.readline()  # avança até o fim da linha em que o corte caiu
+            if f.tell() > cortes[-1] and f.tell() < tamanho:
+                cortes.append(f.tell())
+        cortes.append(tamanho)
+    return cabecalho, list(zip(cortes[:-1], cortes[1:]))
+
+
+def ler_faixa(caminho_arquivo, cabecalho, inicio, fim, opcoes_csv=None):
+    """Quadro das linhas de uma faixa de bytes"""
+    with open(caminho_arquivo, 'rb') as f:
+        f.seek(inicio)
+        conteudo = f.read(fim - inicio)
+    return pd.read_csv(BytesIO(cabecalho + conteudo), **(opcoes_csv or {}))
+
+
+class LeitorFaixa(RawIOBase):
+    """Arquivo somente leitura com o cabeçalho seguido apenas da faixa [inicio, fim)"""
+
+    def __init__(self, caminho_arquivo, cabecalho, inicio, fim):
+        self._arquivo = open(caminho_arquivo, 'rb')
+        self._arquivo.seek(inicio)
+        self._cabecalho = cabecalho
+        self._fim = fim
+
+    def readable(self):
+        return True
+
+    def readinto(self, destino):
+        if self._cabecalho:
+            n = min(len(destino), len(self._cabecalho))
+            destino[:n] = self._cabecalho[:n]
+            self._cabecalho = self._cabecalho[n:]
+            return n
+        n = min(len(destino), self._fim - self._arquivo.tell())
+        return self._arquivo.readinto(memoryview(destino)[:n]) if n > 0 else 0
+
+    def close(self):
+        self._arquivo.close()
+        super().close()
+
+
+def ler_faixa_em_lotes(caminho_arquivo, cabecalho, inicio, fim, tamanho_lote, opcoes_csv=None):
+    """Lotes de até tamanho_lote linhas de uma faixa de bytes (a faixa não é lida de uma vez)"""
+    with BufferedReader(LeitorFaixa(caminho_arquivo, cabecalho, inicio, fim)) as leitor:
+        yield from pd.read_csv(leitor, chunksize=tamanho_lote, **(opcoes_csv or {}))
+
+
+def _ler_faixa_preparada(caminho_arquivo, cabecalho, inicio, fim, opcoes_csv):
+    """Tarefa de um processo: parse, preparação e textos como categorias"""
+    from analise_vendas import preparar_dados
+
+    df = preparar_dados(ler_faixa(caminho_arquivo, cabecalho, inicio, fim, opcoes_csv))
+    for coluna in df.columns[df.dtypes == object]:
+        df[coluna] = df[coluna].astype('category')
+    return df
+
+
+def _aplicar_em_faixa(funcao, caminho_arquivo, cabecalho, inicio, fim, opcoes_csv):
+    """Tarefa de um processo: agregado parcial da faixa"""
+    return funcao(ler_faixa(caminho_arquivo, cabecalho, inicio, fim, opcoes_csv))
+
+
+def _aplicar_em_lotes_da_faixa(funcao, tamanho_lote, caminho_arquivo, cabecalho, inicio, fim, opcoes_csv):
+    """Tarefa de um processo: agregado parcial dos lotes da faixa"""
+    return funcao(ler_faixa_em_lotes(caminho_arquivo, cabecalho, inicio, fim, tamanho_lote, opcoes_csv))
+
+
+def _executar(tarefa, caminho_arquivo, processos, opcoes_csv, *argumentos):
+    """Aplica a tarefa a cada faixa do arquivo; resultados na ordem das faixas"""
+    processos = processos or os.cpu_count() or 1
+    cabecalho, faixas = faixas_de_bytes(caminho_arquivo, processos * FAIXAS_POR_PROCESSO)
+    chamadas = [argumentos + (caminho_arquivo, cabecalho, inicio, fim, opcoes_csv) for inicio, fim in faixas]
+    if processos == 1 or len(faixas) == 1:
+        return [tarefa(*chamada) for chamada in chamadas]
+    with ProcessPoolExecutor(max_workers=min(processos, len(faixas))) as executor:
+        return list(executor.map(tarefa, *zip(*chamadas)))
+
+
+def concatenar_faixas(partes, categoricas=False):
+    """Junta os quadros das faixas com um único dicionário por coluna categórica"""
+    colunas = partes[0].columns
+    categoricas_faixas = [c for c in colunas if isinstance(partes[0][c].dtype, pd.CategoricalDtype)]
+    df = pd.concat([parte.drop(columns=categoricas_faixas) for parte in partes], ignore_index=True)
+    for coluna in categoricas_faixas:
+        unida = union_categoricals([parte[coluna] for parte in partes], sort_categories=True)
+        df[coluna] = unida if categoricas else np.asarray(unida)
+    return df[colunas]
+
+
+def carregar_paralelo(caminho_arquivo='datasets/vendas.csv', processos=None, categoricas=False,
+                      motor='processos', opcoes_csv=None):
+    """Mesmo resultado de analise_vendas.carregar_dados, com o parse dividido entre processos
+
+    categoricas=True mantém Regiao/Produto/Vendedor como categorias (um único
+    dicionário por coluna). motor='pyarrow' (ou 'auto', quando instalado) usa
+    o leitor multithread do pyarrow em vez do pool de processos; é opcional
+    porque o parse do pyarrow não garante o mesmo resultado de carregar_dados
+    (arredondamento dos floats, tipos das colunas).
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconhecido: {motor}. Use um de {MOTORES}")
+    if motor == 'pyarrow' or (motor == 'auto' and pyarrow_disponivel()):
+        from analise_vendas import preparar_dados
+        df = preparar_dados(pd.read_csv(caminho_arquivo, engine='pyarrow', **(opcoes_csv or {})))
+        if categoricas:
+            for coluna in df.columns[df.dtypes == object]:
+                df[coluna] = df[coluna].astype('category')
+        return df
+
+    if processos == 1 and not categoricas:
+        from analise_vendas import preparar_dados
+        return preparar_dados(pd.read_csv(caminho_arquivo, **(opcoes_csv or {})))
+    partes = _executar(_ler_faixa_preparada, caminho_arquivo, processos, opcoes_csv)
+    return concatenar_faixas(partes, categoricas)
+
+
+def agregar_paralelo(funcao, caminho_arquivo='datasets/vendas.csv', processos=None, opcoes_csv=None):
+    """Lista com funcao(quadro da faixa) para cada faixa, na ordem do arquivo
+
+    `funcao` precisa ser uma função de módulo (é enviada aos processos).
+    """
+    return _executar(_aplicar_em_faixa, caminho_arquivo, processos, opcoes_csv, funcao)
+
+
+def agregar_lotes_paralelo(funcao, caminho_arquivo='datasets/vendas.csv', processos=None,
+                           tamanho_lote=1_000_000, opcoes_csv=None):
+    """Lista com funcao(iterador de lotes da faixa) para cada faixa, na ordem do arquivo
+
+    Cada processo lê a sua faixa em lotes de tamanho_lote linhas, então a
+    memória por processo não cresce com o tamanho da faixa. `funcao` precisa
+    ser uma função de módulo (é enviada aos processos).
+    """
+    return _executar(_aplicar_em_lotes_da_faixa, caminho_arquivo, processos, opcoes_csv, funcao, tamanho_lote)
+
+
+def _parcial_mensal(df):
+    """Totais mensais e momentos de normalização de uma faixa"""
+    from base_incremental import METRICAS_NORMALIZACAO, agregar_mensal
+    from estatisticas_online import MomentosOnline
+    return agregar_mensal(df), MomentosOnline.de_valores(df[METRICAS_NORMALIZACAO])
+
+
+def totais_mensais_paralelo(caminho_arquivo='datasets/vendas.csv', processos=None):
+    """Totais Ano_Mes × Regiao × Produto × Vendedor e momentos de Qtd_Vendida/Receita, sem montar o quadro"""
+    from agregados import DIMENSOES_BASE, METRICAS_BASE
+
+    parciais = agregar_paralelo(_parcial_mensal, caminho_arquivo, processos)
+    mensal = pd.concat([mensal for mensal, _ in parciais], ignore_index=True).groupby(
+        DIMENSOES_BASE, sort=False)[METRICAS_BASE].sum().reset_index()
+    normalizacao = reduce(lambda a, b: a.combinar(b), [momentos for _, momentos in parciais])
+    return mensal, normalizacao
+
+
+def benchmark(caminho_arquivo, lista_processos, repeticoes=3):
+    """Tempo da leitura serial (carregar_dados) e da paralela para cada número de processos"""
+    from analise_vendas import carregar_dados
+
+    def cronometrar(funcao):
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            resultado = funcao()
+            tempos.append(time.perf_counter() - inicio)
+        return min(tempos), resultado
+
+    tamanho_mb = os.path.getsize(caminho_arquivo) / 1024 ** 2
+    print(f"⚡ Benchmark: {caminho_arquivo} ({tamanho_mb:,.1f} MB), {os.cpu_count()} CPUs, "
+          f"melhor de {repeticoes}")
+    tempo_serial, referencia = cronometrar(lambda: carregar_dados(caminho_arquivo))
+    print(f"   serial (carregar_dados): {tempo_serial:.2f}s | {len(referencia):,} registros")
+
+    for processos in lista_processos:
+        tempo, df = cronometrar(lambda: carregar_paralelo(caminho_arquivo, processos, motor='processos'))
+        pd.testing.assert_frame_equal(df, referencia)
+        print(f"   {processos:>3} processos: {tempo:.2f}s | aceleração {tempo_serial / tempo:.2f}x "
+              f"| eficiência {tempo_serial / tempo / processos:.0%} | resultado idêntico ✅")
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Leitura paralela do CSV de vendas por faixas de bytes")
+    parser.add_argument('--arquivo', default='datasets/vendas.csv', help="CSV de vendas")
+    parser.add_argument('--processos', type=int, nargs='+', help="Número(s) de processos (padrão: número de CPUs)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Compara a leitura serial com a paralela para cada número de processos")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Repetições por medição no benchmark")
+    args = parser.parse_args()
+
+    try:
+        if args.benchmark:
+            benchmark(args.arquivo, args.processos or [1, 2, 4, 8, 16], args.repeticoes)
+            return
+        inicio = time.perf_counter()
+        df = carregar_paralelo(args.arquivo, args.processos[0] if args.processos else None)
+    except FileNotFoundError:
+        print(f"❌ Erro: Arquivo {args.arquivo} não encontrado!")
+        return
+    print(f"✅ {len(df):,} registros lidos em {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+🧩 MODELOS DE GRÁFICOS REAPROVEITÁVEIS (MATPLOTLIB)
+===================================================
+
+Componentes que criam os artistas uma única vez e depois só trocam os dados,
+para desenhar o mesmo layout muitas vezes (ex.: um resumo por região) sem
+recriar barras, textos e eixos a cada figura:
+
+- BarrasRotuladas: barras (verticais ou horizontais) com o valor escrito em
+  cada uma; atualiza com set_height/set_width e set_text/set_position
+- LinhaSerie: série temporal atualizada com set_data
+- cores_por_faixa: cores das barras de margem/ROI (verde/laranja/vermelho)
+- ModeloFigura: figura com layout calculado uma vez (tight_layout só na
+  primeira renderização) e gravação repetida
+
+Exemplo:
+    modelo = ModeloFigura(1, 1, figsize=(8, 5))
+    barras = BarrasRotuladas(modelo.eixos[0, 0], n_barras=5, formato='{:.1f}%', folga_fixa=0.5)
+    for regiao in regioes:
+        barras.atualizar(produtos, margens[regiao], cores=cores_por_faixa(margens[regiao]))
+        modelo.salvar(f'output/imagens/margem_{regiao}.png')
+"""
+
+import numpy as np
+
+from diretorios import garantir_diretorio
+
+FAIXAS_MARGEM = [(30, 'green'), (20, 'orange')]
+FAIXAS_ROI = [(50, 'green'), (25, 'orange')]
+COR_ABAIXO = 'red'
+
+
+def cores_por_faixa(valores, faixas=FAIXAS_MARGEM, cor_abaixo=COR_ABAIXO):
+    """Cor de cada valor pela primeira faixa (limite mínimo, cor) atingida"""
+    cores = []
+    for valor in valores:
+        for limite, cor in faixas:
+            if valor >= limite:
+                cores.append(cor)
+                break
+        else:
+            cores.append(cor_abaixo)
+    return cores
+
+
+class BarrasRotuladas:
+    """Barras com rótulos de valor, criadas uma vez e atualizadas a cada chamada"""
+
+    def __init__(self, ax, n_barras, horizontal=False, formato='{:,.0f}', folga_relativa=0.01,
+                 folga_fixa=0.0, fontsize=None, rotacao=None, **estilo):
+        self.ax = ax
+        self.n_barras = n_barras
+        self.horizontal = horizontal
+        self.formato = formato
+        self.folga_relativa = folga_relativa
+        self.folga_fixa = folga_fixa
+
+        posicoes = np.arange(n_barras)
+        zeros = np.zeros(n_barras)
+        if horizontal:
+            self.barras = ax.barh(posicoes, zeros, **estilo)
+            self.rotulos = [ax.text(0, p, '', ha='left', va='center', fontsize=fontsize) for p in posicoes]
+        else:
+            self.barras = ax.bar(posicoes, zeros, **estilo)
+            self.rotulos = [ax.text(p, 0, '', ha='center', va='bottom', fontsize=fontsize) for p in posicoes]
+        (ax.set_yticks if horizontal else ax.set_xticks)(posicoes)
+        if rotacao is not None:
+            ax.tick_params(axis='y' if horizontal else 'x', rotation=rotacao)
+
+    def atualizar(self, categorias, valores, cores=None):
+        """Troca categorias, valores, cores e rótulos das barras existentes"""
+        valores = np.asarray(valores, dtype=float)
+        if len(valores) != self.n_barras:
+            raise ValueError(f"O modelo tem {self.n_barras} barras, mas recebeu {len(valores)} valores")
+
+        for i, (barra, rotulo, valor) in enumerate(zip(self.barras, self.rotulos, valores)):
+            # Rótulo além da ponta da barra: acima/à direita, ou abaixo/à esquerda quando negativa
+            negativo = valor < 0
+            posicao = valor + (-1 if negativo else 1) * (abs(valor) * self.folga_relativa + self.folga_fixa)
+            if self.horizontal:
+                barra.set_width(valor)
+                rotulo.set_position((posicao, i))
+                rotulo.set_horizontalalignment('right' if negativo else 'left')
+            else:
+                barra.set_height(valor)
+                rotulo.set_position((i, posicao))
+                rotulo.set_verticalalignment('top' if negativo else 'bottom')
+            rotulo.set_text(self.formato.format(valor))
+            if cores is not None:
+                barra.set_color(cores[i])
+
+        (self.ax.set_yticklabels if self.horizontal else self.ax.set_xticklabels)([str(c) for c in categorias])
+
+        # Espaço para os rótulos além da maior barra
+        minimo, maximo = min(valores.min(), 0), max(valores.max(), 0)
+        folga = (maximo - minimo) * 0.12 or 1
+        (self.ax.set_xlim if self.horizontal else self.ax.set_ylim)(minimo - (folga if minimo < 0 else 0), maximo + folga)
+
+
+class LinhaSerie:
+    """Linha de uma série (x = posição do período), atualizada com set_data"""
+
+    def __init__(self, ax, rotulos_x=None, max_rotulos=12, rotacao=45, **estilo):
+        self.ax = ax
+        self.linha, = ax.plot([], [], **estilo)
+        if rotulos_x is not None:
+            # Rótulos dos períodos nas posições, espaçados para não sobrepor
+            passo = max(1, int(np.ceil(len(rotulos_x) / max_rotulos)))
+            posicoes = np.arange(0, len(rotulos_x), passo)
+            ax.set_xticks(posicoes, [str(rotulos_x[p]) for p in posicoes], rotation=rotacao)
+
+    def atualizar(self, valores, x=None):
+        valores = np.asarray(valores, dtype=float)
+        self.linha.set_data(np.arange(len(valores)) if x is None else x, valores)
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class ModeloFigura:
+    """Figura com grade de eixos fixa; o layout é calculado só na primeira gravação"""
+
+    def __init__(self, linhas, colunas, figsize=(12, 8), titulo=None, **kwargs):
+        import matplotlib.pyplot as plt
+
+        self.fig, self.eixos = plt.subplots(linhas, colunas, figsize=figsize, squeeze=False, **kwargs)
+        self.titulo = self.fig.suptitle(titulo or '', fontsize=16, fontweight='bold')
+        self._layout_pronto = False
+
+    def definir_titulo(self, titulo):
+        self.titulo.set_text(titulo)
+
+    def ajustar_layout(self):
+        """tight_layout uma única vez; as renderizações seguintes reaproveitam as posições"""
+        if not self._layout_pronto:
+            self.fig.tight_layout()
+            self._layout_pronto = True
+
+    def salvar(self, caminho_arquivo, dpi=300):
+        self.ajustar_layout()
+        garantir_diretorio(caminho_arquivo)
+        self.fig.savefig(caminho_arquivo, dpi=dpi)
+        return caminho_arquivo
+
+    def fechar(self):
+        import matplotlib.pyplot as plt
+        plt.close(self.fig)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+💵 VALORES MONETÁRIOS EM CENTAVOS (INT64)
+=========================================
+
+Receita, Custo e Lucro chegam do sistema de origem com 2 casas decimais, mas
+somar milhões de float64 acumula erro de arredondamento. Em centavos inteiros:
+
+- as somas são exatas e fecham, centavo a centavo, com o sistema de origem
+- Lucro = Receita - Custo vale exatamente, sem resíduo de ponto flutuante
+- inteiros pequenos (e seus deltas entre linhas) comprimem bem
+
+Convenção: a unidade é sempre explícita. em_centavos, total_centavos e
+formatar_reais tratam os valores como reais, a menos que recebam
+centavos=True (um total inteiro em reais não vira centavos pelo tipo).
+converter_centavos marca o quadro convertido (df.attrs['centavos']), e
+esta_em_centavos(df) diz em que unidade estão as colunas monetárias.
+
+Exemplo:
+    df = carregar_dados(centavos=True)          # Receita/Custo/Lucro em int64
+    total = total_centavos(df['Receita'], centavos=True)   # int exato
+    print(formatar_reais(total, centavos=True))            # R$ 76,301,342.87
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_MONETARIAS = ['Receita', 'Custo', 'Lucro']
+
+
+def esta_em_centavos(df):
+    """Se as colunas monetárias do quadro já estão em centavos (convertidas por converter_centavos)"""
+    return bool(df.attrs.get('centavos', False))
+
+
+def em_centavos(valores, centavos=False):
+    """Valores em centavos int64 (reais arredondados ao centavo; com centavos=True, já estão em centavos)"""
+    if isinstance(valores, pd.Series):
+        if centavos:
+            return valores.astype(np.int64)
+        return pd.Series(np.rint(valores.to_numpy(dtype=float) * 100).astype(np.int64),
+                         index=valores.index, name=valores.name)
+    valores = np.asarray(valores)
+    if centavos:
+        return valores.astype(np.int64)
+    return np.rint(valores.astype(float) * 100).astype(np.int64)
+
+
+def converter_centavos(df, colunas=COLUNAS_MONETARIAS):
+    """Colunas monetárias presentes em `df` convertidas de reais para centavos (no próprio quadro)"""
+    if esta_em_centavos(df):
+        return df
+    for coluna in colunas:
+        if coluna in df.columns:
+            df[coluna] = em_centavos(df[coluna])
+    df.attrs['centavos'] = True
+    return df
+
+
+def total_centavos(valores, centavos=False):
+    """Soma exata em centavos (int do Python) de valores em reais ou, com centavos=True, em centavos"""
+    return int(em_centavos(valores, centavos).sum())
+
+
+def reais(centavos):
+    """Centavos como float em reais (para razões e gráficos)"""
+    return centavos / 100
+
+
+def formatar_reais(valor, centavos=False):
+    """'R$ 1,234.56' de um valor em reais ou, com centavos=True, exato a partir de centavos inteiros"""
+    if not centavos:
+        return f"R$ {valor:,.2f}"
+    inteiro, resto = divmod(abs(int(valor)), 100)
+    return f"R$ {'-' if valor < 0 else ''}{inteiro:,}.{resto:02d}"
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+🔍 NÍVEL DE DETALHE PARA GRÁFICOS INTERATIVOS
+=============================================
+
+Camada de redução aplicada automaticamente quando uma série ou um gráfico
+ultrapassa o orçamento de pontos configurado:
+
+- LTTB (Largest-Triangle-Three-Buckets) ou min-max para séries longas
+- go.Scattergl (WebGL) no lugar de go.Scatter para traços grandes
+- top-N + "Outros" para dimensões com muitas categorias (ex.: vendedores)
+
+Abaixo dos orçamentos os dados passam intactos.
+
+Exemplo:
+    lod = NivelDetalhe(orcamento_pontos=1500, max_series=10)
+    x, y = lod.reduzir_serie(datas, valores)
+    fig.add_trace(lod.scatter(x=x, y=y, mode='lines'))
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+ORCAMENTO_PONTOS = 2000
+LIMITE_WEBGL = 5000
+MAX_SERIES = 20
+ROTULO_OUTROS = 'Outros'
+
+
+def lttb(y, n_saida, x=None):
+    """Índices dos pontos escolhidos pelo Largest-Triangle-Three-Buckets"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # Baldes internos (primeiro e último ponto são sempre mantidos)
+    limites = np.linspace(1, n - 1, n_saida - 1).astype(np.int64)
+    inicio_balde, fim_balde = limites[:-1], limites[1:]
+    soma_x = np.concatenate([[0.0], np.cumsum(x)])
+    soma_y = np.concatenate([[0.0], np.cumsum(y)])
+
+    # Média do balde seguinte (o último usa o ponto final)
+    prox_inicio = np.append(inicio_balde[1:], n - 1)
+    prox_fim = np.append(fim_balde[1:], n)
+    tamanho = prox_fim - prox_inicio
+    media_x = (soma_x[prox_fim] - soma_x[prox_inicio]) / tamanho
+    media_y = (soma_y[prox_fim] - soma_y[prox_inicio]) / tamanho
+
+    indices = np.empty(n_saida, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    anterior = 0
+    for b in range(len(inicio_balde)):
+        faixa = slice(inicio_balde[b], fim_balde[b])
+        area = np.abs((x[anterior] - media_x[b]) * (y[faixa] - y[anterior])
+                      - (x[anterior] - x[faixa]) * (media_y[b] - y[anterior]))
+        anterior = inicio_balde[b] + int(np.argmax(area))
+        indices[b + 1] = anterior
+    return indices
+
+
+def min_max(y, n_saida):
+    """Índices do mínimo e do máximo de cada balde, em ordem (preserva picos); no máximo n_saida"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_saida >= n:
+        return np.arange(n)
+    # Primeiro e último ponto ocupam 2 lugares do orçamento; cada balde, outros 2
+    n_baldes = (n_saida - 2) // 2
+    if n_baldes < 1:
+        return np.unique([0, n - 1])
+
+    # Baldes de mesmo tamanho resolvidos como matriz; o último é completado com o
+    # ponto final (índices além do fim voltam para n - 1)
+    tamanho = -(-n // n_baldes)
+    blocos = np.pad(y, (0, tamanho * n_baldes - n), mode='edge').reshape(n_baldes, tamanho)
+    base = np.arange(n_baldes) * tamanho
+    i_min = np.minimum(base + blocos.argmin(axis=1), n - 1)
+    i_max = np.minimum(base + blocos.argmax(axis=1), n - 1)
+    return np.unique(np.concatenate([[0, n - 1], i_min, i_max]))
+
+
+def colapsar_top_n(dados, coluna, valor, n, rotulo=ROTULO_OUTROS, por=None):
+    """Mantém as n categorias de maior `valor` e soma as demais em `rotulo`
+
+    `dados` está em formato longo; com `por` (ex.: 'Data_Str') a soma das demais
+    categorias é feita dentro de cada valor de `por`.
+    """
+    totais = dados.groupby(coluna, sort=False)[valor].sum()
+    if len(totais) <= n:
+        return dados
+    principais = totais.nlargest(n).index
+    rotulos = dados[coluna].where(dados[coluna].isin(principais), rotulo)
+    chaves = [rotulos] if por is None else [dados[por], rotulos]
+    return dados.groupby(chaves, sort=False)[valor].sum().reset_index()
+
+
+class NivelDetalhe:
+    """Orçamentos de pontos e as reduções aplicadas quando são ultrapassados"""
+
+    def __init__(self, orcamento_pontos=ORCAMENTO_PONTOS, limite_webgl=LIMITE_WEBGL,
+                 max_series=MAX_SERIES, metodo='lttb'):
+        if metodo not in ('lttb', 'min_max'):
+            raise ValueError(f"Método de redução desconhecido: {metodo}. Use 'lttb' ou 'min_max'")
+        self.orcamento_pontos = orcamento_pontos
+        self.limite_webgl = limite_webgl
+        self.max_series = max_series
+        self.metodo = metodo
+
+    def indices_serie(self, y, x=None, orcamento=None):
+        """Índices mantidos de uma série (todos, se couber no orçamento)"""
+        orcamento = orcamento or self.orcamento_pontos
+        if len(y) <= orcamento:
+            return np.arange(len(y))
+        if self.metodo == 'min_max':
+            return min_max(y, orcamento)
+        return lttb(y, orcamento, x=x)
+
+    def reduzir_serie(self, x, y):
+        """Série (x, y) reduzida ao orçamento; x pode ser categórico (ex.: Data_Str)"""
+        x = np.asarray(x)
+        y = np.asarray(y)
+        x_numerico = x if np.issubdtype(x.dtype, np.number) else None
+        indices = self.indices_serie(y, x_numerico)
+        return x[indices], y[indices]
+
+    def reduzir_tabela(self, dados, x, colunas):
+        """Reduz um DataFrame ordenado por `x`, unindo os pontos escolhidos para cada coluna
+
+        O orçamento é dividido entre as colunas, e o resultado não passa dele
+        (salvo com mais de orcamento_pontos / 3 colunas, que ficam com 3 pontos cada).
+        """
+        if len(dados) <= self.orcamento_pontos:
+            return dados
+        x_valores = dados[x].values
+        x_numerico = x_valores if np.issubdtype(x_valores.dtype, np.number) else None
+        orcamento = max(self.orcamento_pontos // len(colunas), 3)
+        escolhidos = np.unique(np.concatenate([self.indices_serie(dados[coluna].values, x_numerico, orcamento)
+                                               for coluna in colunas]))
+        return dados.iloc[escolhidos]
+
+    def scatter(self, **kwargs):
+        """go.Scatter, ou go.Scattergl quando o traço passa do limite de WebGL"""
+        n_pontos = len(kwargs.get('x') if kwargs.get('x') is not None else kwargs.get('y', ()))
+        classe = go.Scattergl if n_pontos > self.limite_webgl else go.Scatter
+        return classe(**kwargs)
+
+    def top_n(self, dados, coluna, valor, por=None):
+        """Colapsa as categorias além de max_series em 'Outros'"""
+        return colapsar_top_n(dados, coluna, valor, self.max_series, por=por)
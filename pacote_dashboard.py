@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+📦 PACOTE DO DASHBOARD EM PÁGINA ÚNICA
+======================================
+
+Gera um único arquivo HTML com todas as figuras interativas, no lugar do índice
+com links para vários HTMLs (cada um com sua própria cópia do plotly.js):
+
+- plotly.js incluído uma única vez (ou via CDN)
+- cada figura guardada como JSON comprimido (gzip + base64) em um bloco inerte
+- a figura só é descomprimida e desenhada quando sua aba é aberta
+- imagens PNG listadas em uma aba própria, carregadas sob demanda
+
+Exemplo:
+    pacote = PacoteDashboard("📊 Dashboard de Vendas")
+    pacote.adicionar_figura('produtos', fig, "Produtos")
+    pacote.salvar('output/index_dashboard.html')
+"""
+
+import base64
+import gzip
+import html
+import re
+from datetime import datetime
+
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from diretorios import garantir_diretorio
+from figuras_compactas import para_json_compacto
+
+
+def comprimir_figura(fig, nivel_compressao=9):
+    """JSON da figura (arrays numéricos em bdata) comprimido com gzip e codificado em base64"""
+    corpo = para_json_compacto(fig).encode('utf-8')
+    return base64.b64encode(gzip.compress(corpo, compresslevel=nivel_compressao)).decode('ascii')
+
+
+class PacoteDashboard:
+    def __init__(self, titulo="📊 Dashboard de Vendas", plotlyjs='inline', nivel_compressao=9):
+        if plotlyjs not in ('inline', 'cdn'):
+            raise ValueError(f"plotlyjs inválido: {plotlyjs}. Use 'inline' ou 'cdn'")
+        self.titulo = titulo
+        self.plotlyjs = plotlyjs
+        self.nivel_compressao = nivel_compressao
+        self.figuras = []
+        self.imagens = []
+        self.indicadores = []
+
+    def _identificador(self, nome):
+        """Identificador seguro para ids HTML, único no pacote"""
+        base = re.sub(r'[^0-9A-Za-z_-]+', '-', nome).strip('-') or 'figura'
+        existentes = {identificador for identificador, _, _ in self.figuras}
+        identificador, n = base, 2
+        while identificador in existentes:
+            identificador, n = f"{base}-{n}", n + 1
+        return identificador
+
+    def adicionar_figura(self, nome, fig, titulo=None):
+        """Serializa e comprime a figura imediatamente (a figura pode ser descartada em seguida)"""
+        if titulo is None:
+            titulo = fig.layout.title.text or nome
+        self.figuras.append((self._identificador(nome), titulo, comprimir_figura(fig, self.nivel_compressao)))
+
+    def adicionar_imagem(self, caminho_relativo, titulo):
+        """Imagem estática (caminho relativo ao HTML gerado)"""
+        self.imagens.append((caminho_relativo, titulo))
+
+    def adicionar_indicador(self, rotulo, valor):
+        """Número de destaque exibido no topo da página"""
+        self.indicadores.append((rotulo, valor))
+
+    def _script_plotly(self):
+        if self.plotlyjs == 'cdn':
+            return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+    def gerar_html(self):
+        """Monta a página única com abas"""
+        abas = [(identificador, titulo) for identificador, titulo, _ in self.figuras]
+        if self.imagens:
+            abas.append(('imagens', "🖼️ Imagens"))
+
+        botoes = ''.join(
+            f'<button class="aba" data-alvo="{identificador}">{html.escape(titulo)}</button>'
+            for identificador, titulo in abas
+        )
+        paineis = ''.join(
+            f'<section class="painel" id="painel-{identificador}"><div class="grafico" id="grafico-{identificador}"></div></section>'
+            f'<script type="text/plain" id="dados-{identificador}">{dados}</script>'
+            for identificador, _, dados in self.figuras
+        )
+        if self.imagens:
+            galeria = ''.join(
+                f'<figure><img loading="lazy" src="{html.escape(caminho)}" alt="{html.escape(titulo)}">'
+                f'<figcaption>{html.escape(titulo)}</figcaption></figure>'
+                for caminho, titulo in self.imagens
+            )
+            paineis += f'<section class="painel" id="painel-imagens"><div class="galeria">{galeria}</div></section>'
+        indicadores = ''.join(
+            f'<div class="indicador"><span class="numero">{html.escape(str(valor))}</span>'
+            f'<span>{html.escape(rotulo)}</span></div>'
+            for rotulo, valor in self.indicadores
+        )
+
+        return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(self.titulo)}</title>
+    {self._script_plotly()}
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; background: #f4f5fb; }}
+        header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px 30px; }}
+        h1 {{ margin: 0 0 10px 0; }}
+        .indicadores {{ display: flex; flex-wrap: wrap; gap: 30px; }}
+        .indicador .numero {{ display: block; font-size: 1.6em; font-weight: bold; }}
+        nav {{ display: flex; flex-wrap: wrap; gap: 6px; padding: 10px 30px; background: white;
+               box-shadow: 0 2px 4px rgba(0,0,0,0.08); position: sticky; top: 0; z-index: 10; }}
+        .aba {{ border: none; background: #eef0fa; padding: 8px 16px; border-radius: 20px; cursor: pointer; }}
+        .aba.ativa {{ background: #667eea; color: white; }}
+        .painel {{ display: none; padding: 20px 30px; }}
+        .painel.ativo {{ display: block; }}
+        .grafico {{ min-height: 500px; }}
+        .galeria {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(420px, 1fr)); gap: 20px; }}
+        .galeria img {{ width: 100%; border-radius: 8px; background: white; }}
+        footer {{ text-align: center; color: #777; padding: 20px; font-size: 0.9em; }}
+    </style>
+</head>
+<body>
+    <header>
+        <h1>{html.escape(self.titulo)}</h1>
+        <div class="indicadores">{indicadores}</div>
+    </header>
+    <nav>{botoes}</nav>
+    {paineis}
+    <footer>🎨 Gerado automaticamente pelo Sistema de Análise de Vendas - {datetime.now().strftime('%d/%m/%Y %H:%M')}</footer>
+    <script>
+        const desenhadas = new Set();
+
+        async function descomprimir(identificador) {{
+            const base64 = document.getElementById('dados-' + identificador).textContent;
+            const bytes = Uint8Array.from(atob(base64), c => c.charCodeAt(0));
+            const fluxo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(fluxo).text());
+        }}
+
+        async function ativar(identificador) {{
+            document.querySelectorAll('.aba').forEach(b => b.classList.toggle('ativa', b.dataset.alvo === identificador));
+            document.querySelectorAll('.painel').forEach(p => p.classList.toggle('ativo', p.id === 'painel-' + identificador));
+            const dados = document.getElementById('dados-' + identificador);
+            if (dados && !desenhadas.has(identificador)) {{
+                desenhadas.add(identificador);
+                const fig = await descomprimir(identificador);
+                await Plotly.newPlot('grafico-' + identificador, fig.data, fig.layout, {{responsive: true}});
+            }}
+        }}
+
+        document.querySelectorAll('.aba').forEach(b => b.addEventListener('click', () => ativar(b.dataset.alvo)));
+        const primeira = document.querySelector('.aba');
+        if (primeira) ativar(primeira.dataset.alvo);
+    </script>
+</body>
+</html>"""
+
+    def salvar(self, caminho_arquivo):
+        """Grava o pacote em um único arquivo HTML"""
+        garantir_diretorio(caminho_arquivo)
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            f.write(self.gerar_html())
+        return caminho_arquivo
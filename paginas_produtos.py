@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+📄 ANÁLISE POR PRODUTO EM PÁGINAS (SMALL MULTIPLES)
+===================================================
+
+Renderizador paginado da análise detalhada por produto: no lugar de uma única
+figura com altura proporcional ao número de produtos (3 subplots por produto),
+grava uma página PNG para cada lote de produtos.
+
+- todas as séries por produto (mensal, por vendedor, por região) saem de três
+  pivots dos totais agregados, feitos uma única vez
+- cada processo monta o modelo da página (eixos, linhas, barras, fatias) uma
+  vez e, para cada página, só atualiza os dados dos artistas já criados
+- as páginas são divididas entre processos quando há mais de uma
+
+Exemplo:
+    series = SeriesProdutos.de_agregados(agregados)
+    caminhos = PaginasProdutos(produtos_por_pagina=6).renderizar(series, 'output/imagens/produtos.png')
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from diretorios import garantir_diretorio
+
+PRODUTOS_POR_PAGINA = 6
+MAX_BARRAS = 15
+MAX_FATIAS = 8
+ROTULO_OUTROS = 'Outros'
+
+
+def _limitar_colunas(matriz, rotulos, maximo):
+    """Mantém as `maximo - 1` colunas de maior total e soma as demais em 'Outros'"""
+    if matriz.shape[1] <= maximo:
+        return matriz, list(rotulos)
+    ordem = np.argsort(-matriz.sum(axis=0), kind='stable')
+    mantidas, demais = np.sort(ordem[:maximo - 1]), ordem[maximo - 1:]
+    matriz = np.column_stack([matriz[:, mantidas], matriz[:, demais].sum(axis=1)])
+    return matriz, [rotulos[i] for i in mantidas] + [ROTULO_OUTROS]
+
+
+class SeriesProdutos:
+    """Séries de todos os produtos em matrizes densas (produto × mês/vendedor/região)"""
+
+    def __init__(self, produtos, mensal, vendedores, por_vendedor, regioes, por_regiao):
+        self.produtos = list(produtos)
+        self.mensal = mensal
+        self.vendedores = list(vendedores)
+        self.por_vendedor = por_vendedor
+        self.regioes = list(regioes)
+        self.por_regiao = por_regiao
+
+    @classmethod
+    def de_agregados(cls, agregados, metrica='Qtd_Vendida'):
+        """Três pivots dos totais agregados (nenhuma filtragem por produto)"""
+        mensal = agregados.por('Produto', 'Ano_Mes')[metrica].unstack(fill_value=0)
+        vendedor = agregados.por('Produto', 'Vendedor')[metrica].unstack(fill_value=0).reindex(mensal.index, fill_value=0)
+        regiao = agregados.por('Produto', 'Regiao')[metrica].unstack(fill_value=0).reindex(mensal.index, fill_value=0)
+        por_regiao, regioes = _limitar_colunas(regiao.to_numpy(dtype=float), list(regiao.columns), MAX_FATIAS)
+        return cls(mensal.index, mensal.to_numpy(dtype=float), vendedor.columns,
+                   vendedor.to_numpy(dtype=float), regioes, por_regiao)
+
+    def __len__(self):
+        return len(self.produtos)
+
+    def fatia(self, inicio, fim):
+        """Subconjunto de produtos [inicio, fim) (o que é enviado a cada processo)"""
+        return SeriesProdutos(self.produtos[inicio:fim], self.mensal[inicio:fim], self.vendedores,
+                              self.por_vendedor[inicio:fim], self.regioes, self.por_regiao[inicio:fim])
+
+
+class ModeloPagina:
+    """Figura de uma página com os artistas criados uma vez e atualizados a cada produto"""
+
+    def __init__(self, produtos_por_pagina, n_meses, n_barras, regioes):
+        import matplotlib.pyplot as plt
+
+        self.produtos_por_pagina = produtos_por_pagina
+        self.fig, eixos = plt.subplots(produtos_por_pagina, 3, figsize=(16, 4 * produtos_por_pagina), squeeze=False)
+        self.linhas = []
+        for ax_mensal, ax_vendedor, ax_regiao in eixos:
+            # Evolução mensal
+            linha, = ax_mensal.plot(range(n_meses), np.zeros(n_meses), marker='o', linewidth=2, markersize=4)
+            ax_mensal.set_ylabel('Quantidade')
+            ax_mensal.grid(True, alpha=0.3)
+
+            # Por vendedor (barras horizontais, ordenadas a cada produto)
+            barras = ax_vendedor.barh(range(n_barras), np.zeros(n_barras), alpha=0.8)
+            ax_vendedor.set_yticks(range(n_barras))
+            ax_vendedor.set_xlabel('Quantidade')
+
+            # Por região (fatias com ângulos atualizados a cada produto)
+            fatias, rotulos, percentuais = ax_regiao.pie(np.ones(len(regioes)), labels=regioes,
+                                                         autopct='%1.1f%%', startangle=90)
+            self.linhas.append((ax_mensal, linha, ax_vendedor, barras, ax_regiao, fatias, rotulos, percentuais))
+
+    def _atualizar_pizza(self, fatias, rotulos, percentuais, valores, nomes):
+        """Reposiciona fatias e textos como faria ax.pie(startangle=90)"""
+        total = valores.sum()
+        fracoes = valores / total if total else np.zeros_like(valores)
+        limites = 90 + 360 * np.concatenate([[0], np.cumsum(fracoes)])
+        for fatia, rotulo, percentual, inicio, fim, fracao, nome in zip(
+                fatias, rotulos, percentuais, limites[:-1], limites[1:], fracoes, nomes):
+            fatia.set_theta1(inicio)
+            fatia.set_theta2(fim)
+            meio = np.deg2rad((inicio + fim) / 2)
+            x, y = np.cos(meio), np.sin(meio)
+            rotulo.set_position((1.1 * x, 1.1 * y))
+            rotulo.set_horizontalalignment('left' if x > 0 else 'right')
+            rotulo.set_text(nome)
+            percentual.set_position((0.6 * x, 0.6 * y))
+            percentual.set_text(f'{fracao * 100:.1f}%')
+            for artista in (fatia, rotulo, percentual):
+                artista.set_visible(fracao > 0)
+
+    def desenhar(self, series):
+        """Atualiza os artistas com os produtos da página (linhas sobrando ficam ocultas)"""
+        for i, (ax_mensal, linha, ax_vendedor, barras, ax_regiao, fatias, rotulos, percentuais) in enumerate(self.linhas):
+            ativo = i < len(series)
+            for ax in (ax_mensal, ax_vendedor, ax_regiao):
+                ax.set_visible(ativo)
+            if not ativo:
+                continue
+            produto = series.produtos[i]
+
+            linha.set_ydata(series.mensal[i])
+            ax_mensal.relim()
+            ax_mensal.autoscale_view()
+            ax_mensal.set_title(f'📈 {produto} - Evolução Mensal', fontsize=11, fontweight='bold')
+
+            # Maiores vendedores do produto, do menor para o maior (como o barh ordenado)
+            valores = series.por_vendedor[i]
+            ordem = np.argsort(valores, kind='stable')[-len(barras):]
+            for barra, valor in zip(barras, valores[ordem]):
+                barra.set_width(valor)
+            ax_vendedor.set_yticklabels([series.vendedores[j] for j in ordem])
+            ax_vendedor.set_xlim(0, max(valores.max(), 1) * 1.05)
+            ax_vendedor.set_title(f'👥 {produto} - Por Vendedor', fontsize=11, fontweight='bold')
+
+            self._atualizar_pizza(fatias, rotulos, percentuais, series.por_regiao[i], series.regioes)
+            ax_regiao.set_title(f'🗺️ {produto} - Por Região', fontsize=11, fontweight='bold')
+        self.fig.tight_layout()
+
+    def salvar(self, caminho_arquivo, dpi):
+        garantir_diretorio(caminho_arquivo)
+        self.fig.savefig(caminho_arquivo, dpi=dpi, bbox_inches='tight')
+
+    def fechar(self):
+        import matplotlib.pyplot as plt
+        plt.close(self.fig)
+
+
+def _renderizar_paginas(series, caminhos, produtos_por_pagina, dpi, fechar=True):
+    """Renderiza páginas consecutivas reaproveitando um único modelo de página"""
+    n_barras = min(len(series.vendedores), MAX_BARRAS)
+    modelo = ModeloPagina(produtos_por_pagina, series.mensal.shape[1], n_barras, series.regioes)
+    for pagina, caminho in enumerate(caminhos):
+        inicio = pagina * produtos_por_pagina
+        modelo.desenhar(series.fatia(inicio, inicio + produtos_por_pagina))
+        modelo.salvar(caminho, dpi)
+    if fechar:
+        modelo.fechar()
+    return len(caminhos)
+
+
+def _renderizar_em_processo(series, caminhos, produtos_por_pagina, dpi, estilo):
+    """Ponto de entrada dos processos auxiliares: backend sem janela e o estilo dos gráficos"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    if estilo:
+        plt.style.use(estilo)
+    return _renderizar_paginas(series, caminhos, produtos_por_pagina, dpi)
+
+
+class PaginasProdutos:
+    """Divide os produtos em páginas e as renderiza em paralelo"""
+
+    def __init__(self, produtos_por_pagina=PRODUTOS_POR_PAGINA, dpi=300, processos=None, estilo='seaborn-v0_8'):
+        self.produtos_por_pagina = produtos_por_pagina
+        self.dpi = dpi
+        self.processos = processos or os.cpu_count() or 1
+        self.estilo = estilo
+
+    def caminhos(self, n_produtos, caminho_arquivo):
+        """Um arquivo por página; com uma página só, o próprio caminho_arquivo"""
+        n_paginas = max(-(-n_produtos // self.produtos_por_pagina), 1)
+        if n_paginas == 1:
+            return [caminho_arquivo]
+        raiz, extensao = os.path.splitext(caminho_arquivo)
+        return [f"{raiz}_p{pagina:02d}{extensao}" for pagina in range(1, n_paginas + 1)]
+
+    def renderizar(self, series, caminho_arquivo, manter_figura=False):
+        """Grava as páginas e retorna seus caminhos
+
+        Com manter_figura=True e uma única página, a figura fica aberta no processo
+        atual (para exibição) em vez de ser renderizada por um processo auxiliar.
+        """
+        caminhos = self.caminhos(len(series), caminho_arquivo)
+        if len(caminhos) == 1:
+            _renderizar_paginas(series, caminhos, min(len(series), self.produtos_por_pagina) or 1,
+                                self.dpi, fechar=not manter_figura)
+            return caminhos
+
+        # Blocos contíguos de páginas por processo; cada um reaproveita seu próprio modelo
+        n_processos = min(self.processos, len(caminhos))
+        blocos = np.array_split(np.arange(len(caminhos)), n_processos)
+        tarefas = []
+        for bloco in blocos:
+            inicio, fim = bloco[0] * self.produtos_por_pagina, (bloco[-1] + 1) * self.produtos_por_pagina
+            tarefas.append((series.fatia(inicio, fim), [caminhos[p] for p in bloco],
+                            self.produtos_por_pagina, self.dpi))
+
+        if n_processos == 1:
+            _renderizar_paginas(*tarefas[0])
+        else:
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                for futuro in [executor.submit(_renderizar_em_processo, *tarefa, self.estilo) for tarefa in tarefas]:
+                    futuro.result()
+        return caminhos
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+🧮 PREVISÃO HIERÁRQUICA - PRODUTO × REGIÃO × VENDEDOR
+=====================================================
+
+Prevê em lote todas as séries do nível base (Produto × Regiao × Vendedor)
+e reconcilia os níveis agregados (Total, Produto, Regiao, Vendedor) com uma
+matriz de soma esparsa, para que as previsões de todos os níveis somem entre si.
+
+Métodos de reconciliação:
+- 'bottom_up': os níveis agregados são a soma das previsões base
+- 'mint': MinT com covariância diagonal (variância histórica de cada série)
+- 'ols': MinT com covariância identidade
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+NIVEIS_HIERARQUIA = ['Produto', 'Regiao', 'Vendedor']
+METODOS_RECONCILIACAO = ('bottom_up', 'mint', 'ols')
+
+
+class PrevisaoHierarquica:
+    def __init__(self, df, peso_historico=0.3):
+        self.df = df
+        self.peso_historico = peso_historico
+        self._reconciliadas = {}
+        self.montar_series_base()
+        self.montar_matriz_soma()
+
+    def montar_series_base(self):
+        """Monta a matriz (séries base × meses) de quantidade vendida em uma única passada"""
+        datas = pd.to_datetime(self.df['Data'])
+        mes_abs = datas.dt.year.values * 12 + datas.dt.month.values - 1
+        mes_inicial = mes_abs.min()
+        mes_idx = mes_abs - mes_inicial
+        self.n_meses = int(mes_idx.max()) + 1
+        self.meses = pd.period_range(
+            start=pd.Period(year=mes_inicial // 12, month=mes_inicial % 12 + 1, freq='M'),
+            periods=self.n_meses, freq='M'
+        )
+
+        # Cada combinação observada Produto × Regiao × Vendedor vira uma série base
+        codigos, chaves = pd.MultiIndex.from_frame(self.df[NIVEIS_HIERARQUIA]).factorize()
+        self.chaves_base = pd.MultiIndex.from_tuples(chaves, names=NIVEIS_HIERARQUIA)
+        n_base = len(self.chaves_base)
+
+        # Soma por (série, mês) com bincount sobre o índice achatado
+        indice = codigos * self.n_meses + mes_idx
+        valores = np.bincount(indice, weights=self.df['Qtd_Vendida'].values,
+                              minlength=n_base * self.n_meses)
+        self.series_base = valores.reshape(n_base, self.n_meses)
+
+    def montar_matriz_soma(self):
+        """Monta a matriz de soma esparsa S (todas as séries × séries base)"""
+        n_base = len(self.chaves_base)
+        blocos = [sparse.csr_matrix(np.ones((1, n_base)))]
+        rotulos = [('Total', 'Total')]
+
+        for nivel in NIVEIS_HIERARQUIA:
+            codigos, valores = pd.factorize(self.chaves_base.get_level_values(nivel), sort=True)
+            blocos.append(sparse.csr_matrix(
+                (np.ones(n_base), (codigos, np.arange(n_base))),
+                shape=(len(valores), n_base)
+            ))
+            rotulos.extend((nivel, valor) for valor in valores)
+
+        blocos.append(sparse.identity(n_base, format='csr'))
+        rotulos.extend(('Base', ' | '.join(chave)) for chave in self.chaves_base)
+
+        self.matriz_soma = sparse.vstack(blocos, format='csr')
+        self.rotulos = pd.DataFrame(rotulos, columns=['Nivel', 'Chave'])
+
+    def previsoes_base(self):
+        """Previsão mensal independente para todas as séries (agregadas e base)"""
+        # Séries agregadas vêm de S @ Y, sem novas passadas sobre os dados
+        series = np.asarray(self.matriz_soma @ self.series_base)
+
+        # Mesmo modelo de previsao_inteligente_produto, vetorizado por linha
+        pesos_recentes = np.exp(np.linspace(-1, 0, self.n_meses))
+        media_historica = series.mean(axis=1)
+        media_ponderada = series @ pesos_recentes / pesos_recentes.sum()
+        previsao = (self.peso_historico * media_historica
+                    + (1 - self.peso_historico) * media_ponderada)
+
+        variancia = series.var(axis=1, ddof=1) if self.n_meses > 1 else np.zeros(len(series))
+        return previsao, variancia
+
+    def reconciliar(self, metodo='mint'):
+        """Reconcilia as previsões base para que todos os níveis sejam coerentes (resultado guardado por método)"""
+        if metodo not in METODOS_RECONCILIACAO:
+            raise ValueError(f"Método de reconciliação inválido: {metodo}. "
+                             f"Use um de {METODOS_RECONCILIACAO}")
+        if metodo in self._reconciliadas:
+            return self._reconciliadas[metodo]
+
+        previsao, variancia = self.previsoes_base()
+        S = self.matriz_soma
+        n_base = S.shape[1]
+
+        if metodo == 'bottom_up':
+            previsao_base = previsao[-n_base:]
+        else:
+            # MinT: b = (S' W⁻¹ S)⁻¹ S' W⁻¹ ŷ, com W diagonal
+            if metodo == 'mint':
+                piso = max(variancia.mean() * 1e-6, 1e-12)
+                w_inv = 1.0 / np.maximum(variancia, piso)
+            else:
+                w_inv = np.ones(S.shape[0])
+            St_W = S.T.multiply(w_inv).tocsr()
+            previsao_base = spsolve((St_W @ S).tocsc(), St_W @ previsao)
+
+        previsao_base = np.maximum(previsao_base, 0)
+        reconciliada = S @ previsao_base
+
+        resultado = self.rotulos.copy()
+        resultado['Previsao_Base'] = previsao
+        resultado['Previsao_Reconciliada'] = reconciliada
+        resultado['Previsao_Anual'] = reconciliada * 12
+        self._reconciliadas[metodo] = resultado
+        return resultado
+
+    def previsao_por_nivel(self, nivel, metodo='mint'):
+        """Previsões reconciliadas de um nível, indexadas pela chave"""
+        resultado = self.reconciliar(metodo)
+        return resultado[resultado['Nivel'] == nivel].set_index('Chave').drop(columns='Nivel')
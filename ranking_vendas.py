@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+🏅 RANKINGS TOP-K SEM ORDENAR TUDO
+==================================
+
+Os relatórios mostram só os primeiros colocados (top 10, o campeão de cada
+mês), então não é preciso ordenar todos os totais:
+
+- top_k: seleção parcial (np.partition) do k-ésimo maior valor, O(n), e
+  ordenação apenas dos que ficam acima dele
+- top_k_por_grupo: os k maiores itens de cada grupo (ex.: top 3 produtos de
+  cada mês) em uma única chamada vetorizada, com a seleção parcial aplicada a
+  todas as linhas de uma matriz grupos × itens (ou ao trecho de cada grupo,
+  quando a matriz seria grande demais)
+- empates são desempatados pela ordem dos itens (alfabética, como no groupby),
+  então o resultado é determinístico
+
+Exemplo:
+    top_k(df.groupby('Produto')['Receita'].sum(), 10)
+    top_k_por_grupo(df, 'Ano_Mes', 'Produto', 'Qtd_Vendida', k=3)
+"""
+
+import numpy as np
+import pandas as pd
+
+# Acima disso a matriz grupos × itens não é montada (seleção no trecho de cada grupo)
+LIMITE_CELULAS_DENSAS = 20_000_000
+
+
+def top_k(serie, k=None):
+    """Os k maiores valores da série em ordem decrescente (k=None: todos); empates na ordem da série
+
+    Valores ausentes (NaN) ficam de fora, como no nlargest.
+    """
+    if serie.hasnans:
+        serie = serie.dropna()
+    valores = serie.to_numpy()
+    n = len(valores)
+    if k is None or k >= n:
+        candidatos = np.arange(n)
+    elif k <= 0:
+        return serie.iloc[:0]
+    else:
+        limiar = np.partition(valores, n - k)[n - k]
+        candidatos = np.flatnonzero(valores >= limiar)
+    ordem = candidatos[np.lexsort((candidatos, -valores[candidatos]))]
+    return serie.iloc[ordem[:k] if k is not None else ordem]
+
+
+def _limiares_densos(valores, codigos_grupo, codigos_item, n_grupos, n_itens, k):
+    """Seleção parcial por linha da matriz grupos × itens (células ausentes = -inf)"""
+    matriz = np.full((n_grupos, n_itens), -np.inf)
+    matriz[codigos_grupo, codigos_item] = valores
+    return np.partition(matriz, n_itens - k, axis=1)[:, n_itens - k]
+
+
+def _limiares_esparsos(valores, codigos_grupo, codigos_item, n_grupos, n_itens, k):
+    """Seleção parcial no trecho de cada grupo (células agrupadas por radix sort dos códigos)"""
+    tipo = np.int16 if n_grupos <= np.iinfo(np.int16).max else np.int32
+    por_grupo = valores[np.argsort(codigos_grupo.astype(tipo), kind='stable')]
+    limites = np.r_[0, np.cumsum(np.bincount(codigos_grupo, minlength=n_grupos))]
+    limiar = np.full(n_grupos, -np.inf)
+    for grupo in np.flatnonzero(np.diff(limites) > k):
+        trecho = por_grupo[limites[grupo]:limites[grupo + 1]]
+        limiar[grupo] = np.partition(trecho, len(trecho) - k)[len(trecho) - k]
+    return limiar
+
+
+def top_k_por_grupo(df, grupo, item, metrica, k=3):
+    """Os k itens de maior soma da métrica em cada grupo
+
+    Retorna uma linha por (grupo, posição), com colunas grupo, 'Posicao', item e
+    métrica, ordenadas por grupo e posição.
+    """
+    somas = df.groupby([grupo, item], sort=False, observed=True)[metrica].sum()
+    codigos_grupo, grupos = pd.factorize(somas.index.get_level_values(0), sort=True)
+    codigos_item, itens = pd.factorize(somas.index.get_level_values(1), sort=True)
+    valores = somas.to_numpy()
+    n_grupos, n_itens = len(grupos), len(itens)
+
+    if not 0 < k < n_itens:
+        candidatos = np.arange(len(valores))
+    else:
+        # k-ésimo maior valor de cada grupo; ficam só as células acima dele (e os empates)
+        limiar = (_limiares_densos if n_grupos * n_itens <= LIMITE_CELULAS_DENSAS
+                  else _limiares_esparsos)(valores, codigos_grupo, codigos_item, n_grupos, n_itens, k)
+        candidatos = np.flatnonzero(valores >= limiar[codigos_grupo])
+
+    # Só os candidatos são ordenados: grupo, valor decrescente, item
+    ordem = candidatos[np.lexsort((codigos_item[candidatos], -valores[candidatos], codigos_grupo[candidatos]))]
+    grupo_ordenado = codigos_grupo[ordem]
+    inicios = np.r_[0, np.flatnonzero(np.diff(grupo_ordenado)) + 1]
+    posicao = np.arange(len(ordem)) - np.repeat(inicios, np.diff(np.r_[inicios, len(ordem)])) + 1
+    ordem, posicao = ordem[posicao <= k], posicao[posicao <= k]
+    return pd.DataFrame({grupo: grupos[codigos_grupo[ordem]], 'Posicao': posicao,
+                         item: itens[codigos_item[ordem]], metrica: valores[ordem]})
+
+
+def campeoes_por_grupo(df, grupo, item, metrica):
+    """Item de maior soma da métrica em cada grupo (linhas indexadas pelo grupo)"""
+    return top_k_por_grupo(df, grupo, item, metrica, k=1).set_index(grupo)[[item, metrica]]
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+🗂️ RELATÓRIOS POR REGIÃO / VENDEDOR EM PARALELO
+===============================================
+
+Gera uma versão do relatório do DashboardCompleto e do resumo executivo de
+previsões financeiras para cada valor de uma dimensão (ex.: cada região),
+sem reler o CSV nem copiar a base inteira para cada tarefa:
+
+- o quadro é ordenado pela dimensão uma única vez; cada valor vira um
+  intervalo [início, fim) de linhas contíguas
+- as colunas vão para memória compartilhada (multiprocessing.shared_memory);
+  textos como códigos de categoria; nomes dos blocos e categorias vão uma vez
+  para cada processo (initializer do pool), não a cada tarefa
+- cada processo anexa os blocos e monta só o seu recorte
+- progresso a cada tarefa concluída e tempo limite por tarefa (SIGALRM no
+  processo auxiliar; sem esse sinal, como no Windows, não há limite)
+
+Saída: output/relatorios/<Dimensao>=<valor>/ com imagens/, index_dashboard.html,
+resumo_previsoes_financeiras.txt e relatorio.log.
+
+Uso:
+    python relatorios_particionados.py --por Regiao --processos 4 --tempo-limite 600
+"""
+
+import contextlib
+import os
+import re
+import signal
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+DIMENSOES_PARTICAO = ['Regiao', 'Vendedor', 'Produto']
+RELATORIOS = ('dashboard', 'resumo')
+TEMPO_LIMITE = 600
+
+# Descritor dos blocos compartilhados, recebido uma vez por processo auxiliar
+_descritor_processo = None
+
+
+class QuadroCompartilhado:
+    """Colunas de um DataFrame em blocos de memória compartilhada, anexáveis por outros processos"""
+
+    def __init__(self, df):
+        self.n_linhas = len(df)
+        self.blocos = []
+        self.colunas = {}
+        for nome in df.columns:
+            serie = df[nome]
+            categorias = None
+            if serie.dtype == object or isinstance(serie.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(serie):
+                codigos, categorias = pd.factorize(serie)
+                categorias = list(categorias)
+                if (codigos < 0).any():
+                    # Texto ausente (código -1) vira uma categoria própria, None, no fim da lista
+                    codigos = np.where(codigos < 0, len(categorias), codigos)
+                    categorias.append(None)
+                valores = codigos.astype(np.int32)
+            else:
+                valores = serie.to_numpy()
+            bloco = shared_memory.SharedMemory(create=True, size=max(valores.nbytes, 1))
+            np.ndarray(valores.shape, dtype=valores.dtype, buffer=bloco.buf)[:] = valores
+            self.blocos.append(bloco)
+            self.colunas[nome] = (bloco.name, valores.dtype.str, categorias)
+
+    def descritor(self):
+        """O que cada processo precisa para anexar os blocos (nomes, tipos e categorias)"""
+        return {'n_linhas': self.n_linhas, 'colunas': self.colunas}
+
+    def liberar(self):
+        for bloco in self.blocos:
+            bloco.close()
+            bloco.unlink()
+        self.blocos = []
+
+
+def _anexar(nome_bloco):
+    """Anexa um bloco existente sem assumir sua remoção (quem cria o bloco é quem o remove)"""
+    try:
+        return shared_memory.SharedMemory(name=nome_bloco, track=False)
+    except TypeError:
+        # Python < 3.13: o registro vai para o rastreador de recursos herdado do
+        # processo principal, que já conhece o bloco (o registro repetido não tem efeito)
+        return shared_memory.SharedMemory(name=nome_bloco)
+
+
+def recorte_compartilhado(descritor, inicio, fim):
+    """DataFrame com as linhas [inicio, fim) a partir dos blocos compartilhados"""
+    colunas, anexados = {}, []
+    try:
+        for nome, (nome_bloco, tipo, categorias) in descritor['colunas'].items():
+            bloco = _anexar(nome_bloco)
+            anexados.append(bloco)
+            valores = np.ndarray((descritor['n_linhas'],), dtype=np.dtype(tipo), buffer=bloco.buf)[inicio:fim]
+            if categorias is not None:
+                colunas[nome] = np.asarray(categorias, dtype=object)[valores]
+            else:
+                colunas[nome] = valores.copy()
+        return pd.DataFrame(colunas)
+    finally:
+        for bloco in anexados:
+            bloco.close()
+
+
+def particionar(df, dimensao):
+    """Quadro ordenado pela dimensão e o intervalo de linhas de cada valor"""
+    if dimensao not in df.columns:
+        raise ValueError(f"Dimensão desconhecida: {dimensao}. Use uma de {DIMENSOES_PARTICAO}")
+    ordenado = df.sort_values(dimensao, kind='stable').reset_index(drop=True)
+    valores, inicios = np.unique(ordenado[dimensao].to_numpy(), return_index=True)
+    fins = np.append(inicios[1:], len(ordenado))
+    return ordenado, {valor: (int(inicio), int(fim)) for valor, inicio, fim in zip(valores, inicios, fins)}
+
+
+def nome_diretorio(dimensao, valor):
+    """Diretório seguro para o recorte (ex.: Regiao=Sul)"""
+    return f"{dimensao}={re.sub(r'[^0-9A-Za-z_.-]+', '_', str(valor))}"
+
+
+def _iniciar_processo(descritor):
+    """Initializer do pool: guarda o descritor (categorias já como arrays) para as tarefas do processo"""
+    global _descritor_processo
+    _descritor_processo = {
+        'n_linhas': descritor['n_linhas'],
+        'colunas': {nome: (nome_bloco, tipo, None if categorias is None else np.asarray(categorias, dtype=object))
+                    for nome, (nome_bloco, tipo, categorias) in descritor['colunas'].items()},
+    }
+
+
+def _estourou_tempo(signum, frame):
+    raise TimeoutError("tempo limite da tarefa excedido")
+
+
+def _gerar_relatorio(dimensao, valor, inicio, fim, diretorio, relatorios, tempo_limite):
+    """Tarefa de um processo auxiliar: monta o recorte e gera os relatórios em `diretorio`"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+    usa_alarme = bool(tempo_limite) and hasattr(signal, 'SIGALRM')
+    if usa_alarme:
+        signal.signal(signal.SIGALRM, _estourou_tempo)
+        signal.setitimer(signal.ITIMER_REAL, tempo_limite)
+
+    inicio_tarefa = time.perf_counter()
+    os.makedirs(diretorio, exist_ok=True)
+    try:
+        df = recorte_compartilhado(_descritor_processo, inicio, fim)
+        # Saída dos relatórios vai para arquivos do recorte, não para o terminal
+        with open(os.path.join(diretorio, 'relatorio.log'), 'w', encoding='utf-8') as log, \
+                contextlib.redirect_stdout(log):
+            if 'dashboard' in relatorios:
+                from dashboard_completo import DashboardCompleto
+                DashboardCompleto(df, modo_lote=True, diretorio_saida=diretorio).relatorio_visual_completo()
+            if 'resumo' in relatorios:
+                from resumo_previsoes_financeiras import gerar_resumo_executivo_financeiro
+                with open(os.path.join(diretorio, 'resumo_previsoes_financeiras.txt'), 'w', encoding='utf-8') as resumo, \
+                        contextlib.redirect_stdout(resumo):
+                    gerar_resumo_executivo_financeiro(df)
+        return valor, fim - inicio, time.perf_counter() - inicio_tarefa, None
+    except Exception as erro:
+        with open(os.path.join(diretorio, 'erro.txt'), 'w', encoding='utf-8') as f:
+            f.write(traceback.format_exc())
+        return valor, fim - inicio, time.perf_counter() - inicio_tarefa, f"{type(erro).__name__}: {erro}"
+    finally:
+        if usa_alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        # Figuras de uma tarefa interrompida não passam para a próxima
+        import matplotlib.pyplot as plt
+        plt.close('all')
+
+
+def gerar_relatorios_particionados(df, dimensao='Regiao', valores=None, processos=None,
+                                   tempo_limite=TEMPO_LIMITE, diretorio='output/relatorios',
+                                   relatorios=RELATORIOS):
+    """Gera os relatórios de cada valor da dimensão em um pool de processos
+
+    Retorna {valor: erro ou None}.
+    """
+    desconhecidos = set(relatorios) - set(RELATORIOS)
+    if desconhecidos:
+        raise ValueError(f"Relatórios desconhecidos: {', '.join(sorted(desconhecidos))}. Use {list(RELATORIOS)}")
+
+    ordenado, intervalos = particionar(df, dimensao)
+    if valores is not None:
+        faltando = set(valores) - set(intervalos)
+        if faltando:
+            raise ValueError(f"Valores sem dados em {dimensao}: {', '.join(sorted(map(str, faltando)))}")
+        intervalos = {valor: intervalos[valor] for valor in valores}
+
+    processos = min(processos or os.cpu_count() or 1, len(intervalos)) or 1
+    print(f"🗂️ {len(intervalos)} relatórios por {dimensao} ({len(ordenado):,} registros, {processos} processos)")
+
+    quadro = QuadroCompartilhado(ordenado)
+    resultados = {}
+    inicio_geral = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                                 initargs=(quadro.descritor(),)) as executor:
+            # Recortes maiores primeiro: o tempo total fica menos preso ao último
+            tarefas = {
+                executor.submit(_gerar_relatorio, dimensao, valor, inicio, fim,
+                                os.path.join(diretorio, nome_diretorio(dimensao, valor)),
+                                tuple(relatorios), tempo_limite): valor
+                for valor, (inicio, fim) in sorted(intervalos.items(), key=lambda item: item[1][0] - item[1][1])
+            }
+            for concluidas, futuro in enumerate(as_completed(tarefas), start=1):
+                valor, n_linhas, segundos, erro = futuro.result()
+                resultados[valor] = erro
+                print(f"   [{concluidas}/{len(tarefas)}] {'❌' if erro else '✅'} {dimensao}={valor} "
+                      f"({n_linhas:,} registros, {segundos:.1f}s)" + (f" - {erro}" if erro else ""))
+    finally:
+        quadro.liberar()
+
+    falhas = sum(1 for erro in resultados.values() if erro)
+    print(f"✅ {len(resultados) - falhas} relatórios gerados em {time.perf_counter() - inicio_geral:.1f}s"
+          + (f" | ❌ {falhas} com erro (ver erro.txt em cada pasta)" if falhas else ""))
+    print(f"📁 {diretorio}/")
+    return resultados
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script; os processos auxiliares reimportam o módulo)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+    from dataset_particionado import adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    parser = argparse.ArgumentParser(description="Relatórios por região/vendedor em paralelo")
+    parser.add_argument('--por', choices=DIMENSOES_PARTICAO, default='Regiao',
+                        help="Dimensão que define os recortes (padrão: Regiao)")
+    parser.add_argument('--valores', nargs='+', help="Gera só estes valores da dimensão")
+    parser.add_argument('--processos', type=int, help="Número de processos (padrão: número de CPUs)")
+    parser.add_argument('--tempo-limite', type=float, default=TEMPO_LIMITE,
+                        help=f"Tempo máximo por relatório, em segundos (padrão: {TEMPO_LIMITE}; 0 = sem limite)")
+    parser.add_argument('--relatorios', nargs='+', choices=RELATORIOS, default=list(RELATORIOS),
+                        help="Relatórios gerados para cada recorte")
+    parser.add_argument('--saida', default='output/relatorios', help="Diretório de saída")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
+    df = carregar_vendas_argumentos(args)
+
+    gerar_relatorios_particionados(df, dimensao=args.por, valores=args.valores, processos=args.processos,
+                                   tempo_limite=args.tempo_limite, diretorio=args.saida,
+                                   relatorios=args.relatorios)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ Data: 30/10/2025
 
 import pandas as pd
 from analise_predicao_vendas import AnalisePredicaoVendas
+from moeda import esta_em_centavos, formatar_reais, reais, total_centavos
 from datetime import datetime
 import sys
 import os
@@ -20,8 +21,8 @@ import os
 if sys.platform == "win32":
     os.system("chcp 65001 > nul")
 
-def gerar_resumo_executivo_financeiro():
-    """Gera resumo executivo das previsões financeiras"""
+def gerar_resumo_executivo_financeiro(df=None):
+    """Gera resumo executivo das previsões financeiras (dos dados informados ou de datasets/vendas.csv)"""
     print("=" * 80)
     print("💰 RESUMO EXECUTIVO - PREVISÕES FINANCEIRAS 2025")
     print("=" * 80)
@@ -29,7 +30,8 @@ def gerar_resumo_executivo_financeiro():
     print()
     
     # Carregar dados
-    df = pd.read_csv('datasets/vendas.csv')
+    if df is None:
+        df = pd.read_csv('datasets/vendas.csv')
     analise = AnalisePredicaoVendas(df)
     
     # Executar análise (silencioso)
@@ -58,33 +60,34 @@ def gerar_resumo_executivo_financeiro():
     print(f"🏷️  Total de produtos: {df['Produto'].nunique()}")
     print(f"👥 Total de vendedores: {df['Vendedor'].nunique()}")
     print(f"📦 Total vendido histórico: {df['Qtd_Vendida'].sum():,} unidades")
-    print(f"💰 Receita histórica total: R$ {df['Receita'].sum():,.2f}")
-    print(f"💚 Lucro histórico total: R$ {df['Lucro'].sum():,.2f}")
-    margem_historica = (df['Lucro'].sum() / df['Receita'].sum()) * 100
+    # Totais em centavos inteiros: fecham exatamente com o sistema de origem
+    receita_historica = total_centavos(df['Receita'], esta_em_centavos(df))
+    lucro_historico = total_centavos(df['Lucro'], esta_em_centavos(df))
+    custo_historico = receita_historica - lucro_historico
+    print(f"💰 Receita histórica total: {formatar_reais(receita_historica, centavos=True)}")
+    print(f"💚 Lucro histórico total: {formatar_reais(lucro_historico, centavos=True)}")
+    margem_historica = (lucro_historico / receita_historica) * 100
     print(f"📊 Margem histórica média: {margem_historica:.1f}%")
     print()
     
     print("🎯 PRINCIPAIS INSIGHTS FINANCEIROS 2025")
     print("-" * 50)
     
-    # Calcular totais previstos
-    total_receita_prevista = sum([p['receita_prevista'] for p in previsoes_financeiras.values()])
-    total_custo_previsto = sum([p['custo_previsto'] for p in previsoes_financeiras.values()])
-    total_lucro_previsto = sum([p['lucro_previsto'] for p in previsoes_financeiras.values()])
+    # Totais previstos: soma exata dos valores por produto arredondados ao centavo
+    # (o total fecha com a soma das linhas do ranking)
+    total_receita_prevista = total_centavos(previsoes_financeiras['receita_prevista'])
+    total_custo_previsto = total_centavos(previsoes_financeiras['custo_previsto'])
+    total_lucro_previsto = total_centavos(previsoes_financeiras['lucro_previsto'])
     margem_prevista = (total_lucro_previsto / total_receita_prevista) * 100
     
     # Variações
-    receita_historica = df['Receita'].sum()
-    lucro_historico = df['Lucro'].sum()
-    custo_historico = receita_historica - lucro_historico
-    
     var_receita = ((total_receita_prevista - receita_historica) / receita_historica) * 100
     var_lucro = ((total_lucro_previsto - lucro_historico) / lucro_historico) * 100
     var_custo = ((total_custo_previsto - custo_historico) / custo_historico) * 100
     
-    print(f"💰 Receita prevista 2025: R$ {total_receita_prevista:,.2f} ({var_receita:+.1f}%)")
-    print(f"💸 Custo previsto 2025: R$ {total_custo_previsto:,.2f} ({var_custo:+.1f}%)")
-    print(f"💚 Lucro previsto 2025: R$ {total_lucro_previsto:,.2f} ({var_lucro:+.1f}%)")
+    print(f"💰 Receita prevista 2025: {formatar_reais(total_receita_prevista, centavos=True)} ({var_receita:+.1f}%)")
+    print(f"💸 Custo previsto 2025: {formatar_reais(total_custo_previsto, centavos=True)} ({var_custo:+.1f}%)")
+    print(f"💚 Lucro previsto 2025: {formatar_reais(total_lucro_previsto, centavos=True)} ({var_lucro:+.1f}%)")
     print(f"📊 Margem prevista 2025: {margem_prevista:.1f}% (atual: {margem_historica:.1f}%)")
     print()
     
@@ -92,10 +95,9 @@ def gerar_resumo_executivo_financeiro():
     print("-" * 50)
     
     # Ordenar produtos por lucro previsto
-    produtos_ordenados = sorted(previsoes_financeiras.items(), 
-                               key=lambda x: x[1]['lucro_previsto'], reverse=True)
+    produtos_ordenados = previsoes_financeiras.sort_values('lucro_previsto', ascending=False)
     
-    for i, (produto, dados) in enumerate(produtos_ordenados, 1):
+    for i, (produto, dados) in enumerate(produtos_ordenados.iterrows(), 1):
         trend_icon = "📈" if dados['tendencia'] == 'CRESCIMENTO' else "📊" if dados['tendencia'] == 'ESTÁVEL' else "📉"
         
         print(f"{i}. {produto.upper()} {trend_icon}")
@@ -110,42 +112,37 @@ def gerar_resumo_executivo_financeiro():
     print("-" * 50)
     
     # Produto mais lucrativo
-    produto_top = produtos_ordenados[0]
-    print(f"🥇 Produto mais lucrativo: {produto_top[0]}")
-    print(f"   💡 Representa {(produto_top[1]['lucro_previsto']/total_lucro_previsto)*100:.1f}% do lucro total previsto")
+    produto_top = produtos_ordenados.index[0]
+    print(f"🥇 Produto mais lucrativo: {produto_top}")
+    print(f"   💡 Representa {(produtos_ordenados['lucro_previsto'].iloc[0]/reais(total_lucro_previsto))*100:.1f}% do lucro total previsto")
     
     # Produto com melhor margem
-    produto_melhor_margem = max(previsoes_financeiras.items(), 
-                               key=lambda x: x[1]['margem_prevista_%'])
-    print(f"📊 Melhor margem prevista: {produto_melhor_margem[0]} ({produto_melhor_margem[1]['margem_prevista_%']:.1f}%)")
+    produto_melhor_margem = previsoes_financeiras['margem_prevista_%'].idxmax()
+    print(f"📊 Melhor margem prevista: {produto_melhor_margem} ({previsoes_financeiras.at[produto_melhor_margem, 'margem_prevista_%']:.1f}%)")
     
     # Produto em maior crescimento
-    produtos_crescimento = [p for p in previsoes_financeiras.items() 
-                           if p[1]['tendencia'] == 'CRESCIMENTO']
-    if produtos_crescimento:
-        produto_crescimento = max(produtos_crescimento, 
-                                 key=lambda x: x[1]['variacao_lucro_%'])
-        print(f"🚀 Maior crescimento previsto: {produto_crescimento[0]} (+{produto_crescimento[1]['variacao_lucro_%']:.1f}%)")
+    produtos_crescimento = previsoes_financeiras[previsoes_financeiras['tendencia'] == 'CRESCIMENTO']
+    if not produtos_crescimento.empty:
+        produto_crescimento = produtos_crescimento['variacao_lucro_%'].idxmax()
+        print(f"🚀 Maior crescimento previsto: {produto_crescimento} (+{produtos_crescimento.at[produto_crescimento, 'variacao_lucro_%']:.1f}%)")
     
     print()
     print("⚠️  PONTOS DE ATENÇÃO")
     print("-" * 50)
     
     # Produtos com margem baixa
-    produtos_margem_baixa = [p for p in previsoes_financeiras.items() 
-                            if p[1]['margem_prevista_%'] < 30]
-    if produtos_margem_baixa:
+    produtos_margem_baixa = previsoes_financeiras.loc[previsoes_financeiras['margem_prevista_%'] < 30, 'margem_prevista_%']
+    if not produtos_margem_baixa.empty:
         print("📉 Produtos com margem abaixo de 30%:")
-        for produto, dados in produtos_margem_baixa:
-            print(f"   • {produto}: {dados['margem_prevista_%']:.1f}%")
+        for produto, margem in produtos_margem_baixa.items():
+            print(f"   • {produto}: {margem:.1f}%")
     
     # Produtos em queda
-    produtos_queda = [p for p in previsoes_financeiras.items() 
-                     if p[1]['variacao_lucro_%'] < 0]
-    if produtos_queda:
+    produtos_queda = previsoes_financeiras.loc[previsoes_financeiras['variacao_lucro_%'] < 0, 'variacao_lucro_%']
+    if not produtos_queda.empty:
         print("⚠️  Produtos com queda no lucro prevista:")
-        for produto, dados in produtos_queda:
-            print(f"   • {produto}: {dados['variacao_lucro_%']:+.1f}%")
+        for produto, variacao in produtos_queda.items():
+            print(f"   • {produto}: {variacao:+.1f}%")
     
     print()
     print("💡 RECOMENDAÇÕES ESTRATÉGICAS")
@@ -162,5 +159,16 @@ def gerar_resumo_executivo_financeiro():
     print("💾 Para visualizações completas, execute: python dashboard_completo.py")
     print("=" * 80)
 
+def main():
+    """Função principal"""
+    import argparse
+    from dataset_particionado import adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    parser = argparse.ArgumentParser(description="Resumo executivo das previsões financeiras 2025")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
+    gerar_resumo_executivo_financeiro(carregar_vendas_argumentos(args))
+
 if __name__ == "__main__":
-    gerar_resumo_executivo_financeiro()
\ No newline at end of file
+    main()
\ No newline at end of file
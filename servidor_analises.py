@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+🔥 SERVIDOR DE ANÁLISES SEMPRE AQUECIDO
+=======================================
+
+Processo de longa duração que mantém carregados pandas/plotly/matplotlib, os
+dados já preparados (preparar_dados), o índice invertido (indice_vendas) e o
+cubo de somas acumuladas do dashboard (servidor_dashboard), e atende tarefas
+de um cliente fino (cliente_analises.py) por socket Unix ou por localhost:
+
+- cada pedido é uma linha JSON {"tarefa": ..., "filtros": {...}, ...}; a
+  resposta é uma linha JSON com o texto, o arquivo gerado e o tempo gasto
+- tarefas: resumo, previsao, ranking, grafico (HTML plotly em output/daemon/),
+  status, recarregar e parar
+- respostas ficam em cache LRU por (tarefa, parâmetros); o CSV é relido
+  sozinho quando muda (tamanho ou data de modificação)
+- uma tarefa por vez (a saída dos relatórios é capturada do stdout); conexões
+  que não mandam o pedido em TEMPO_LIMITE_CONEXAO segundos são descartadas
+
+Uso:
+    python servidor_analises.py                         # socket Unix em output/daemon/analises.sock
+    python servidor_analises.py --porta 8765            # localhost (Windows)
+    python cliente_analises.py resumo --regiao Sul
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+
+import pandas as pd
+
+from analise_predicao_vendas import AnalisePredicaoVendas
+from analise_vendas import gerar_resumo_estatisticas, preparar_dados
+from cubo_vendas import FILTROS_DIMENSAO
+from diretorios import garantir_diretorio
+from indice_vendas import IndiceVendas
+from moeda import COLUNAS_MONETARIAS, formatar_reais
+from ranking_vendas import top_k
+from servidor_dashboard import CacheLRU, DashboardServidor
+
+SOCKET_PADRAO = 'output/daemon/analises.sock'
+PORTA_PADRAO = 8765
+DIRETORIO_SAIDA = 'output/daemon'
+TAREFAS = ('resumo', 'previsao', 'ranking', 'grafico', 'status', 'recarregar', 'parar')
+TEMPO_LIMITE_CONEXAO = 5  # segundos para o cliente mandar o pedido (o servidor atende um por vez)
+
+
+class ServicoAnalises:
+    """Dados preparados, índice, cubo e cache de respostas mantidos entre os pedidos"""
+
+    def __init__(self, caminho_dados='datasets/vendas.csv', capacidade_cache=256):
+        self.caminho_dados = caminho_dados
+        self.cache = CacheLRU(capacidade_cache)
+        self.painel = None
+        self.inicio = time.time()
+        self.n_pedidos = 0
+        self.carregar_dados()
+
+    def carregar_dados(self):
+        """Lê e prepara o dataset, monta índice e cubo e limpa o cache"""
+        estado = os.stat(self.caminho_dados)
+        self.versao_dados = (estado.st_size, estado.st_mtime_ns)
+        self.df = preparar_dados(pd.read_csv(self.caminho_dados))
+        self.indice = IndiceVendas.de_dataframe(self.df)
+        if self.painel is None:
+            self.painel = DashboardServidor(self.caminho_dados)
+        else:
+            self.painel.carregar_dados()
+        self.cache.limpar()
+
+    def _verificar_dados(self):
+        """Relê o CSV se ele mudou desde a última carga"""
+        estado = os.stat(self.caminho_dados)
+        if (estado.st_size, estado.st_mtime_ns) != self.versao_dados:
+            self.carregar_dados()
+
+    def normalizar_filtros(self, filtros):
+        """Filtros canônicos (de/ate como AAAA-MM, dimensões como tuplas ordenadas)"""
+        desconhecidos = set(filtros or {}) - {'de', 'ate'} - set(FILTROS_DIMENSAO)
+        if desconhecidos:
+            raise ValueError(f"Filtro desconhecido: {', '.join(sorted(desconhecidos))}")
+        parametros = {chave: valor if isinstance(valor, list) else [valor]
+                      for chave, valor in (filtros or {}).items() if valor}
+        return self.painel.normalizar_filtros(parametros)
+
+    def recorte(self, filtros):
+        """Linhas do recorte pelo índice invertido (o quadro todo sem filtros)"""
+        if not filtros:
+            return self.df
+        recorte = self.indice.fatiar(self.df, **filtros)
+        if not len(recorte):
+            raise ValueError("Nenhum registro para os filtros informados")
+        return recorte
+
+    @staticmethod
+    def _capturar(funcao, *argumentos):
+        """Texto que a função imprime"""
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            funcao(*argumentos)
+        return saida.getvalue()
+
+    def resumo(self, filtros, **_):
+        return {'saida': self._capturar(gerar_resumo_estatisticas, self.recorte(filtros))}
+
+    def previsao(self, filtros, **_):
+        analise = AnalisePredicaoVendas(self.recorte(filtros))
+
+        def prever():
+            analise.previsao_inteligente_produto()
+            analise.previsao_inteligente_vendedores()
+        return {'saida': self._capturar(prever)}
+
+    def ranking(self, filtros, por='Produto', metrica='Receita', k=10, **_):
+        if not isinstance(k, int) or k < 1:
+            raise ValueError(f"k deve ser um inteiro >= 1 (recebido: {k})")
+        if metrica not in self.painel.cubo.metricas:
+            raise ValueError(f"Métrica desconhecida: {metrica}. Use uma de {self.painel.cubo.metricas}")
+        if por not in self.painel.cubo.valores_dimensao:
+            raise ValueError(f"Dimensão desconhecida: {por}. Use uma de {list(self.painel.cubo.valores_dimensao)}")
+        totais = top_k(self.painel.cubo.consultar(por=por, **filtros)[metrica], k)
+        formatar = formatar_reais if metrica in COLUNAS_MONETARIAS else (lambda valor: f"{valor:,.0f}")
+        linhas = [f"{i}. {nome}: {formatar(valor)}" for i, (nome, valor) in enumerate(totais.items(), 1)]
+        return {'saida': f"🏆 Top {k} {por} por {metrica}\n" + "\n".join(linhas) + "\n"}
+
+    def grafico(self, filtros, nome='heatmap', **_):
+        if nome not in self.painel.graficos:
+            raise ValueError(f"Gráfico desconhecido: {nome}. Use um de {list(self.painel.graficos)}")
+        sufixo = '_'.join(f"{chave}-{'+'.join(valor) if isinstance(valor, tuple) else valor}"
+                          for chave, valor in sorted(filtros.items()))
+        caminho = os.path.join(DIRETORIO_SAIDA, f"{nome}{'_' + sufixo if sufixo else ''}.html")
+        garantir_diretorio(caminho)
+        self.painel.graficos[nome](filtros).write_html(caminho, include_plotlyjs='cdn')
+        return {'saida': f"📊 {nome} gerado\n", 'arquivo': caminho}
+
+    def status(self, **_):
+        return {'saida': (f"✅ {len(self.df):,} registros de {self.caminho_dados} | "
+                          f"{self.painel.cubo.n_celulas:,} células no cubo\n"
+                          f"⏱️ No ar há {time.time() - self.inicio:,.0f}s | {self.n_pedidos:,} pedidos | "
+                          f"cache: {self.cache.acertos} acertos, {self.cache.falhas} falhas\n")}
+
+    def executar(self, pedido):
+        """Resposta (dict) de um pedido; respostas das tarefas de análise vêm do cache quando possível"""
+        inicio = time.perf_counter()
+        self.n_pedidos += 1
+        tarefa = pedido.get('tarefa')
+        if tarefa not in TAREFAS:
+            raise ValueError(f"Tarefa desconhecida: {tarefa}. Use uma de {TAREFAS}")
+
+        if tarefa == 'recarregar':
+            self.carregar_dados()
+            resposta = {'saida': f"🔄 {len(self.df):,} registros recarregados\n"}
+        elif tarefa in ('status', 'parar'):
+            resposta = self.status() if tarefa == 'status' else {'saida': "👋 Servidor encerrado\n"}
+        else:
+            self._verificar_dados()
+            filtros = self.normalizar_filtros(pedido.get('filtros'))
+            opcoes = {chave: valor for chave, valor in (pedido.get('opcoes') or {}).items() if valor is not None}
+            chave = (tarefa, tuple(sorted(filtros.items())), tuple(sorted(opcoes.items())))
+            resposta = self.cache.obter(chave)
+            if resposta is None:
+                resposta = getattr(self, tarefa)(filtros, **opcoes)
+                self.cache.guardar(chave, resposta)
+        return {'ok': True, **resposta, 'tempo_ms': (time.perf_counter() - inicio) * 1000}
+
+
+class ManipuladorAnalises(socketserver.StreamRequestHandler):
+    """Uma linha JSON de pedido, uma linha JSON de resposta"""
+
+    # Um cliente que conecta e não manda o pedido não pode travar o servidor
+    timeout = TEMPO_LIMITE_CONEXAO
+
+    def handle(self):
+        try:
+            linha = self.rfile.readline()
+        except (socket.timeout, ConnectionResetError):
+            return
+        if not linha.strip():
+            return
+        try:
+            pedido = json.loads(linha)
+            resposta = self.server.servico.executar(pedido)
+        except (ValueError, TypeError) as erro:
+            pedido, resposta = {}, {'ok': False, 'erro': str(erro)}
+        except Exception as erro:  # o servidor continua no ar
+            pedido, resposta = {}, {'ok': False, 'erro': f"{type(erro).__name__}: {erro}"}
+        try:
+            self.wfile.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b'\n')
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            pass  # o cliente desistiu; a resposta fica no cache
+        if pedido.get('tarefa') == 'parar':
+            self.server.encerrar = True
+
+
+def criar_servidor(servico, caminho_socket=SOCKET_PADRAO, porta=None):
+    """Servidor em socket Unix (padrão) ou em 127.0.0.1:porta (porta=0 escolhe uma livre)
+
+    Recusa (FileExistsError) um socket Unix em que outro servidor ainda atende;
+    só o arquivo órfão de uma execução anterior é removido.
+    """
+    if porta is not None or not hasattr(socket, 'AF_UNIX'):
+        servidor = socketserver.TCPServer(('127.0.0.1', PORTA_PADRAO if porta is None else porta),
+                                          ManipuladorAnalises)
+    else:
+        garantir_diretorio(caminho_socket)
+        if os.path.exists(caminho_socket):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as teste:
+                try:
+                    teste.connect(caminho_socket)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    os.remove(caminho_socket)  # socket órfão de uma execução anterior
+                else:
+                    raise FileExistsError(f"Já há um servidor de análises atendendo em {caminho_socket}")
+        servidor = socketserver.UnixStreamServer(caminho_socket, ManipuladorAnalises)
+        os.chmod(caminho_socket, 0o600)
+    servidor.servico = servico
+    servidor.encerrar = False
+    return servidor
+
+
+def main():
+    """Função principal"""
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor de análises sempre aquecido (dados e bibliotecas em memória)")
+    parser.add_argument('--dados', default='datasets/vendas.csv')
+    parser.add_argument('--socket', default=SOCKET_PADRAO, help=f"Socket Unix (padrão: {SOCKET_PADRAO})")
+    parser.add_argument('--porta', type=int, help="Atende em 127.0.0.1:PORTA em vez do socket Unix")
+    parser.add_argument('--cache', type=int, default=256, help="Capacidade do cache LRU de respostas")
+    args = parser.parse_args()
+
+    print("🔥 SERVIDOR DE ANÁLISES")
+    print("=" * 60)
+    try:
+        servico = ServicoAnalises(args.dados, args.cache)
+    except FileNotFoundError:
+        print(f"❌ Erro: Arquivo {args.dados} não encontrado!")
+        return
+    print(f"✅ Dados carregados: {len(servico.df):,} registros")
+
+    try:
+        servidor = criar_servidor(servico, args.socket, args.porta)
+    except FileExistsError as erro:
+        print(f"❌ Erro: {erro}")
+        return
+    endereco = (f"127.0.0.1:{servidor.server_address[1]}" if isinstance(servidor.server_address, tuple)
+                else servidor.server_address)
+    print(f"🚀 Aguardando tarefas em {endereco} (Ctrl+C ou 'cliente_analises.py parar' para encerrar)")
+    try:
+        while not servidor.encerrar:
+            servidor.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if not isinstance(servidor.server_address, tuple) and os.path.exists(args.socket):
+            os.remove(args.socket)
+    print("\n👋 Servidor encerrado")
+
+
+if __name__ == "__main__":
+    main()
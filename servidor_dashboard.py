@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+🌐 SERVIDOR LOCAL DO DASHBOARD
+==============================
+
+Servidor HTTP local (somente biblioteca padrão) que mantém em memória os dados
+preparados e o cubo de somas acumuladas (cubo_vendas.CuboVendas), e entrega o
+JSON das figuras plotly sob demanda, com filtros por período, região, produto e
+vendedor respondidos em O(células) sem varrer as linhas.
+
+Endpoints:
+- GET /                      página com filtros e gráficos
+- GET /api/graficos          lista de gráficos disponíveis
+- GET /api/grafico/<nome>    figura plotly em JSON (?de=2023-01&ate=2023-12&regiao=Sul)
+- GET /api/resumo            totais do recorte filtrado
+- POST /api/recarregar       relê o dataset e limpa o cache
+
+Respostas têm ETag (304 quando o cliente já tem a versão) e gzip quando aceito.
+
+Uso:
+    python servidor_dashboard.py --porta 8050
+"""
+
+import gzip
+import hashlib
+import html
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.express as px
+from plotly.subplots import make_subplots
+from cubo_vendas import CuboVendas, FILTROS_DIMENSAO
+from figuras_compactas import para_json_compacto
+import sys
+import os
+
+
+class CacheLRU:
+    """Cache LRU thread-safe de respostas já serializadas"""
+
+    def __init__(self, capacidade=128):
+        self.capacidade = capacidade
+        self.itens = OrderedDict()
+        self.trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave):
+        with self.trava:
+            if chave in self.itens:
+                self.itens.move_to_end(chave)
+                self.acertos += 1
+                return self.itens[chave]
+            self.falhas += 1
+            return None
+
+    def guardar(self, chave, valor):
+        with self.trava:
+            self.itens[chave] = valor
+            self.itens.move_to_end(chave)
+            while len(self.itens) > self.capacidade:
+                self.itens.popitem(last=False)
+
+    def limpar(self):
+        with self.trava:
+            self.itens.clear()
+
+
+class DashboardServidor:
+    def __init__(self, caminho_dados='datasets/vendas.csv', capacidade_cache=128):
+        self.caminho_dados = caminho_dados
+        self.cache = CacheLRU(capacidade_cache)
+        self.versao = 0
+        self.graficos = {
+            'temporal': self.grafico_temporal,
+            'produtos': self.grafico_produtos,
+            'vendedores': self.grafico_vendedores,
+            'regioes': self.grafico_regioes,
+            'heatmap': self.grafico_heatmap,
+        }
+        self.carregar_dados()
+
+    def carregar_dados(self):
+        """Lê o dataset e monta o cubo de somas acumuladas em memória"""
+        df = pd.read_csv(self.caminho_dados)
+        df['Data'] = pd.to_datetime(df['Data'])
+        self.n_registros = len(df)
+        self.cubo = CuboVendas.de_dataframe(df, centavos=True)
+        # A versão entra na chave do cache e muda depois da troca do cubo: uma resposta
+        # do cubo anterior ainda em cálculo fica sob a versão antiga e não é mais servida
+        self.versao += 1
+        self.cache.limpar()
+
+    def normalizar_filtros(self, parametros):
+        """Converte a query string em filtros canônicos (chave de cache estável)"""
+        filtros = {}
+        for chave in ('de', 'ate'):
+            if parametros.get(chave):
+                filtros[chave] = str(pd.Period(parametros[chave][0], freq='M'))
+        for chave in FILTROS_DIMENSAO:
+            if parametros.get(chave):
+                valores = sorted({v for valor in parametros[chave] for v in valor.split(',') if v})
+                if valores:
+                    filtros[chave] = tuple(valores)
+        return filtros
+
+    def grafico_temporal(self, filtros):
+        """Evolução mensal de quantidade e receita"""
+        mensal = self.cubo.serie_mensal(**filtros).reset_index()
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig.add_trace(go.Scatter(x=mensal['Data_Str'], y=mensal['Qtd_Vendida'],
+                                 mode='lines+markers', name='Quantidade', line=dict(color='blue')))
+        fig.add_trace(go.Scatter(x=mensal['Data_Str'], y=mensal['Receita'],
+                                 mode='lines+markers', name='Receita', line=dict(color='red')),
+                      secondary_y=True)
+        fig.update_layout(title_text="📅 Evolução Mensal", title_x=0.5)
+        fig.update_yaxes(title_text="Quantidade", secondary_y=False)
+        fig.update_yaxes(title_text="Receita (R$)", secondary_y=True)
+        return fig
+
+    def grafico_produtos(self, filtros):
+        """Quantidade, receita e lucro por produto"""
+        produtos = self.cubo.consultar(por='Produto', **filtros).reset_index()
+        fig = go.Figure()
+        cores = px.colors.qualitative.Set3
+        for i, metrica in enumerate(['Receita', 'Lucro']):
+            fig.add_trace(go.Bar(x=produtos['Produto'], y=produtos[metrica], name=metrica,
+                                 marker_color=cores[i + 1],
+                                 hovertemplate='<b>%{x}</b><br>' + metrica + ': R$ %{y:,.0f}<extra></extra>'))
+        fig.update_layout(title_text="🏆 Receita e Lucro por Produto", title_x=0.5, barmode='group')
+        return fig
+
+    def grafico_vendedores(self, filtros):
+        """Performance por vendedor"""
+        vendedores = self.cubo.consultar(por='Vendedor', **filtros).reset_index()
+        fig = go.Figure(go.Bar(x=vendedores['Vendedor'], y=vendedores['Qtd_Vendida'],
+                               marker_color=px.colors.qualitative.Pastel,
+                               texttemplate='%{y:,.0f}', textposition='outside'))
+        fig.update_layout(title_text="👥 Quantidade por Vendedor", title_x=0.5)
+        return fig
+
+    def grafico_regioes(self, filtros):
+        """Distribuição das vendas por região"""
+        regioes = self.cubo.consultar(por='Regiao', **filtros)['Qtd_Vendida']
+        fig = go.Figure(go.Pie(values=regioes.values, labels=regioes.index))
+        fig.update_layout(title_text="🗺️ Vendas por Região", title_x=0.5)
+        return fig
+
+    def grafico_heatmap(self, filtros):
+        """Heatmap vendedor × produto"""
+        pivot = self.cubo.matriz('Vendedor', 'Produto', 'Qtd_Vendida', **filtros)
+        fig = go.Figure(go.Heatmap(z=pivot.values, x=pivot.columns, y=pivot.index,
+                                   colorscale='Viridis', texttemplate="%{z:,.0f}"))
+        fig.update_layout(title_text="🔥 Heatmap: Vendedor × Produto", title_x=0.5)
+        return fig
+
+    def resumo(self, filtros):
+        """Totais do recorte filtrado"""
+        totais = self.cubo.consultar(**filtros)
+        receita = totais['Receita']
+        lucro = totais['Lucro']
+        return {
+            'qtd_vendida': int(round(totais['Qtd_Vendida'])),
+            'receita': float(receita),
+            'lucro': float(lucro),
+            'margem_%': float(lucro / receita * 100) if receita else 0.0,
+            'filtros': {chave: list(valor) if isinstance(valor, tuple) else valor
+                        for chave, valor in filtros.items()},
+        }
+
+    def responder(self, nome, filtros):
+        """Corpo JSON + ETag de um gráfico ou resumo, via cache LRU por (versão dos dados, gráfico, filtros)"""
+        chave = (self.versao, nome, tuple(sorted(filtros.items())))
+        resposta = self.cache.obter(chave)
+        if resposta is None:
+            if nome == 'resumo':
+                corpo = json.dumps(self.resumo(filtros), ensure_ascii=False).encode('utf-8')
+            else:
+                corpo = para_json_compacto(self.graficos[nome](filtros)).encode('utf-8')
+            etag = '"' + hashlib.sha1(corpo).hexdigest() + '"'
+            resposta = (corpo, gzip.compress(corpo, compresslevel=6), etag)
+            self.cache.guardar(chave, resposta)
+        return resposta
+
+    def pagina_inicial(self):
+        """Página HTML com filtros que consome a API"""
+        meses = self.cubo.meses.astype(str)
+        opcoes = {chave: list(self.cubo.valores_dimensao[coluna]) for chave, coluna in FILTROS_DIMENSAO.items()}
+        seletores = ''.join(
+            f'<label>{chave.capitalize()} <select id="{chave}"><option value="">Todos</option>'
+            + ''.join(f'<option value="{texto}">{texto}</option>'
+                      for texto in (html.escape(str(valor)) for valor in valores)) + '</select></label>'
+            for chave, valores in opcoes.items()
+        )
+        divs = ''.join(f'<div id="g-{nome}" class="grafico"></div>' for nome in self.graficos)
+        return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <title>📊 Dashboard de Vendas - Servidor Local</title>
+    <script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, sans-serif; margin: 20px; }}
+        .filtros label {{ margin-right: 15px; }}
+        .grafico {{ height: 450px; margin-top: 20px; }}
+        #resumo {{ margin-top: 15px; font-weight: bold; }}
+    </style>
+</head>
+<body>
+    <h1>📊 Dashboard de Vendas</h1>
+    <div class="filtros">
+        <label>De <input id="de" type="month" min="{meses[0]}" max="{meses[-1]}" value="{meses[0]}"></label>
+        <label>Até <input id="ate" type="month" min="{meses[0]}" max="{meses[-1]}" value="{meses[-1]}"></label>
+        {seletores}
+        <button onclick="atualizar()">Aplicar</button>
+    </div>
+    <div id="resumo"></div>
+    {divs}
+    <script>
+        const graficos = {json.dumps(list(self.graficos))};
+        function consulta() {{
+            const p = new URLSearchParams();
+            for (const id of ['de', 'ate', 'regiao', 'produto', 'vendedor']) {{
+                const v = document.getElementById(id).value;
+                if (v) p.set(id, v);
+            }}
+            return p.toString();
+        }}
+        async function atualizar() {{
+            const q = consulta();
+            const r = await (await fetch('/api/resumo?' + q)).json();
+            document.getElementById('resumo').textContent =
+                `Unidades: ${{r.qtd_vendida.toLocaleString('pt-BR')}} | ` +
+                `Receita: R$ ${{Math.round(r.receita).toLocaleString('pt-BR')}} | ` +
+                `Margem: ${{r['margem_%'].toFixed(1)}}%`;
+            for (const nome of graficos) {{
+                const fig = await (await fetch(`/api/grafico/${{nome}}?${{q}}`)).json();
+                Plotly.react('g-' + nome, fig.data, fig.layout, {{responsive: true}});
+            }}
+        }}
+        atualizar();
+    </script>
+</body>
+</html>"""
+
+
+class ManipuladorDashboard(BaseHTTPRequestHandler):
+    """Roteia as requisições HTTP para o DashboardServidor"""
+
+    def log_message(self, formato, *args):
+        pass
+
+    def enviar(self, status, corpo=b'', tipo='application/json; charset=utf-8',
+               corpo_gzip=None, etag=None):
+        usar_gzip = corpo_gzip is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        dados = corpo_gzip if usar_gzip else corpo
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if usar_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(dados)
+
+    def enviar_erro(self, status, mensagem):
+        corpo = json.dumps({'erro': mensagem}, ensure_ascii=False).encode('utf-8')
+        self.enviar(status, corpo)
+
+    def do_GET(self):
+        dashboard = self.server.dashboard
+        url = urlparse(self.path)
+        partes = [parte for parte in url.path.split('/') if parte]
+
+        if not partes:
+            corpo = dashboard.pagina_inicial().encode('utf-8')
+            self.enviar(200, corpo, 'text/html; charset=utf-8', gzip.compress(corpo))
+            return
+
+        if partes == ['api', 'graficos']:
+            self.enviar(200, json.dumps(list(dashboard.graficos)).encode('utf-8'))
+            return
+
+        if len(partes) >= 2 and partes[0] == 'api' and (partes[1] == 'resumo' or
+                                                       (partes[1] == 'grafico' and len(partes) == 3)):
+            nome = 'resumo' if partes[1] == 'resumo' else partes[2]
+            if nome != 'resumo' and nome not in dashboard.graficos:
+                self.enviar_erro(404, f"Gráfico desconhecido: {nome}")
+                return
+            try:
+                filtros = dashboard.normalizar_filtros(parse_qs(url.query))
+            except ValueError as erro:
+                self.enviar_erro(400, f"Filtro inválido: {erro}")
+                return
+
+            corpo, corpo_gzip, etag = dashboard.responder(nome, filtros)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.enviar(200, corpo, corpo_gzip=corpo_gzip, etag=etag)
+            return
+
+        self.enviar_erro(404, "Rota não encontrada")
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/') == '/api/recarregar':
+            self.server.dashboard.carregar_dados()
+            self.enviar(200, json.dumps({'status': 'recarregado'}).encode('utf-8'))
+            return
+        self.enviar_erro(404, "Rota não encontrada")
+
+
+def criar_servidor(dashboard, host='127.0.0.1', porta=8050):
+    """Cria o servidor HTTP (use porta=0 para escolher uma porta livre)"""
+    httpd = ThreadingHTTPServer((host, porta), ManipuladorDashboard)
+    httpd.daemon_threads = True
+    httpd.dashboard = dashboard
+    return httpd
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    # Configurar encoding UTF-8 para Windows (só ao rodar como script, não ao importar)
+    if sys.platform == "win32":
+        os.system("chcp 65001 > nul")
+
+    parser = argparse.ArgumentParser(description="Servidor local do dashboard de vendas")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8050)
+    parser.add_argument('--dados', default='datasets/vendas.csv')
+    parser.add_argument('--cache', type=int, default=128, help="Capacidade do cache LRU de respostas")
+    args = parser.parse_args()
+
+    print("🌐 SERVIDOR LOCAL DO DASHBOARD")
+    print("=" * 60)
+    dashboard = DashboardServidor(args.dados, args.cache)
+    print(f"✅ Dados carregados: {dashboard.n_registros:,} registros, {dashboard.cubo.n_celulas:,} células no cubo")
+
+    httpd = criar_servidor(dashboard, args.host, args.porta)
+    print(f"🚀 Acesse http://{args.host}:{httpd.server_address[1]}/ (Ctrl+C para encerrar)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado")
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,13 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.io as pio
+from cubo_vendas import CuboVendas
+from diretorios import garantir_diretorio
+from nivel_detalhe import NivelDetalhe
+from heatmap_escalavel import HeatmapEscalavel
+from agregados import obter_agregados
+from pacote_dashboard import PacoteDashboard
+from figuras_compactas import salvar_html_compacto
 from datetime import datetime
 import warnings
 import sys
@@ -19,17 +26,18 @@ warnings.filterwarnings('ignore')
 # Configurar tema
 pio.templates.default = "plotly_white"
 
-def garantir_diretorio(caminho_arquivo):
-    """Garante que o diretório do arquivo existe, criando se necessário"""
-    diretorio = os.path.dirname(caminho_arquivo)
-    if diretorio and not os.path.exists(diretorio):
-        os.makedirs(diretorio, exist_ok=True)
-        print(f"📁 Diretório criado: {diretorio}")
-
 class VisualizacaoInterativa:
-    def __init__(self, df):
+    def __init__(self, df, modo_lote=False, nivel_detalhe=None, heatmap=None):
         self.df = df.copy()
+        self.modo_lote = modo_lote
+        # Orçamentos de pontos: séries longas e muitos vendedores são reduzidos automaticamente
+        self.nivel_detalhe = nivel_detalhe or NivelDetalhe()
+        self.heatmap = heatmap or HeatmapEscalavel()
+        # Quando definido, as figuras vão para o pacote de página única em vez de HTMLs separados
+        self.pacote = None
         self.preparar_dados()
+        # Totais compartilhados por todos os gráficos (calculados uma única vez por conjunto de dados)
+        self.agregados = obter_agregados(self.df)
         
         # Configurar cores personalizadas
         self.cores_produtos = px.colors.qualitative.Set3
@@ -49,15 +57,49 @@ class VisualizacaoInterativa:
                    7: 'Jul', 8: 'Ago', 9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'}
         self.df['Mes_Nome'] = self.df['Mes'].map(meses_pt)
         self.df['Data_Str'] = self.df['Ano_Mes'].astype(str)
+        self._cubo = None
+
+    @property
+    def cubo(self):
+        """Cubo de somas acumuladas (montado na primeira consulta filtrada)"""
+        if self._cubo is None:
+            self._cubo = CuboVendas.de_dataframe(self.df)
+        return self._cubo
+
+    def consultar_filtrado(self, por=None, de=None, ate=None, regiao=None, produto=None, vendedor=None):
+        """Totais filtrados por período/região/produto/vendedor, agrupados opcionalmente por uma dimensão"""
+        return self.cubo.consultar(por=por, de=de, ate=ate, regiao=regiao, produto=produto, vendedor=vendedor)
+
+    def serie_filtrada(self, por=None, metrica=None, de=None, ate=None, regiao=None, produto=None, vendedor=None):
+        """Série mensal filtrada (indexada por Data_Str), pronta para os gráficos temporais"""
+        return self.cubo.serie_mensal(por=por, metrica=metrica, de=de, ate=ate,
+                                      regiao=regiao, produto=produto, vendedor=vendedor)
+    
+    def _finalizar_figura(self, fig, exibir=True):
+        """Exibe e retorna a figura; em modo lote descarta seus dados após gravar o HTML e retorna None"""
+        if self.modo_lote:
+            fig.data = ()
+            fig.layout = {}
+            return None
+        if exibir:
+            fig.show()
+        return fig
+    
+    def _salvar_figura(self, fig, caminho_arquivo, exibir=True):
+        """Grava o HTML da figura (ou a adiciona ao pacote de página única) e finaliza"""
+        if self.pacote is not None:
+            nome = os.path.splitext(os.path.basename(caminho_arquivo))[0]
+            self.pacote.adicionar_figura(nome, fig)
+            return self._finalizar_figura(fig, exibir=False)
+
+        # Arrays numéricos gravados como arrays tipados (bdata), não como listas em texto
+        salvar_html_compacto(fig, caminho_arquivo)
+        return self._finalizar_figura(fig, exibir)
     
     def grafico_produtos_interativo(self):
         """Gráfico interativo de produtos"""
         # Dados
-        produto_dados = self.df.groupby('Produto').agg({
-            'Qtd_Vendida': 'sum',
-            'Receita': 'sum',
-            'Lucro': 'sum'
-        }).reset_index()
+        produto_dados = self.agregados.por('Produto')[['Qtd_Vendida', 'Receita', 'Lucro']].reset_index()
         
         # Criar subplots
         fig = make_subplots(
@@ -71,7 +113,7 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=produto_dados['Produto'], y=produto_dados['Qtd_Vendida'],
                   name='Quantidade', marker_color=self.cores_produtos[0],
-                  text=produto_dados['Qtd_Vendida'], textposition='outside'),
+                  texttemplate='%{y:,.0f}', textposition='outside'),
             row=1, col=1
         )
         
@@ -79,7 +121,7 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=produto_dados['Produto'], y=produto_dados['Receita'],
                   name='Receita', marker_color=self.cores_produtos[1],
-                  text=[f'R$ {x:,.0f}' for x in produto_dados['Receita']], textposition='outside'),
+                  texttemplate='R$ %{y:,.0f}', textposition='outside'),
             row=1, col=2
         )
         
@@ -87,7 +129,7 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=produto_dados['Produto'], y=produto_dados['Lucro'],
                   name='Lucro', marker_color=self.cores_produtos[2],
-                  text=[f'R$ {x:,.0f}' for x in produto_dados['Lucro']], textposition='outside'),
+                  texttemplate='R$ %{y:,.0f}', textposition='outside'),
             row=2, col=1
         )
         
@@ -111,23 +153,17 @@ class VisualizacaoInterativa:
         
         # Salvar
         caminho_arquivo = "output/html_interativos/produtos_interativo.html"
-        garantir_diretorio(caminho_arquivo)
-        fig.write_html(caminho_arquivo)
-        fig.show()
-        
-        return fig
+        return self._salvar_figura(fig, caminho_arquivo)
     
     def grafico_vendedores_interativo(self):
         """Gráfico interativo de vendedores"""
         # Dados por vendedor
-        vendedor_dados = self.df.groupby('Vendedor').agg({
-            'Qtd_Vendida': 'sum',
-            'Receita': 'sum',
-            'Lucro': 'sum'
-        }).reset_index()
+        vendedor_dados = self.agregados.por('Vendedor')[['Qtd_Vendida', 'Receita', 'Lucro']].reset_index()
         
-        # Dados mensais por vendedor para linha do tempo
-        vendas_mensais = self.df.groupby(['Data_Str', 'Vendedor'])['Qtd_Vendida'].sum().reset_index()
+        # Dados mensais por vendedor para linha do tempo (top-N + "Outros" se houver muitos)
+        vendas_mensais = self.agregados.por('Data_Str', 'Vendedor')['Qtd_Vendida'].reset_index()
+        vendas_mensais = self.nivel_detalhe.top_n(vendas_mensais, 'Vendedor', 'Qtd_Vendida', por='Data_Str')
+        share_vendedores = self.nivel_detalhe.top_n(vendedor_dados, 'Vendedor', 'Qtd_Vendida')
         
         # Criar subplots
         fig = make_subplots(
@@ -141,15 +177,15 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=vendedor_dados['Vendedor'], y=vendedor_dados['Qtd_Vendida'],
                   name='Quantidade', marker_color=self.cores_vendedores,
-                  text=vendedor_dados['Qtd_Vendida'], textposition='outside'),
+                  texttemplate='%{y:,.0f}', textposition='outside'),
             row=1, col=1
         )
         
         # Gráfico 2: Linha temporal por vendedor
-        for i, vendedor in enumerate(self.df['Vendedor'].unique()):
-            dados_vendedor = vendas_mensais[vendas_mensais['Vendedor'] == vendedor]
+        for i, (vendedor, dados_vendedor) in enumerate(vendas_mensais.groupby('Vendedor', sort=False)):
+            x, y = self.nivel_detalhe.reduzir_serie(dados_vendedor['Data_Str'], dados_vendedor['Qtd_Vendida'])
             fig.add_trace(
-                go.Scatter(x=dados_vendedor['Data_Str'], y=dados_vendedor['Qtd_Vendida'],
+                self.nivel_detalhe.scatter(x=x, y=y,
                           mode='lines+markers', name=vendedor, 
                           line=dict(color=self.cores_vendedores[i % len(self.cores_vendedores)])),
                 row=1, col=2
@@ -157,7 +193,7 @@ class VisualizacaoInterativa:
         
         # Gráfico 3: Pizza share
         fig.add_trace(
-            go.Pie(values=vendedor_dados['Qtd_Vendida'], labels=vendedor_dados['Vendedor'],
+            go.Pie(values=share_vendedores['Qtd_Vendida'], labels=share_vendedores['Vendedor'],
                    name="Share", marker=dict(colors=self.cores_vendedores)),
             row=2, col=1
         )
@@ -166,7 +202,7 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=vendedor_dados['Vendedor'], y=vendedor_dados['Receita'],
                   name='Receita', marker_color=self.cores_vendedores,
-                  text=[f'R$ {x:,.0f}' for x in vendedor_dados['Receita']], textposition='outside'),
+                  texttemplate='R$ %{y:,.0f}', textposition='outside'),
             row=2, col=2
         )
         
@@ -183,33 +219,18 @@ class VisualizacaoInterativa:
         
         # Salvar
         caminho_arquivo = "output/html_interativos/vendedores_interativo.html"
-        garantir_diretorio(caminho_arquivo)
-        fig.write_html(caminho_arquivo)
-        fig.show()
-        
-        return fig
+        return self._salvar_figura(fig, caminho_arquivo)
     
     def dashboard_temporal_interativo(self):
         """Dashboard temporal interativo"""
         # Dados temporais
-        dados_temporais = self.df.groupby('Data_Str').agg({
-            'Qtd_Vendida': 'sum',
-            'Receita': 'sum',
-            'Lucro': 'sum'
-        }).reset_index()
+        dados_temporais = self.agregados.por('Data_Str')[['Qtd_Vendida', 'Receita', 'Lucro']].reset_index()
         
         # Dados anuais
-        dados_anuais = self.df.groupby('Ano').agg({
-            'Qtd_Vendida': 'sum',
-            'Receita': 'sum'
-        }).reset_index()
+        dados_anuais = self.agregados.por('Ano')[['Qtd_Vendida', 'Receita']].reset_index()
         
         # Sazonalidade
-        sazonalidade = self.df.groupby('Mes_Nome')['Qtd_Vendida'].sum().reset_index()
-        ordem_meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                      'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-        sazonalidade['Mes_Nome'] = pd.Categorical(sazonalidade['Mes_Nome'], categories=ordem_meses, ordered=True)
-        sazonalidade = sazonalidade.sort_values('Mes_Nome')
+        sazonalidade = self.agregados.sazonalidade('Qtd_Vendida').dropna().reset_index()
         
         # Criar subplots
         fig = make_subplots(
@@ -219,15 +240,16 @@ class VisualizacaoInterativa:
                    [{"type": "bar"}, {"type": "scatter"}]]
         )
         
-        # Gráfico 1: Evolução mensal (com eixo duplo)
+        # Gráfico 1: Evolução mensal (com eixo duplo), reduzida ao orçamento de pontos
+        evolucao = self.nivel_detalhe.reduzir_tabela(dados_temporais, 'Data_Str', ['Qtd_Vendida', 'Receita'])
         fig.add_trace(
-            go.Scatter(x=dados_temporais['Data_Str'], y=dados_temporais['Qtd_Vendida'],
+            self.nivel_detalhe.scatter(x=evolucao['Data_Str'], y=evolucao['Qtd_Vendida'],
                       mode='lines+markers', name='Quantidade', line=dict(color='blue')),
             row=1, col=1
         )
         
         fig.add_trace(
-            go.Scatter(x=dados_temporais['Data_Str'], y=dados_temporais['Receita'],
+            self.nivel_detalhe.scatter(x=evolucao['Data_Str'], y=evolucao['Receita'],
                       mode='lines+markers', name='Receita', line=dict(color='red'),
                       yaxis='y2'),
             row=1, col=1
@@ -237,7 +259,7 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=dados_anuais['Ano'].astype(str), y=dados_anuais['Qtd_Vendida'],
                   name='Vendas Anuais', marker_color='lightblue',
-                  text=dados_anuais['Qtd_Vendida'], textposition='outside'),
+                  texttemplate='%{y:,.0f}', textposition='outside'),
             row=1, col=2
         )
         
@@ -245,13 +267,13 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=sazonalidade['Mes_Nome'], y=sazonalidade['Qtd_Vendida'],
                   name='Sazonalidade', marker_color='orange',
-                  text=sazonalidade['Qtd_Vendida'], textposition='outside'),
+                  texttemplate='%{y:,.0f}', textposition='outside'),
             row=2, col=1
         )
         
         # Gráfico 4: Receita vs Lucro por período
         fig.add_trace(
-            go.Scatter(x=dados_temporais['Receita'], y=dados_temporais['Lucro'],
+            self.nivel_detalhe.scatter(x=dados_temporais['Receita'], y=dados_temporais['Lucro'],
                       mode='markers', name='Períodos',
                       marker=dict(size=10, color='green'),
                       text=dados_temporais['Data_Str']),
@@ -272,32 +294,26 @@ class VisualizacaoInterativa:
         
         # Salvar
         caminho_arquivo = "output/html_interativos/dashboard_temporal.html"
-        garantir_diretorio(caminho_arquivo)
-        fig.write_html(caminho_arquivo)
-        fig.show()
-        
-        return fig
+        return self._salvar_figura(fig, caminho_arquivo)
     
     def heatmap_vendedor_produto_interativo(self):
         """Heatmap interativo vendedor vs produto"""
-        # Dados para heatmap
-        heatmap_data = self.df.groupby(['Vendedor', 'Produto'])['Qtd_Vendida'].sum().reset_index()
-        heatmap_pivot = heatmap_data.pivot(index='Vendedor', columns='Produto', values='Qtd_Vendida').fillna(0)
+        # Dados para heatmap (matriz esparsa a partir dos totais agregados)
+        grade = self.heatmap.preparar(self.agregados.por('Vendedor', 'Produto')['Qtd_Vendida'])
         
         # Criar heatmap
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_pivot.values,
-            x=heatmap_pivot.columns,
-            y=heatmap_pivot.index,
+        fig = go.Figure(data=self.heatmap.heatmap_plotly(
+            grade,
             colorscale='Viridis',
-            text=heatmap_pivot.values,
-            texttemplate="%{text}",
-            textfont={"size": 12},
-            hoverongaps=False
+            textfont={"size": 12}
         ))
         
+        titulo = "🔥 HEATMAP: VENDEDOR × PRODUTO"
+        if grade.rasterizado:
+            n_vendedores, n_produtos = grade.dimensoes_originais
+            titulo += f" ({n_vendedores:,} × {n_produtos:,}, somado em blocos)"
         fig.update_layout(
-            title="🔥 HEATMAP: VENDEDOR × PRODUTO",
+            title=titulo,
             title_x=0.5,
             xaxis_title="Produtos",
             yaxis_title="Vendedores",
@@ -307,11 +323,7 @@ class VisualizacaoInterativa:
         
         # Salvar
         caminho_arquivo = "output/html_interativos/heatmap_vendedor_produto.html"
-        garantir_diretorio(caminho_arquivo)
-        fig.write_html(caminho_arquivo)
-        fig.show()
-        
-        return fig
+        return self._salvar_figura(fig, caminho_arquivo)
     
     def grafico_previsoes_interativo(self):
         """Gráfico interativo das previsões"""
@@ -321,7 +333,8 @@ class VisualizacaoInterativa:
         analise = AnalisePredicaoVendas(self.df)
         produtos_tendencia = analise.previsao_inteligente_produto()
         vendedores_analise = analise.previsao_inteligente_vendedores()
-        previsoes_2025 = analise.media_vendas_2025_inteligente()
+        # Vendedores da hierarquia reconciliada: somam o total do mercado do relatório
+        previsoes_2025 = analise.media_vendas_2025_inteligente(metodo_reconciliacao='mint')
         
         # Criar subplots
         fig = make_subplots(
@@ -348,7 +361,7 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=produtos_nomes, y=produtos_previsoes,
                   name='Previsão Produtos', marker_color=produtos_cores_tend,
-                  text=[f'{int(x)}' for x in produtos_previsoes], textposition='outside'),
+                  texttemplate='%{y:.0f}', textposition='outside'),
             row=1, col=1
         )
         
@@ -368,12 +381,12 @@ class VisualizacaoInterativa:
         fig.add_trace(
             go.Bar(x=vendedores_nomes, y=vendedores_previsoes,
                   name='Previsão Vendedores', marker_color=vendedores_cores_tend,
-                  text=[f'{int(x)}' for x in vendedores_previsoes], textposition='outside'),
+                  texttemplate='%{y:.0f}', textposition='outside'),
             row=1, col=2
         )
         
         # Dados histórico vs previsão
-        historico_vendedores = self.df.groupby('Vendedor')['Qtd_Vendida'].sum() / len(self.df['Ano'].unique())
+        historico_vendedores = self.agregados.por('Vendedor')['Qtd_Vendida'] / self.agregados.n_anos
         previsao_vendedores_valores = [previsoes_2025[vend]['previsao'] for vend in historico_vendedores.index]
         
         # Gráfico 3: Histórico vs Previsão
@@ -417,40 +430,21 @@ class VisualizacaoInterativa:
         
         # Salvar
         caminho_arquivo = "output/html_interativos/previsoes_interativo.html"
-        garantir_diretorio(caminho_arquivo)
-        fig.write_html(caminho_arquivo)
-        fig.show()
-        
-        return fig
+        return self._salvar_figura(fig, caminho_arquivo)
     
     def analise_financeira_interativa(self):
         """Dashboard interativo de análise financeira"""
         print("💰 Gerando análise financeira interativa...")
         
-        # Calcular dados financeiros
-        self.df['Custo'] = self.df['Receita'] - self.df['Lucro']
-        self.df['Margem_%'] = (self.df['Lucro'] / self.df['Receita']) * 100
-        self.df['ROI_%'] = (self.df['Lucro'] / self.df['Custo']) * 100
-        
         # Dados agregados por produto
-        dados_produto = self.df.groupby('Produto').agg({
-            'Receita': 'sum',
-            'Lucro': 'sum',
-            'Custo': 'sum',
-            'Qtd_Vendida': 'sum'
-        }).reset_index()
-        dados_produto['Margem_%'] = (dados_produto['Lucro'] / dados_produto['Receita']) * 100
-        dados_produto['ROI_%'] = (dados_produto['Lucro'] / dados_produto['Custo']) * 100
-        dados_produto['Lucro_Unitario'] = dados_produto['Lucro'] / dados_produto['Qtd_Vendida']
-        dados_produto['Custo_Unitario'] = dados_produto['Custo'] / dados_produto['Qtd_Vendida']
+        dados_produto = self.agregados.financeiro(
+            'Produto', metricas=['Margem_%', 'ROI_%', 'Lucro_Unitario', 'Custo_Unitario']
+        ).reset_index()
         
         # Dados temporais
-        evolucao_temporal = self.df.groupby('Data_Str').agg({
-            'Receita': 'sum',
-            'Lucro': 'sum',
-            'Custo': 'sum'
-        }).reset_index()
-        evolucao_temporal['Margem_%'] = (evolucao_temporal['Lucro'] / evolucao_temporal['Receita']) * 100
+        evolucao_temporal = self.agregados.financeiro('Data_Str', metricas=['Margem_%']).reset_index()
+        evolucao_temporal = self.nivel_detalhe.reduzir_tabela(evolucao_temporal, 'Data_Str',
+                                                               ['Receita', 'Custo', 'Lucro'])
         
         # Criar dashboard
         fig = make_subplots(
@@ -515,7 +509,7 @@ class VisualizacaoInterativa:
                      annotation_text="Mínimo 20%", row=1, col=2)
         
         # 3. Evolução temporal
-        fig.add_trace(go.Scatter(
+        fig.add_trace(self.nivel_detalhe.scatter(
             name='Receita Temporal',
             x=evolucao_temporal['Data_Str'],
             y=evolucao_temporal['Receita'],
@@ -524,7 +518,7 @@ class VisualizacaoInterativa:
             hovertemplate='<b>%{x}</b><br>Receita: R$ %{y:,.0f}<extra></extra>'
         ), row=2, col=1)
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(self.nivel_detalhe.scatter(
             name='Custo Temporal',
             x=evolucao_temporal['Data_Str'],
             y=evolucao_temporal['Custo'],
@@ -533,7 +527,7 @@ class VisualizacaoInterativa:
             hovertemplate='<b>%{x}</b><br>Custo: R$ %{y:,.0f}<extra></extra>'
         ), row=2, col=1)
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(self.nivel_detalhe.scatter(
             name='Lucro Temporal',
             x=evolucao_temporal['Data_Str'],
             y=evolucao_temporal['Lucro'],
@@ -620,11 +614,9 @@ class VisualizacaoInterativa:
         
         # Salvar
         caminho_arquivo = 'output/html_interativos/analise_financeira_interativa.html'
-        garantir_diretorio(caminho_arquivo)
-        fig.write_html(caminho_arquivo)
-        print("   ✅ output/html_interativos/analise_financeira_interativa.html")
-        
-        return fig
+        if self.pacote is None:
+            print(f"   ✅ {caminho_arquivo}")
+        return self._salvar_figura(fig, caminho_arquivo, exibir=False)
     
     def dashboard_completo_interativo(self):
         """Cria dashboard completo interativo"""
@@ -659,20 +651,54 @@ class VisualizacaoInterativa:
         print("   - output/html_interativos/analise_financeira_interativa.html")
         print("   - output/html_interativos/previsoes_interativo.html")
         print("\n💡 Abra os arquivos .html no navegador para interagir com os gráficos!")
+    
+    def gerar_pacote(self, caminho_arquivo='output/html_interativos/dashboard_interativo.html', pacote=None):
+        """Gera todos os gráficos em uma única página HTML (figuras comprimidas, desenhadas ao abrir a aba)"""
+        print("📦 Gerando pacote do dashboard interativo (página única)...")
+        pacote = pacote or PacoteDashboard("🌐 Dashboard Interativo de Vendas")
+        self.pacote = pacote
+        try:
+            self.grafico_produtos_interativo()
+            self.grafico_vendedores_interativo()
+            self.dashboard_temporal_interativo()
+            self.heatmap_vendedor_produto_interativo()
+            self.analise_financeira_interativa()
+            self.grafico_previsoes_interativo()
+        finally:
+            self.pacote = None
+        
+        if caminho_arquivo:
+            pacote.salvar(caminho_arquivo)
+            print(f"   ✅ {caminho_arquivo} ({len(pacote.figuras)} gráficos)")
+        return pacote
 
 def main():
     """Função principal"""
+    import argparse
+    from dataset_particionado import adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    parser = argparse.ArgumentParser(description="Visualização interativa de vendas (HTML)")
+    parser.add_argument('--lote', action='store_true',
+                        help="Modo lote (headless): não exibe janelas e libera as figuras após salvar")
+    parser.add_argument('--pacote', action='store_true',
+                        help="Gera uma única página HTML com todos os gráficos em vez de um HTML por gráfico")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
     print("🌐 SISTEMA DE VISUALIZAÇÃO INTERATIVA")
     print("=" * 60)
     
-    # Carregar dados
-    df = pd.read_csv('datasets/vendas.csv')
+    # Carregar dados (só as partições que atendem aos filtros)
+    df = carregar_vendas_argumentos(args)
     
     # Criar instância da visualização
-    viz = VisualizacaoInterativa(df)
+    viz = VisualizacaoInterativa(df, modo_lote=args.lote)
     
     # Gerar dashboard completo
-    viz.dashboard_completo_interativo()
+    if args.pacote:
+        viz.gerar_pacote()
+    else:
+        viz.dashboard_completo_interativo()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,6 +3,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from agregados import obter_agregados
+from diretorios import garantir_diretorio
+from heatmap_escalavel import HeatmapEscalavel
+from paginas_produtos import PaginasProdutos, SeriesProdutos, PRODUTOS_POR_PAGINA
+from modelos_graficos import BarrasRotuladas, LinhaSerie, ModeloFigura, cores_por_faixa, FAIXAS_MARGEM, FAIXAS_ROI
 from datetime import datetime
 import warnings
 import sys
@@ -18,21 +23,21 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
-def garantir_diretorio(caminho_arquivo):
-    """Garante que o diretório do arquivo existe, criando se necessário"""
-    diretorio = os.path.dirname(caminho_arquivo)
-    if diretorio and not os.path.exists(diretorio):
-        os.makedirs(diretorio, exist_ok=True)
-        print(f"📁 Diretório criado: {diretorio}")
-
 # Configurar fontes para português
 plt.rcParams['font.size'] = 10
 plt.rcParams['figure.figsize'] = (12, 8)
 
 class VisualizacaoVendas:
-    def __init__(self, df):
+    def __init__(self, df, modo_lote=False):
         self.df = df.copy()
+        self.modo_lote = modo_lote
+        if modo_lote:
+            # Renderização sem janela: backend Agg e figuras fechadas após salvar
+            plt.switch_backend('Agg')
         self.preparar_dados()
+        # Totais compartilhados por todos os gráficos (calculados uma única vez por conjunto de dados)
+        self.agregados = obter_agregados(self.df)
+        self.heatmap = HeatmapEscalavel()
     
     def preparar_dados(self):
         """Prepara os dados para visualização"""
@@ -47,47 +52,44 @@ class VisualizacaoVendas:
                    7: 'Jul', 8: 'Ago', 9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'}
         self.df['Mes_Nome'] = self.df['Mes'].map(meses_pt)
     
+    def _finalizar_grafico(self):
+        """Exibe o gráfico atual ou, em modo lote, fecha a figura para liberar memória"""
+        if self.modo_lote:
+            plt.close(plt.gcf())
+        else:
+            plt.show()
+    
     def grafico_produtos_mais_vendidos(self):
         """Gráfico de produtos mais vendidos"""
         plt.figure(figsize=(14, 8))
         
         # Dados por quantidade
-        produto_qtd = self.df.groupby('Produto')['Qtd_Vendida'].sum().sort_values(ascending=True)
+        produto_qtd = self.agregados.por('Produto')['Qtd_Vendida'].sort_values(ascending=True)
         
         # Subplot 1: Quantidade
         plt.subplot(2, 1, 1)
-        bars1 = plt.barh(produto_qtd.index, produto_qtd.values, color='skyblue', alpha=0.8)
+        BarrasRotuladas(plt.gca(), len(produto_qtd), horizontal=True, color='skyblue', alpha=0.8
+                        ).atualizar(produto_qtd.index, produto_qtd.values)
         plt.title('🏆 Produtos Mais Vendidos - Por Quantidade', fontsize=14, fontweight='bold')
         plt.xlabel('Quantidade Vendida (unidades)')
         
-        # Adicionar valores nas barras
-        for bar in bars1:
-            width = bar.get_width()
-            plt.text(width + width*0.01, bar.get_y() + bar.get_height()/2, 
-                    f'{int(width):,}', ha='left', va='center')
-        
         # Dados por receita
-        produto_receita = self.df.groupby('Produto')['Receita'].sum().sort_values(ascending=True)
+        produto_receita = self.agregados.por('Produto')['Receita'].sort_values(ascending=True)
         
         # Subplot 2: Receita
         plt.subplot(2, 1, 2)
-        bars2 = plt.barh(produto_receita.index, produto_receita.values, color='lightcoral', alpha=0.8)
+        BarrasRotuladas(plt.gca(), len(produto_receita), horizontal=True, formato='R$ {:,.0f}',
+                        color='lightcoral', alpha=0.8).atualizar(produto_receita.index, produto_receita.values)
         plt.title('💰 Produtos Mais Vendidos - Por Receita', fontsize=14, fontweight='bold')
         plt.xlabel('Receita (R$)')
         
-        # Adicionar valores nas barras
-        for bar in bars2:
-            width = bar.get_width()
-            plt.text(width + width*0.01, bar.get_y() + bar.get_height()/2, 
-                    f'R$ {width:,.0f}', ha='left', va='center')
-        
         plt.tight_layout()
         
         # Garantir que o diretório existe antes de salvar
         caminho_arquivo = 'output/imagens/produtos_mais_vendidos.png'
         garantir_diretorio(caminho_arquivo)
         plt.savefig(caminho_arquivo, dpi=300, bbox_inches='tight')
-        plt.show()
+        self._finalizar_grafico()
     
     def grafico_vendedores_performance(self):
         """Gráfico de performance dos vendedores"""
@@ -95,42 +97,30 @@ class VisualizacaoVendas:
         
         # Subplot 1: Quantidade por vendedor
         plt.subplot(2, 2, 1)
-        vendedor_qtd = self.df.groupby('Vendedor')['Qtd_Vendida'].sum().sort_values(ascending=False)
-        bars = plt.bar(vendedor_qtd.index, vendedor_qtd.values, color='lightgreen', alpha=0.8)
+        vendedor_qtd = self.agregados.por('Vendedor')['Qtd_Vendida'].sort_values(ascending=False)
+        BarrasRotuladas(plt.gca(), len(vendedor_qtd), rotacao=45, color='lightgreen', alpha=0.8
+                        ).atualizar(vendedor_qtd.index, vendedor_qtd.values)
         plt.title('👥 Vendedores - Quantidade Vendida', fontsize=12, fontweight='bold')
         plt.ylabel('Quantidade (unidades)')
-        plt.xticks(rotation=45)
-        
-        # Adicionar valores nas barras
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'{int(height):,}', ha='center', va='bottom')
         
         # Subplot 2: Receita por vendedor
         plt.subplot(2, 2, 2)
-        vendedor_receita = self.df.groupby('Vendedor')['Receita'].sum().sort_values(ascending=False)
-        bars = plt.bar(vendedor_receita.index, vendedor_receita.values, color='gold', alpha=0.8)
+        vendedor_receita = self.agregados.por('Vendedor')['Receita'].sort_values(ascending=False)
+        BarrasRotuladas(plt.gca(), len(vendedor_receita), formato='R$ {:,.0f}', fontsize=9, rotacao=45,
+                        color='gold', alpha=0.8).atualizar(vendedor_receita.index, vendedor_receita.values)
         plt.title('👥 Vendedores - Receita', fontsize=12, fontweight='bold')
         plt.ylabel('Receita (R$)')
-        plt.xticks(rotation=45)
-        
-        # Adicionar valores nas barras
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'R$ {height:,.0f}', ha='center', va='bottom', fontsize=9)
         
         # Subplot 3: Vendas por região
         plt.subplot(2, 2, 3)
-        regiao_vendas = self.df.groupby('Regiao')['Qtd_Vendida'].sum()
+        regiao_vendas = self.agregados.por('Regiao')['Qtd_Vendida']
         plt.pie(regiao_vendas.values, labels=regiao_vendas.index, autopct='%1.1f%%', 
                 startangle=90, colors=['lightblue', 'lightcoral', 'lightgreen', 'gold'])
         plt.title('🗺️ Distribuição por Região', fontsize=12, fontweight='bold')
         
         # Subplot 4: Evolução temporal geral
         plt.subplot(2, 2, 4)
-        vendas_mensais = self.df.groupby('Ano_Mes')['Qtd_Vendida'].sum()
+        vendas_mensais = self.agregados.por('Ano_Mes')['Qtd_Vendida']
         plt.plot(range(len(vendas_mensais)), vendas_mensais.values, marker='o', linewidth=2, markersize=6)
         plt.title('📈 Evolução Temporal das Vendas', fontsize=12, fontweight='bold')
         plt.ylabel('Quantidade Vendida')
@@ -143,7 +133,7 @@ class VisualizacaoVendas:
         caminho_arquivo = 'output/imagens/vendedores_performance.png'
         garantir_diretorio(caminho_arquivo)
         plt.savefig(caminho_arquivo, dpi=300, bbox_inches='tight')
-        plt.show()
+        self._finalizar_grafico()
     
     def grafico_evolucao_temporal(self):
         """Gráfico detalhado da evolução temporal"""
@@ -151,10 +141,7 @@ class VisualizacaoVendas:
         
         # Subplot 1: Vendas por mês (todos os anos)
         plt.subplot(3, 2, 1)
-        vendas_mensais = self.df.groupby('Ano_Mes').agg({
-            'Qtd_Vendida': 'sum',
-            'Receita': 'sum'
-        })
+        vendas_mensais = self.agregados.por('Ano_Mes')[['Qtd_Vendida', 'Receita']]
         
         plt.plot(range(len(vendas_mensais)), vendas_mensais['Qtd_Vendida'], 
                 marker='o', linewidth=2, markersize=6, color='blue', label='Quantidade')
@@ -172,21 +159,15 @@ class VisualizacaoVendas:
         
         # Subplot 3: Vendas por ano
         plt.subplot(3, 2, 3)
-        vendas_anuais = self.df.groupby('Ano')['Qtd_Vendida'].sum()
-        bars = plt.bar(vendas_anuais.index.astype(str), vendas_anuais.values, 
-                      color='lightblue', alpha=0.8, width=0.6)
+        vendas_anuais = self.agregados.por('Ano')['Qtd_Vendida']
+        BarrasRotuladas(plt.gca(), len(vendas_anuais), color='lightblue', alpha=0.8, width=0.6
+                        ).atualizar(vendas_anuais.index.astype(str), vendas_anuais.values)
         plt.title('📊 Vendas Anuais', fontsize=12, fontweight='bold')
         plt.ylabel('Quantidade Vendida')
         
-        # Adicionar valores nas barras
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'{int(height):,}', ha='center', va='bottom')
-        
         # Subplot 4: Sazonalidade por mês
         plt.subplot(3, 2, 4)
-        sazonalidade = self.df.groupby('Mes')['Qtd_Vendida'].sum()
+        sazonalidade = self.agregados.sazonalidade('Qtd_Vendida')
         meses_nomes = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
                       'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
         
@@ -197,15 +178,15 @@ class VisualizacaoVendas:
         
         # Subplot 5: Heatmap de vendas por vendedor e produto
         plt.subplot(3, 2, 5)
-        heatmap_data = self.df.groupby(['Vendedor', 'Produto'])['Qtd_Vendida'].sum().unstack(fill_value=0)
-        sns.heatmap(heatmap_data, annot=True, fmt='g', cmap='YlOrRd', cbar_kws={'label': 'Quantidade'})
+        grade = self.heatmap.preparar(self.agregados.por('Vendedor', 'Produto')['Qtd_Vendida'])
+        self.heatmap.heatmap_matplotlib(grade, plt.gca(), cmap='YlOrRd', rotulo_barra='Quantidade')
         plt.title('🔥 Heatmap: Vendedor × Produto', fontsize=12, fontweight='bold')
         plt.ylabel('Vendedor')
         plt.xlabel('Produto')
         
         # Subplot 6: Boxplot de vendas por trimestre
         plt.subplot(3, 2, 6)
-        vendas_trimestre = self.df.groupby(['Ano', 'Trimestre'])['Qtd_Vendida'].sum().reset_index()
+        vendas_trimestre = self.agregados.por('Ano', 'Trimestre')['Qtd_Vendida'].reset_index()
         
         # Criar dados para boxplot
         dados_boxplot = []
@@ -213,7 +194,8 @@ class VisualizacaoVendas:
             dados_trim = vendas_trimestre[vendas_trimestre['Trimestre'] == trim]['Qtd_Vendida'].values
             dados_boxplot.append(dados_trim)
         
-        plt.boxplot(dados_boxplot, labels=['Q1', 'Q2', 'Q3', 'Q4'])
+        plt.boxplot(dados_boxplot)
+        plt.xticks([1, 2, 3, 4], ['Q1', 'Q2', 'Q3', 'Q4'])
         plt.title('📦 Distribuição por Trimestre', fontsize=12, fontweight='bold')
         plt.ylabel('Quantidade Vendida')
         plt.grid(True, alpha=0.3)
@@ -224,50 +206,21 @@ class VisualizacaoVendas:
         caminho_arquivo = 'output/imagens/evolucao_temporal.png'
         garantir_diretorio(caminho_arquivo)
         plt.savefig(caminho_arquivo, dpi=300, bbox_inches='tight')
-        plt.show()
+        self._finalizar_grafico()
     
-    def grafico_analise_produtos_detalhada(self):
-        """Análise detalhada por produto"""
-        produtos = self.df['Produto'].unique()
-        n_produtos = len(produtos)
-        
-        plt.figure(figsize=(16, 4*n_produtos))
-        
-        for i, produto in enumerate(produtos):
-            df_produto = self.df[self.df['Produto'] == produto]
-            
-            # Vendas mensais do produto
-            plt.subplot(n_produtos, 3, i*3 + 1)
-            vendas_mensais = df_produto.groupby('Ano_Mes')['Qtd_Vendida'].sum()
-            plt.plot(range(len(vendas_mensais)), vendas_mensais.values, 
-                    marker='o', linewidth=2, markersize=4)
-            plt.title(f'📈 {produto} - Evolução Mensal', fontsize=11, fontweight='bold')
-            plt.ylabel('Quantidade')
-            plt.grid(True, alpha=0.3)
-            
-            # Vendas por vendedor para este produto
-            plt.subplot(n_produtos, 3, i*3 + 2)
-            vendas_vendedor = df_produto.groupby('Vendedor')['Qtd_Vendida'].sum().sort_values(ascending=True)
-            plt.barh(vendas_vendedor.index, vendas_vendedor.values, alpha=0.8)
-            plt.title(f'👥 {produto} - Por Vendedor', fontsize=11, fontweight='bold')
-            plt.xlabel('Quantidade')
-            
-            # Distribuição por região
-            plt.subplot(n_produtos, 3, i*3 + 3)
-            vendas_regiao = df_produto.groupby('Regiao')['Qtd_Vendida'].sum()
-            if len(vendas_regiao) > 1:
-                plt.pie(vendas_regiao.values, labels=vendas_regiao.index, autopct='%1.1f%%', startangle=90)
-            else:
-                plt.bar(vendas_regiao.index, vendas_regiao.values, alpha=0.8)
-            plt.title(f'🗺️ {produto} - Por Região', fontsize=11, fontweight='bold')
+    def grafico_analise_produtos_detalhada(self, produtos_por_pagina=PRODUTOS_POR_PAGINA, processos=None):
+        """Análise detalhada por produto (uma página PNG por lote de produtos)"""
+        # Séries de todos os produtos a partir dos totais agregados (sem filtrar por produto)
+        series = SeriesProdutos.de_agregados(self.agregados)
+        paginas = PaginasProdutos(produtos_por_pagina=produtos_por_pagina, processos=processos)
         
-        plt.tight_layout()
-        
-        # Garantir que o diretório existe antes de salvar
         caminho_arquivo = 'output/imagens/analise_produtos_detalhada.png'
-        garantir_diretorio(caminho_arquivo)
-        plt.savefig(caminho_arquivo, dpi=300, bbox_inches='tight')
-        plt.show()
+        caminhos = paginas.renderizar(series, caminho_arquivo, manter_figura=not self.modo_lote)
+        if len(caminhos) == 1:
+            self._finalizar_grafico()
+        else:
+            print(f"   📄 {len(series)} produtos em {len(caminhos)} páginas: {caminhos[0]} ... {caminhos[-1]}")
+        return caminhos
     
     def grafico_previsoes_2025(self):
         """Gráfico das previsões para 2025"""
@@ -279,7 +232,8 @@ class VisualizacaoVendas:
         # Obter previsões
         produtos_tendencia = analise.previsao_inteligente_produto()
         vendedores_analise = analise.previsao_inteligente_vendedores()
-        previsoes_2025 = analise.media_vendas_2025_inteligente()
+        # Vendedores da hierarquia reconciliada: somam o total do mercado do relatório
+        previsoes_2025 = analise.media_vendas_2025_inteligente(metodo_reconciliacao='mint')
         
         plt.figure(figsize=(16, 12))
         
@@ -291,16 +245,10 @@ class VisualizacaoVendas:
                          else 'red' if dados['tendencia'] == 'QUEDA' 
                          else 'orange' for dados in produtos_tendencia.values()]
         
-        bars = plt.bar(produtos_nomes, produtos_previsoes, color=produtos_cores, alpha=0.7)
+        BarrasRotuladas(plt.gca(), len(produtos_nomes), formato='{:.0f}', fontsize=9, rotacao=45, alpha=0.7
+                        ).atualizar(produtos_nomes, produtos_previsoes, cores=produtos_cores)
         plt.title('🔮 Previsão Produtos 2025\n(unidades/mês)', fontsize=12, fontweight='bold')
         plt.ylabel('Quantidade Prevista')
-        plt.xticks(rotation=45)
-        
-        # Adicionar valores
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'{int(height)}', ha='center', va='bottom', fontsize=9)
         
         # Subplot 2: Tendências dos produtos
         plt.subplot(2, 3, 2)
@@ -330,21 +278,15 @@ class VisualizacaoVendas:
             else:
                 vendedores_cores.append('orange')
         
-        bars = plt.bar(vendedores_nomes, vendedores_previsoes, color=vendedores_cores, alpha=0.7)
+        BarrasRotuladas(plt.gca(), len(vendedores_nomes), formato='{:.0f}', fontsize=9, rotacao=45, alpha=0.7
+                        ).atualizar(vendedores_nomes, vendedores_previsoes, cores=vendedores_cores)
         plt.title('🚀 Previsão Vendedores 2025\n(unidades/trimestre)', fontsize=12, fontweight='bold')
         plt.ylabel('Quantidade Prevista')
-        plt.xticks(rotation=45)
-        
-        # Adicionar valores
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'{int(height)}', ha='center', va='bottom', fontsize=9)
         
         # Subplot 4: Comparação histórico vs previsão
         plt.subplot(2, 3, 4)
         # Calcular médias históricas por vendedor
-        historico_vendedores = self.df.groupby('Vendedor')['Qtd_Vendida'].sum() / len(self.df['Ano'].unique())
+        historico_vendedores = self.agregados.por('Vendedor')['Qtd_Vendida'] / self.agregados.n_anos
         previsao_vendedores = [previsoes_2025[vend]['previsao'] for vend in historico_vendedores.index]
         
         x = np.arange(len(historico_vendedores))
@@ -392,26 +334,16 @@ class VisualizacaoVendas:
         caminho_arquivo = 'output/imagens/previsoes_2025.png'
         garantir_diretorio(caminho_arquivo)
         plt.savefig(caminho_arquivo, dpi=300, bbox_inches='tight')
-        plt.show()
+        self._finalizar_grafico()
     
     def analise_lucros_custos(self):
         """Análise detalhada de lucros e custos"""
         plt.figure(figsize=(16, 12))
         
-        # Calcular custos
-        self.df['Custo'] = self.df['Receita'] - self.df['Lucro']
-        self.df['Margem_%'] = (self.df['Lucro'] / self.df['Receita']) * 100
-        
-        # Dados por produto
-        dados_produto = self.df.groupby('Produto').agg({
-            'Receita': 'sum',
-            'Lucro': 'sum',
-            'Custo': 'sum',
-            'Qtd_Vendida': 'sum'
-        }).reset_index()
-        dados_produto['Margem_%'] = (dados_produto['Lucro'] / dados_produto['Receita']) * 100
-        dados_produto['Lucro_Unitario'] = dados_produto['Lucro'] / dados_produto['Qtd_Vendida']
-        dados_produto['Custo_Unitario'] = dados_produto['Custo'] / dados_produto['Qtd_Vendida']
+        # Dados por produto (métricas derivadas = razão das somas do grupo)
+        dados_produto = self.agregados.financeiro(
+            'Produto', metricas=['Margem_%', 'ROI_%', 'Lucro_Unitario', 'Custo_Unitario']
+        ).reset_index()
         
         # 1. Receita vs Lucro vs Custo por produto
         plt.subplot(2, 3, 1)
@@ -431,20 +363,16 @@ class VisualizacaoVendas:
         
         # 2. Margem de lucro por produto
         plt.subplot(2, 3, 2)
-        cores_margem = ['green' if m >= 30 else 'orange' if m >= 20 else 'red' for m in dados_produto['Margem_%']]
-        bars = plt.bar(dados_produto['Produto'], dados_produto['Margem_%'], color=cores_margem, alpha=0.8)
+        BarrasRotuladas(plt.gca(), len(dados_produto), formato='{:.1f}%', folga_relativa=0, folga_fixa=0.5,
+                        fontsize=9, rotacao=45, alpha=0.8
+                        ).atualizar(dados_produto['Produto'], dados_produto['Margem_%'],
+                                    cores=cores_por_faixa(dados_produto['Margem_%'], FAIXAS_MARGEM))
         plt.title('📊 Margem de Lucro (%)', fontweight='bold')
         plt.ylabel('Margem (%)')
-        plt.xticks(rotation=45)
         plt.axhline(y=30, color='green', linestyle='--', alpha=0.7, label='Meta 30%')
         plt.axhline(y=20, color='orange', linestyle='--', alpha=0.7, label='Mínimo 20%')
         plt.legend()
         
-        # Adicionar valores
-        for bar, valor in zip(bars, dados_produto['Margem_%']):
-            plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.5,
-                    f'{valor:.1f}%', ha='center', va='bottom', fontsize=9)
-        
         # 3. Lucro vs Custo unitário
         plt.subplot(2, 3, 3)
         x = range(len(dados_produto))
@@ -461,11 +389,7 @@ class VisualizacaoVendas:
         
         # 4. Evolução temporal dos custos
         plt.subplot(2, 3, 4)
-        evolucao_mensal = self.df.groupby('Ano_Mes').agg({
-            'Receita': 'sum',
-            'Lucro': 'sum',
-            'Custo': 'sum'
-        })
+        evolucao_mensal = self.agregados.por('Ano_Mes')[['Receita', 'Lucro', 'Custo']]
         
         x_tempo = range(len(evolucao_mensal))
         plt.plot(x_tempo, evolucao_mensal['Receita'], marker='o', label='Receita', linewidth=2)
@@ -480,22 +404,17 @@ class VisualizacaoVendas:
         
         # 5. ROI por produto
         plt.subplot(2, 3, 5)
-        dados_produto['ROI_%'] = (dados_produto['Lucro'] / dados_produto['Custo']) * 100
-        cores_roi = ['green' if roi >= 50 else 'orange' if roi >= 25 else 'red' for roi in dados_produto['ROI_%']]
-        bars = plt.bar(dados_produto['Produto'], dados_produto['ROI_%'], color=cores_roi, alpha=0.8)
+        BarrasRotuladas(plt.gca(), len(dados_produto), formato='{:.1f}%', folga_relativa=0, folga_fixa=1,
+                        fontsize=9, rotacao=45, alpha=0.8
+                        ).atualizar(dados_produto['Produto'], dados_produto['ROI_%'],
+                                    cores=cores_por_faixa(dados_produto['ROI_%'], FAIXAS_ROI))
         
         plt.title('📈 ROI por Produto', fontweight='bold')
         plt.ylabel('ROI (%)')
-        plt.xticks(rotation=45)
         plt.axhline(y=50, color='green', linestyle='--', alpha=0.7, label='Excelente 50%+')
         plt.axhline(y=25, color='orange', linestyle='--', alpha=0.7, label='Bom 25%+')
         plt.legend()
         
-        # Adicionar valores
-        for bar, valor in zip(bars, dados_produto['ROI_%']):
-            plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 1,
-                    f'{valor:.1f}%', ha='center', va='bottom', fontsize=9)
-        
         # 6. Scatter: Volume vs Lucratividade
         plt.subplot(2, 3, 6)
         plt.scatter(dados_produto['Qtd_Vendida'], dados_produto['Lucro'], 
@@ -521,7 +440,49 @@ class VisualizacaoVendas:
         caminho_arquivo = 'output/imagens/analise_lucros_custos.png'
         garantir_diretorio(caminho_arquivo)
         plt.savefig(caminho_arquivo, dpi=300, bbox_inches='tight')
-        plt.show()
+        self._finalizar_grafico()
+    
+    def graficos_por_regiao(self, regioes=None, diretorio='output/imagens/regioes', dpi=150):
+        """Mesmo resumo (produtos, vendedores, margem, receita mensal) para cada região
+
+        O layout e os artistas são criados uma vez; cada região só troca os dados.
+        """
+        quantidade_produto = self.agregados.por('Regiao', 'Produto')['Qtd_Vendida'].unstack(fill_value=0)
+        quantidade_vendedor = self.agregados.por('Regiao', 'Vendedor')['Qtd_Vendida'].unstack(fill_value=0)
+        margem_produto = self.agregados.financeiro('Regiao', 'Produto', metricas=['Margem_%'])['Margem_%'].unstack()
+        receita_mensal = self.agregados.por('Regiao', 'Ano_Mes')['Receita'].unstack(fill_value=0)
+        regioes = list(quantidade_produto.index) if regioes is None else list(regioes)
+        produtos, vendedores = quantidade_produto.columns, quantidade_vendedor.columns
+        
+        modelo = ModeloFigura(2, 2, figsize=(15, 10))
+        eixos = modelo.eixos
+        barras_produtos = BarrasRotuladas(eixos[0, 0], len(produtos), horizontal=True, color='skyblue', alpha=0.8)
+        eixos[0, 0].set_title('🏆 Produtos - Quantidade', fontweight='bold')
+        barras_vendedores = BarrasRotuladas(eixos[0, 1], len(vendedores), rotacao=45, color='lightgreen', alpha=0.8)
+        eixos[0, 1].set_title('👥 Vendedores - Quantidade', fontweight='bold')
+        barras_margem = BarrasRotuladas(eixos[1, 0], len(produtos), formato='{:.1f}%', folga_relativa=0,
+                                        folga_fixa=0.5, fontsize=9, rotacao=45, alpha=0.8)
+        eixos[1, 0].set_title('📊 Margem de Lucro (%)', fontweight='bold')
+        eixos[1, 0].axhline(y=30, color='green', linestyle='--', alpha=0.7, label='Meta 30%')
+        eixos[1, 0].axhline(y=20, color='orange', linestyle='--', alpha=0.7, label='Mínimo 20%')
+        eixos[1, 0].legend(loc='lower right')
+        linha_receita = LinhaSerie(eixos[1, 1], rotulos_x=receita_mensal.columns, marker='o', linewidth=2, markersize=4)
+        eixos[1, 1].set_title('📈 Receita Mensal', fontweight='bold')
+        eixos[1, 1].set_ylabel('Receita (R$)')
+        eixos[1, 1].grid(True, alpha=0.3)
+        
+        caminhos = []
+        for regiao in regioes:
+            margens = margem_produto.loc[regiao].reindex(produtos).fillna(0)
+            modelo.definir_titulo(f'🗺️ RESUMO DA REGIÃO: {regiao}')
+            barras_produtos.atualizar(produtos, quantidade_produto.loc[regiao])
+            barras_vendedores.atualizar(vendedores, quantidade_vendedor.loc[regiao])
+            barras_margem.atualizar(produtos, margens, cores=cores_por_faixa(margens, FAIXAS_MARGEM))
+            linha_receita.atualizar(receita_mensal.loc[regiao])
+            caminhos.append(modelo.salvar(os.path.join(diretorio, f'resumo_{regiao}.png'), dpi=dpi))
+        
+        modelo.fechar()
+        return caminhos
     
     def dashboard_completo(self):
         """Cria um dashboard completo com todos os gráficos"""
@@ -557,17 +518,32 @@ class VisualizacaoVendas:
 
 def main():
     """Função principal"""
+    import argparse
+    from dataset_particionado import adicionar_argumentos_filtro, carregar_vendas_argumentos
+
+    parser = argparse.ArgumentParser(description="Visualização de vendas (gráficos estáticos)")
+    parser.add_argument('--lote', action='store_true',
+                        help="Modo lote (headless): não exibe janelas e libera as figuras após salvar")
+    parser.add_argument('--regioes', action='store_true',
+                        help="Gera também um resumo por região (output/imagens/regioes/)")
+    adicionar_argumentos_filtro(parser)
+    args = parser.parse_args()
+
     print("🎨 SISTEMA DE VISUALIZAÇÃO DE VENDAS")
     print("=" * 60)
     
-    # Carregar dados
-    df = pd.read_csv('datasets/vendas.csv')
+    # Carregar dados (só as partições que atendem aos filtros)
+    df = carregar_vendas_argumentos(args)
     
     # Criar instância da visualização
-    viz = VisualizacaoVendas(df)
+    viz = VisualizacaoVendas(df, modo_lote=args.lote)
     
     # Gerar dashboard completo
     viz.dashboard_completo()
+    
+    if args.regioes:
+        caminhos = viz.graficos_por_regiao()
+        print(f"🗺️ {len(caminhos)} resumos por região salvos em output/imagens/regioes/")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file